@@ -37,6 +37,13 @@ class DatasetConfig:
     revision: str | None = None
     use_imagenet_stats: bool = True
     video_backend: str = field(default_factory=get_safe_default_codec)
+    # Number of video decoders kept open in each dataloader worker (0 to re-open the video for every sample).
+    video_decoder_cache_size: int = 0
+    # When set, each training batch is made of contiguous windows of `frames_per_episode` frames taken from
+    # `batch_size // frames_per_episode` episodes, so that frames from the same video are decoded together.
+    frames_per_episode: int | None = None
+    # Serve video keys from the frames pre-decoded by `python -m lerobot.scripts.build_frame_cache`.
+    use_frame_cache: bool = False
 
 
 @dataclass
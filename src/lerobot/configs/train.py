@@ -107,6 +107,12 @@ class TrainPipelineConfig(HubMixin):
             train_dir = f"{now:%Y-%m-%d}/{now:%H-%M-%S}_{self.job_name}"
             self.output_dir = Path("outputs/train") / train_dir
 
+        if self.dataset.frames_per_episode is not None and self.batch_size % self.dataset.frames_per_episode:
+            raise ValueError(
+                f"The batch size ({self.batch_size}) must be a multiple of 'dataset.frames_per_episode' "
+                f"({self.dataset.frames_per_episode})."
+            )
+
         if isinstance(self.dataset.repo_id, list):
             raise NotImplementedError("LeRobotMultiDataset is not currently implemented.")
 
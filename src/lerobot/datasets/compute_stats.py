@@ -82,27 +82,23 @@ def get_feature_stats(array: np.ndarray, axis: tuple, keepdims: bool) -> dict[st
     }
 
 
+def get_image_stats(images: np.ndarray) -> dict[str, np.ndarray]:
+    """Per channel stats of uint8 images (N, C, H, W), normalized to the [0, 1] range."""
+    stats = get_feature_stats(images, axis=(0, 2, 3), keepdims=True)  # keep channel dim
+    # we normalize and remove batch dim for images
+    return {k: v if k == "count" else np.squeeze(v / 255.0, axis=0) for k, v in stats.items()}
+
+
 def compute_episode_stats(episode_data: dict[str, list[str] | np.ndarray], features: dict) -> dict:
     ep_stats = {}
     for key, data in episode_data.items():
         if features[key]["dtype"] == "string":
             continue  # HACK: we should receive np.arrays of strings
         elif features[key]["dtype"] in ["image", "video"]:
-            ep_ft_array = sample_images(data)  # data is a list of image paths
-            axes_to_reduce = (0, 2, 3)  # keep channel dim
-            keepdims = True
+            ep_stats[key] = get_image_stats(sample_images(data))  # data is a list of image paths
         else:
-            ep_ft_array = data  # data is already a np.ndarray
-            axes_to_reduce = 0  # compute stats over the first axis
-            keepdims = data.ndim == 1  # keep as np.array
-
-        ep_stats[key] = get_feature_stats(ep_ft_array, axis=axes_to_reduce, keepdims=keepdims)
-
-        # finally, we normalize and remove batch dim for images
-        if features[key]["dtype"] in ["image", "video"]:
-            ep_stats[key] = {
-                k: v if k == "count" else np.squeeze(v / 255.0, axis=0) for k, v in ep_stats[key].items()
-            }
+            # data is already a np.ndarray, we compute stats over the first axis
+            ep_stats[key] = get_feature_stats(data, axis=0, keepdims=data.ndim == 1)
 
     return ep_stats
 
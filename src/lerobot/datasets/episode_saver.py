@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Saving of recorded episodes in the background (see `LeRobotDataset.start_async_saving`).
+
+Every episode handed to the `AsyncEpisodeSaver` is first written to a journal on disk, and only removed from
+it once the episode is fully saved in the dataset. If the recording crashes before that, the journaled
+episodes can be saved when the recording is resumed.
+
+A journal looks like this from the root of the dataset:
+.
+└── journal
+    ├── episode_000012.pkl
+    └── episode_000013.pkl
+"""
+
+import logging
+import os
+import pickle
+import queue
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+JOURNAL_DIR = "journal"
+
+
+def get_journal_path(root: Path, episode_index: int) -> Path:
+    return root / JOURNAL_DIR / f"episode_{episode_index:06d}.pkl"
+
+
+def write_journal_entry(root: Path, episode_index: int, entry: dict) -> None:
+    """Writes an entry of the journal atomically and durably: once this returns, the entry survives a crash."""
+    fpath = get_journal_path(root, episode_index)
+    fpath.parent.mkdir(parents=True, exist_ok=True)
+    tmp_fpath = fpath.with_suffix(".tmp")
+    with open(tmp_fpath, "wb") as f:
+        pickle.dump(entry, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_fpath, fpath)
+
+
+def load_journal(root: Path) -> list[tuple[int, dict]]:
+    """Returns the journaled entries, sorted by episode index."""
+    entries = []
+    for fpath in sorted((root / JOURNAL_DIR).glob("episode_*.pkl")):
+        with open(fpath, "rb") as f:
+            entries.append((int(fpath.stem.removeprefix("episode_")), pickle.load(f)))
+    return entries
+
+
+def remove_journal_entry(root: Path, episode_index: int) -> None:
+    get_journal_path(root, episode_index).unlink(missing_ok=True)
+
+
+class AsyncEpisodeSaver:
+    """
+    Saves episodes in a background thread, so that the recording of the next episode can start right away.
+
+    Episodes are saved one at a time, in the order they were submitted, by calling `save_fn` on the entry
+    which was journaled for them. `submit` blocks when `max_queue_size` episodes are already waiting to be
+    saved. If saving an episode fails, the following ones are not saved (their episode index would be wrong)
+    but remain in the journal, and the error is raised by the next call to `submit`, `wait_until_done` or
+    `stop`.
+
+    Args:
+        root (Path): Root of the dataset, in which the journal is written.
+        save_fn (Callable): Function saving a journaled entry in the dataset.
+        next_episode_index (int): Index of the next episode to be submitted.
+        max_queue_size (int, optional): Maximum number of episodes waiting to be saved. Defaults to 2.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        save_fn: Callable[[dict], None],
+        next_episode_index: int,
+        max_queue_size: int = 2,
+    ):
+        if max_queue_size <= 0:
+            raise ValueError(f"max_queue_size must be a positive integer, got {max_queue_size}.")
+
+        self.root = root
+        self.save_fn = save_fn
+        self.next_episode_index = next_episode_index
+        self.error = None
+        self._stopped = False
+        self.queue = queue.Queue(maxsize=max_queue_size)
+        self.thread = threading.Thread(target=self._worker_loop, daemon=True)
+        self.thread.start()
+
+    def submit(self, entry: dict) -> None:
+        self._raise_if_failed()
+        episode_index = self.next_episode_index
+        write_journal_entry(self.root, episode_index, entry)
+        self.queue.put((episode_index, entry))
+        self.next_episode_index += 1
+
+    def _worker_loop(self) -> None:
+        while True:
+            item = self.queue.get()
+            if item is None:
+                self.queue.task_done()
+                break
+
+            episode_index, entry = item
+            try:
+                if self.error is None:
+                    self.save_fn(entry)
+                    remove_journal_entry(self.root, episode_index)
+            except Exception as e:
+                logging.exception(f"Failed to save episode {episode_index}, it was kept in the journal.")
+                self.error = e
+            finally:
+                self.queue.task_done()
+
+    def _raise_if_failed(self) -> None:
+        if self.error is not None:
+            raise RuntimeError(
+                f"Saving episodes in the background failed, the unsaved episodes are kept in "
+                f"{self.root / JOURNAL_DIR}."
+            ) from self.error
+
+    def wait_until_done(self) -> None:
+        self.queue.join()
+        self._raise_if_failed()
+
+    def stop(self) -> None:
+        """Waits for the submitted episodes to be saved and stops the background thread."""
+        if self._stopped:
+            return
+        self.queue.put(None)
+        self.thread.join()
+        self._stopped = True
+        self._raise_if_failed()
@@ -95,6 +95,8 @@ def make_dataset(cfg: TrainPipelineConfig) -> LeRobotDataset | MultiLeRobotDatas
             image_transforms=image_transforms,
             revision=cfg.dataset.revision,
             video_backend=cfg.dataset.video_backend,
+            video_decoder_cache_size=cfg.dataset.video_decoder_cache_size,
+            use_frame_cache=cfg.dataset.use_frame_cache,
         )
     else:
         raise NotImplementedError("The MultiLeRobotDataset isn't supported for now.")
@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Store of pre-decoded video frames, used to serve the camera keys of a `LeRobotDataset` without decoding
+its videos (see `LeRobotDataset.build_frame_cache`).
+
+Each video file of the dataset is stored as two numpy files that can be memory-mapped: its uint8 frames in
+channel first format and their timestamps. An index file lists the cached videos along with a fingerprint
+of `meta/info.json` and of the video files, which invalidates the cache whenever any of them changes.
+
+A typical frame cache looks like this from the root of the dataset:
+.
+└── frame_cache
+    ├── index.json
+    └── videos
+        └── chunk-000
+            └── observation.images.laptop
+                ├── episode_000000.npy
+                ├── episode_000000.timestamps.npy
+                └── ...
+"""
+
+import hashlib
+import shutil
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from lerobot.datasets.utils import INFO_PATH, load_json, write_json
+
+FRAME_CACHE_DIR = "frame_cache"
+FRAME_CACHE_INDEX_PATH = f"{FRAME_CACHE_DIR}/index.json"
+FRAME_CACHE_VERSION = 1
+
+
+def get_frame_cache_fingerprint(root: Path, video_paths: list[str]) -> str:
+    """Hash of `meta/info.json` and of the size and modification time of the given video files."""
+    hasher = hashlib.sha256()
+    hasher.update((root / INFO_PATH).read_bytes())
+    for video_path in sorted(video_paths):
+        stat = (root / video_path).stat()
+        hasher.update(f"{video_path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return hasher.hexdigest()
+
+
+def get_cached_frames_paths(video_path: Path | str) -> tuple[Path, Path]:
+    """Paths (relative to the dataset root) of the frames and timestamps stored for `video_path`."""
+    cache_path = Path(FRAME_CACHE_DIR) / video_path
+    return cache_path.with_suffix(".npy"), cache_path.with_suffix(".timestamps.npy")
+
+
+class FrameCache:
+    def __init__(self, root: Path, index: dict):
+        """Read access to a frame cache. Use `FrameCache.load` to check that the cache is up to date."""
+        self.root = root
+        self.index = index
+        self._arrays = {}
+
+    @classmethod
+    def load(cls, root: Path | str) -> "FrameCache":
+        root = Path(root)
+        index_path = root / FRAME_CACHE_INDEX_PATH
+        if not index_path.is_file():
+            raise FileNotFoundError(
+                f"No frame cache found in {root}. Build it first with `LeRobotDataset.build_frame_cache()` or "
+                "`python -m lerobot.scripts.build_frame_cache`."
+            )
+
+        index = load_json(index_path)
+        if index["version"] != FRAME_CACHE_VERSION:
+            raise ValueError(f"Unsupported frame cache version {index['version']} in {root}.")
+        fingerprint = get_frame_cache_fingerprint(root, list(index["videos"]))
+        if fingerprint != index["fingerprint"]:
+            raise ValueError(
+                f"The frame cache in {root} is out of date: 'meta/info.json' or some video files changed "
+                "since it was built. Please rebuild it."
+            )
+        return cls(root, index)
+
+    @classmethod
+    def write(
+        cls,
+        root: Path | str,
+        videos: Iterable[tuple[str, tuple[np.ndarray, np.ndarray]]],
+        resize: tuple[int, int] | None = None,
+    ) -> "FrameCache":
+        """Writes a new frame cache, replacing any existing one.
+
+        Args:
+            root (Path): Root of the dataset.
+            videos (Iterable): Pairs of video paths (relative to `root`) and of their uint8 frames (T, C, H, W)
+                and timestamps (T,), e.g. as returned by `decode_all_video_frames`. A generator can be used to
+                avoid holding the frames of all the videos in memory.
+            resize (tuple[int, int], optional): (height, width) to which frames were rescaled, for reference.
+        """
+        root = Path(root)
+        if (root / FRAME_CACHE_DIR).exists():
+            shutil.rmtree(root / FRAME_CACHE_DIR)
+
+        index = {"version": FRAME_CACHE_VERSION, "resize": resize, "videos": {}}
+        for video_path, (frames, timestamps) in videos:
+            frames_path, timestamps_path = get_cached_frames_paths(video_path)
+            (root / frames_path).parent.mkdir(parents=True, exist_ok=True)
+            np.save(root / frames_path, np.ascontiguousarray(frames, dtype=np.uint8))
+            np.save(root / timestamps_path, np.asarray(timestamps, dtype=np.float64))
+            index["videos"][str(video_path)] = {"num_frames": len(frames), "shape": list(frames.shape[1:])}
+
+        # The index is written last so that an interrupted build doesn't leave a seemingly valid cache behind.
+        index["fingerprint"] = get_frame_cache_fingerprint(root, list(index["videos"]))
+        write_json(index, root / FRAME_CACHE_INDEX_PATH)
+        return cls(root, index)
+
+    def __contains__(self, video_path: Path | str) -> bool:
+        return str(video_path) in self.index["videos"]
+
+    def _get_arrays(self, video_path: Path | str) -> tuple[np.ndarray, np.ndarray]:
+        video_path = str(video_path)
+        if video_path not in self._arrays:
+            if video_path not in self:
+                raise KeyError(f"{video_path} is not in the frame cache of {self.root}.")
+            frames_path, timestamps_path = get_cached_frames_paths(video_path)
+            self._arrays[video_path] = (
+                np.load(self.root / frames_path, mmap_mode="r"),
+                np.load(self.root / timestamps_path),
+            )
+        return self._arrays[video_path]
+
+    def get_frames(self, video_path: Path | str, timestamps: list[float], tolerance_s: float) -> torch.Tensor:
+        """Returns the cached frames closest to the requested timestamps, with the same checks and output
+        format as `decode_video_frames`: float32 in [0,1] range and channel first (N, C, H, W).
+        """
+        frames, loaded_ts = self._get_arrays(video_path)
+        query_ts = np.asarray(timestamps, dtype=np.float64)
+
+        # get closest loaded frame to each query timestamp (loaded timestamps are sorted)
+        if len(loaded_ts) == 1:
+            closest = np.zeros(len(query_ts), dtype=np.int64)
+        else:
+            right = np.searchsorted(loaded_ts, query_ts).clip(1, len(loaded_ts) - 1)
+            left = right - 1
+            closest = np.where(query_ts - loaded_ts[left] <= loaded_ts[right] - query_ts, left, right)
+        min_ = np.abs(loaded_ts[closest] - query_ts)
+
+        is_within_tol = min_ < tolerance_s
+        assert is_within_tol.all(), (
+            f"One or several query timestamps unexpectedly violate the tolerance ({min_[~is_within_tol]} > {tolerance_s=})."
+            "It means that the closest frame that can be loaded from the video is too far away in time."
+            "This might be due to synchronization issues with timestamps during data collection."
+            "To be safe, we advise to ignore this item during training."
+            f"\nqueried timestamps: {query_ts}"
+            f"\nloaded timestamps: {loaded_ts}"
+            f"\nvideo: {video_path}"
+            "\nbackend: frame cache"
+        )
+
+        closest_frames = torch.from_numpy(frames[closest])
+        return closest_frames.type(torch.float32) / 255
+
+    def __getstate__(self) -> dict:
+        # Memory-mapped arrays are re-opened by each process rather than copied when pickled.
+        state = self.__dict__.copy()
+        state["_arrays"] = {}
+        return state
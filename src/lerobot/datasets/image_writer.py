@@ -39,6 +39,10 @@ def safe_stop_image_writer(func):
 
 
 def image_array_to_pil_image(image_array: np.ndarray, range_check: bool = True) -> PIL.Image.Image:
+    return PIL.Image.fromarray(image_array_to_uint8_hwc(image_array, range_check))
+
+
+def image_array_to_uint8_hwc(image_array: np.ndarray, range_check: bool = True) -> np.ndarray:
     # TODO(aliberts): handle 1 channel and 4 for depth images
     if image_array.ndim != 3:
         raise ValueError(f"The array has {image_array.ndim} dimensions, but 3 is expected for an image.")
@@ -65,7 +69,7 @@ def image_array_to_pil_image(image_array: np.ndarray, range_check: bool = True)
 
         image_array = (image_array * 255).astype(np.uint8)
 
-    return PIL.Image.fromarray(image_array)
+    return image_array
 
 
 def write_image(image: np.ndarray | PIL.Image.Image, fpath: Path):
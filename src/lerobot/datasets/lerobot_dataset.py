@@ -15,14 +15,19 @@
 # limitations under the License.
 import contextlib
 import logging
+import multiprocessing
+import os
 import shutil
 from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import partial
 from pathlib import Path
 
 import datasets
 import numpy as np
 import packaging.version
 import PIL.Image
+import pyarrow as pa
 import torch
 import torch.utils
 from datasets import concatenate_datasets, load_dataset
@@ -32,7 +37,10 @@ from huggingface_hub.errors import RevisionNotFoundError
 
 from lerobot.constants import HF_LEROBOT_HOME
 from lerobot.datasets.compute_stats import aggregate_stats, compute_episode_stats
+from lerobot.datasets.episode_saver import JOURNAL_DIR, AsyncEpisodeSaver, load_journal, remove_journal_entry
+from lerobot.datasets.frame_cache import FRAME_CACHE_DIR, FrameCache
 from lerobot.datasets.image_writer import AsyncImageWriter, write_image
+from lerobot.datasets.streaming_encoder import StreamingVideoEncoder, compute_video_stats
 from lerobot.datasets.utils import (
     DEFAULT_FEATURES,
     DEFAULT_IMAGE_PATH,
@@ -66,9 +74,12 @@ from lerobot.datasets.utils import (
     write_json,
 )
 from lerobot.datasets.video_utils import (
+    VideoDecoderCache,
     VideoFrame,
+    decode_all_video_frames,
     decode_video_frames,
     encode_video_frames,
+    get_partial_video_path,
     get_safe_default_codec,
     get_video_info,
 )
@@ -327,6 +338,16 @@ class LeRobotDatasetMetadata:
         return obj
 
 
+def _encode_video_frames_safe(imgs_dir: Path, video_path: Path, **kwargs) -> Exception | None:
+    """Calls `encode_video_frames` and returns the exception it raised, if any, for failures to be reported
+    without interrupting the other videos of a batch."""
+    try:
+        encode_video_frames(imgs_dir, video_path, **kwargs)
+    except Exception as e:
+        return e
+    return None
+
+
 class LeRobotDataset(torch.utils.data.Dataset):
     def __init__(
         self,
@@ -341,6 +362,9 @@ class LeRobotDataset(torch.utils.data.Dataset):
         download_videos: bool = True,
         video_backend: str | None = None,
         batch_encoding_size: int = 1,
+        video_encoding_workers: int | None = None,
+        video_decoder_cache_size: int = 0,
+        use_frame_cache: bool = False,
     ):
         """
         2 modes are available for instantiating this class, depending on 2 different use cases:
@@ -444,6 +468,17 @@ class LeRobotDataset(torch.utils.data.Dataset):
                 You can also use the 'pyav' decoder used by Torchvision, which used to be the default option, or 'video_reader' which is another decoder of Torchvision.
             batch_encoding_size (int, optional): Number of episodes to accumulate before batch encoding videos.
                 Set to 1 for immediate encoding (default), or higher for batched encoding. Defaults to 1.
+            video_encoding_workers (int | None, optional): Number of threads or processes encoding videos in
+                parallel when recording, see `batch_encode_videos`. Set to 0 to encode the videos one after the
+                other in the main process. Defaults to None, which uses one worker per video to encode, up to
+                the number of CPUs.
+            video_decoder_cache_size (int, optional): Maximum number of video decoders kept open (per process,
+                i.e. per DataLoader worker) so that successive queries on the same video file don't re-open it
+                and re-parse its index. Least recently used decoders are closed first. Set to 0 to open a new
+                decoder for every query. Defaults to 0.
+            use_frame_cache (bool, optional): Serve the video keys from the frames pre-decoded in
+                'root/frame_cache' by `build_frame_cache()` instead of decoding the videos. Raises an error if
+                the cache is missing, incomplete or out of date. Defaults to False.
         """
         super().__init__()
         self.repo_id = repo_id
@@ -456,10 +491,17 @@ class LeRobotDataset(torch.utils.data.Dataset):
         self.video_backend = video_backend if video_backend else get_safe_default_codec()
         self.delta_indices = None
         self.batch_encoding_size = batch_encoding_size
+        self.video_encoding_workers = video_encoding_workers
         self.episodes_since_last_encoding = 0
+        self.video_decoder_cache = (
+            VideoDecoderCache(video_decoder_cache_size) if video_decoder_cache_size > 0 else None
+        )
+        self._column_store = None
 
         # Unused attributes
         self.image_writer = None
+        self.video_encoders = None
+        self.episode_saver = None
         self.episode_buffer = None
 
         self.root.mkdir(exist_ok=True, parents=True)
@@ -485,6 +527,18 @@ class LeRobotDataset(torch.utils.data.Dataset):
 
         self.episode_data_index = get_episode_data_index(self.meta.episodes, self.episodes)
 
+        self.frame_cache = None
+        if use_frame_cache:
+            self.frame_cache = FrameCache.load(self.root)
+            missing_videos = [
+                fpath for fpath in self._get_video_file_paths() if fpath not in self.frame_cache
+            ]
+            if len(missing_videos) > 0:
+                raise ValueError(
+                    f"The frame cache of {self.root} doesn't contain all the selected videos (missing "
+                    f"{missing_videos}). Please rebuild it."
+                )
+
         # Check timestamps
         timestamps = torch.stack(self.hf_dataset["timestamp"]).numpy()
         episode_indices = torch.stack(self.hf_dataset["episode_index"]).numpy()
@@ -495,6 +549,7 @@ class LeRobotDataset(torch.utils.data.Dataset):
         if self.delta_timestamps is not None:
             check_delta_timestamps(self.delta_timestamps, self.fps, self.tolerance_s)
             self.delta_indices = get_delta_indices(self.delta_timestamps, self.fps)
+            self._column_store = self._build_column_store()
 
     def push_to_hub(
         self,
@@ -508,7 +563,7 @@ class LeRobotDataset(torch.utils.data.Dataset):
         upload_large_folder: bool = False,
         **card_kwargs,
     ) -> None:
-        ignore_patterns = ["images/"]
+        ignore_patterns = ["images/", f"{FRAME_CACHE_DIR}/", f"{JOURNAL_DIR}/"]
         if not push_videos:
             ignore_patterns.append("videos/")
 
@@ -584,16 +639,17 @@ class LeRobotDataset(torch.utils.data.Dataset):
     def get_episodes_file_paths(self) -> list[Path]:
         episodes = self.episodes if self.episodes is not None else list(range(self.meta.total_episodes))
         fpaths = [str(self.meta.get_data_file_path(ep_idx)) for ep_idx in episodes]
-        if len(self.meta.video_keys) > 0:
-            video_files = [
-                str(self.meta.get_video_file_path(ep_idx, vid_key))
-                for vid_key in self.meta.video_keys
-                for ep_idx in episodes
-            ]
-            fpaths += video_files
-
+        fpaths += self._get_video_file_paths()
         return fpaths
 
+    def _get_video_file_paths(self) -> list[str]:
+        episodes = self.episodes if self.episodes is not None else list(range(self.meta.total_episodes))
+        return [
+            str(self.meta.get_video_file_path(ep_idx, vid_key))
+            for vid_key in self.meta.video_keys
+            for ep_idx in episodes
+        ]
+
     def load_hf_dataset(self) -> datasets.Dataset:
         """hf_dataset contains all the observations, states, actions, rewards, etc."""
         if self.episodes is None:
@@ -643,19 +699,61 @@ class LeRobotDataset(torch.utils.data.Dataset):
         else:
             return get_hf_features_from_features(self.features)
 
-    def _get_query_indices(self, idx: int, ep_idx: int) -> tuple[dict[str, list[int | bool]]]:
-        ep_start = self.episode_data_index["from"][ep_idx]
-        ep_end = self.episode_data_index["to"][ep_idx]
-        query_indices = {
-            key: [max(ep_start.item(), min(ep_end.item() - 1, idx + delta)) for delta in delta_idx]
-            for key, delta_idx in self.delta_indices.items()
-        }
-        padding = {  # Pad values outside of current episode range
-            f"{key}_is_pad": torch.BoolTensor(
-                [(idx + delta < ep_start.item()) | (idx + delta >= ep_end.item()) for delta in delta_idx]
-            )
-            for key, delta_idx in self.delta_indices.items()
-        }
+    def _build_column_store(self) -> dict[str, np.ndarray]:
+        """Loads every numerical column of `hf_dataset` (i.e. all but images, videos and strings) in a numpy
+        array, so that delta timestamps queries can gather rows with vectorized indexing instead of going
+        through `hf_dataset.select`.
+
+        Values are cast the same way `hf_transform_to_torch` does it (floating points to float32 and integers to
+        int64), so that both paths return identical tensors.
+        """
+        keys = [
+            key
+            for key, ft in self.features.items()
+            if ft["dtype"] not in ["image", "video", "string"] and key in self.hf_dataset.column_names
+        ]
+        table = self.hf_dataset.with_format("arrow", columns=keys)[:]
+
+        column_store = {}
+        for key in keys:
+            values = table.column(key).combine_chunks()
+            if isinstance(values.type, pa.ExtensionType):
+                values = values.storage
+            while pa.types.is_list(values.type) or pa.types.is_fixed_size_list(values.type):
+                values = values.flatten()
+            shape = () if self.features[key]["shape"] == (1,) else self.features[key]["shape"]
+            values = values.to_numpy(zero_copy_only=False).reshape(len(table), *shape)
+            if np.issubdtype(values.dtype, np.floating):
+                column_store[key] = values.astype(np.float32, copy=False)
+            elif np.issubdtype(values.dtype, np.integer):
+                column_store[key] = values.astype(np.int64, copy=False)
+            elif values.dtype == np.bool_:
+                column_store[key] = values
+        return column_store
+
+    def _get_column_store(self) -> dict[str, np.ndarray]:
+        if self._column_store is None:
+            self._column_store = self._build_column_store()
+        return self._column_store
+
+    def _get_query_indices(
+        self, indices: np.ndarray, ep_indices: np.ndarray
+    ) -> tuple[dict[str, np.ndarray], dict[str, np.ndarray]]:
+        """Computes the indices to query for every delta of every key, for a batch of frame `indices` belonging
+        to the episodes `ep_indices`.
+
+        Query indices are clamped to the episode boundaries and the "{key}_is_pad" masks flag the ones that fell
+        outside of the episode. All the returned arrays are of shape (batch_size, num_deltas).
+        """
+        ep_start = self.episode_data_index["from"].numpy()[ep_indices][:, None]
+        ep_end = self.episode_data_index["to"].numpy()[ep_indices][:, None]
+
+        query_indices, padding = {}, {}
+        for key, delta_idx in self.delta_indices.items():
+            unclamped_indices = indices[:, None] + np.asarray(delta_idx)[None, :]
+            query_indices[key] = np.clip(unclamped_indices, ep_start, ep_end - 1)
+            # Pad values outside of current episode range
+            padding[f"{key}_is_pad"] = (unclamped_indices < ep_start) | (unclamped_indices >= ep_end)
         return query_indices, padding
 
     def _get_query_timestamps(
@@ -666,19 +764,28 @@ class LeRobotDataset(torch.utils.data.Dataset):
         query_timestamps = {}
         for key in self.meta.video_keys:
             if query_indices is not None and key in query_indices:
-                timestamps = self.hf_dataset.select(query_indices[key])["timestamp"]
-                query_timestamps[key] = torch.stack(timestamps).tolist()
+                query_timestamps[key] = self._get_column_store()["timestamp"][query_indices[key]].tolist()
             else:
                 query_timestamps[key] = [current_ts]
 
         return query_timestamps
 
-    def _query_hf_dataset(self, query_indices: dict[str, list[int]]) -> dict:
-        return {
-            key: torch.stack(self.hf_dataset.select(q_idx)[key])
-            for key, q_idx in query_indices.items()
-            if key not in self.meta.video_keys
-        }
+    def _query_hf_dataset(self, query_indices: dict[str, np.ndarray]) -> dict[str, np.ndarray | list]:
+        """Gathers the values of `query_indices` (arrays of shape (batch_size, num_deltas)) for every key.
+
+        Numerical keys are gathered at once from the column store. Other keys (e.g. images) are queried from
+        `hf_dataset` and returned as one stacked tensor per item of the batch.
+        """
+        column_store = self._get_column_store()
+        result = {}
+        for key, q_idx in query_indices.items():
+            if key in self.meta.video_keys:
+                continue
+            elif key in column_store:
+                result[key] = column_store[key][q_idx]
+            else:
+                result[key] = [torch.stack(self.hf_dataset.select(item_q_idx)[key]) for item_q_idx in q_idx]
+        return result
 
     def _query_videos(self, query_timestamps: dict[str, list[float]], ep_idx: int) -> dict[str, torch.Tensor]:
         """Note: When using data workers (e.g. DataLoader with num_workers>0), do not call this function
@@ -688,12 +795,19 @@ class LeRobotDataset(torch.utils.data.Dataset):
         """
         item = {}
         for vid_key, query_ts in query_timestamps.items():
-            video_path = self.root / self.meta.get_video_file_path(ep_idx, vid_key)
-            frames = decode_video_frames(video_path, query_ts, self.tolerance_s, self.video_backend)
+            frames = self._decode_frames(ep_idx, vid_key, query_ts)
             item[vid_key] = frames.squeeze(0)
 
         return item
 
+    def _decode_frames(self, ep_idx: int, vid_key: str, timestamps: list[float]) -> torch.Tensor:
+        video_path = self.meta.get_video_file_path(ep_idx, vid_key)
+        if self.frame_cache is not None:
+            return self.frame_cache.get_frames(video_path, timestamps, self.tolerance_s)
+        return decode_video_frames(
+            self.root / video_path, timestamps, self.tolerance_s, self.video_backend, self.video_decoder_cache
+        )
+
     def _add_padding_keys(self, item: dict, padding: dict[str, list[bool]]) -> dict:
         for key, val in padding.items():
             item[key] = torch.BoolTensor(val)
@@ -702,24 +816,99 @@ class LeRobotDataset(torch.utils.data.Dataset):
     def __len__(self):
         return self.num_frames
 
-    def __getitem__(self, idx) -> dict:
-        item = self.hf_dataset[idx]
-        ep_idx = item["episode_index"].item()
+    def _get_items_without_videos(self, indices: list[int]) -> list[tuple[dict, dict[str, list[float]]]]:
+        """Returns the items at `indices` without their video frames, along with the timestamps to decode them.
+
+        The delta timestamps windows and padding masks of the whole batch are computed and gathered at once.
+        """
+        items = [self.hf_dataset[idx] for idx in indices]
 
         query_indices = None
         if self.delta_indices is not None:
-            query_indices, padding = self._get_query_indices(idx, ep_idx)
+            ep_indices = np.array([item["episode_index"].item() for item in items])
+            query_indices, padding = self._get_query_indices(np.array(indices), ep_indices)
             query_result = self._query_hf_dataset(query_indices)
-            item = {**item, **padding}
-            for key, val in query_result.items():
-                item[key] = val
-
-        if len(self.meta.video_keys) > 0:
-            current_ts = item["timestamp"].item()
-            query_timestamps = self._get_query_timestamps(current_ts, query_indices)
-            video_frames = self._query_videos(query_timestamps, ep_idx)
+            for i, item in enumerate(items):
+                item = {**item, **{key: torch.from_numpy(val[i]) for key, val in padding.items()}}
+                for key, val in query_result.items():
+                    item[key] = torch.from_numpy(val[i]) if isinstance(val, np.ndarray) else val[i]
+                items[i] = item
+
+        query_timestamps = [{} for _ in items]
+        for key in self.meta.video_keys:
+            if query_indices is not None and key in query_indices:
+                timestamps = self._get_column_store()["timestamp"][query_indices[key]].tolist()
+            else:
+                timestamps = [[item["timestamp"].item()] for item in items]
+            for item_query_timestamps, item_timestamps in zip(query_timestamps, timestamps, strict=True):
+                item_query_timestamps[key] = item_timestamps
+
+        return list(zip(items, query_timestamps, strict=True))
+
+    def __getitem__(self, idx) -> dict:
+        [(item, query_timestamps)] = self._get_items_without_videos([idx])
+
+        if len(query_timestamps) > 0:
+            video_frames = self._query_videos(query_timestamps, item["episode_index"].item())
             item = {**video_frames, **item}
 
+        return self._finalize_item(item)
+
+    def __getitems__(self, indices: list[int]) -> list[dict]:
+        """Batched version of `__getitem__`, used by the DataLoader to fetch a whole batch at once.
+
+        The delta timestamps windows of the whole batch are gathered with vectorized indexing. All the frames
+        that the batch requests from a given video file are decoded with a single call to the decoder, which
+        amortizes key frame seeks when the batch contains several frames of the same episode (see
+        `EpisodeWindowBatchSampler`). The returned items are identical to the ones of `__getitem__`.
+        """
+        fetched = self._get_items_without_videos(indices)
+        if len(self.meta.video_keys) == 0:
+            return [self._finalize_item(item) for item, _ in fetched]
+
+        requested_timestamps = {}
+        for item, query_timestamps in fetched:
+            ep_idx = item["episode_index"].item()
+            for vid_key, query_ts in query_timestamps.items():
+                requested_timestamps.setdefault((ep_idx, vid_key), set()).update(query_ts)
+
+        decoded_frames = {}
+        for (ep_idx, vid_key), timestamps in requested_timestamps.items():
+            for group_ts in self._group_decoding_timestamps(sorted(timestamps)):
+                frames = self._decode_frames(ep_idx, vid_key, group_ts)
+                for ts, frame in zip(group_ts, frames, strict=True):
+                    decoded_frames[(ep_idx, vid_key, ts)] = frame
+
+        batch = []
+        for item, query_timestamps in fetched:
+            ep_idx = item["episode_index"].item()
+            video_frames = {
+                vid_key: torch.stack([decoded_frames[(ep_idx, vid_key, ts)] for ts in query_ts]).squeeze(0)
+                for vid_key, query_ts in query_timestamps.items()
+            }
+            batch.append(self._finalize_item({**video_frames, **item}))
+
+        return batch
+
+    def _group_decoding_timestamps(self, timestamps: list[float]) -> list[list[float]]:
+        """Splits sorted timestamps into the groups of frames that should be decoded together.
+
+        torchcodec (and the frame cache) seek to each requested frame independently, so all the timestamps can
+        be decoded at once. The torchvision backends decode every frame between the first and last requested
+        timestamps, so timestamps are split wherever consecutive requested frames are not adjacent in the video.
+        """
+        if self.frame_cache is not None or self.video_backend == "torchcodec":
+            return [timestamps]
+
+        max_gap = 1 / self.fps + self.tolerance_s
+        groups = [[timestamps[0]]]
+        for ts in timestamps[1:]:
+            if ts - groups[-1][-1] > max_gap:
+                groups.append([])
+            groups[-1].append(ts)
+        return groups
+
+    def _finalize_item(self, item: dict) -> dict:
         if self.image_transforms is not None:
             image_keys = self.meta.camera_keys
             for cam in image_keys:
@@ -769,8 +958,9 @@ class LeRobotDataset(torch.utils.data.Dataset):
     def add_frame(self, frame: dict, task: str, timestamp: float | None = None) -> None:
         """
         This function only adds the frame to the episode_buffer. Apart from images — which are written in a
-        temporary directory — nothing is written to disk. To save those frames, the 'save_episode()' method
-        then needs to be called.
+        temporary directory, or fed to the video encoders when they are started with 'start_video_encoders()'
+        — nothing is written to disk. To save those frames, the 'save_episode()' method then needs to be
+        called.
         """
         # Convert torch to numpy if needed
         for name in frame:
@@ -797,7 +987,15 @@ class LeRobotDataset(torch.utils.data.Dataset):
                     f"An element of the frame is not in the features. '{key}' not in '{self.features.keys()}'."
                 )
 
-            if self.features[key]["dtype"] in ["image", "video"]:
+            if self.video_encoders is not None and key in self.video_encoders:
+                video_path = self.root / self.meta.get_video_file_path(
+                    self.episode_buffer["episode_index"], key
+                )
+                if frame_index == 0:
+                    self.video_encoders[key].start_episode(video_path)
+                self.video_encoders[key].add_frame(frame[key])
+                self.episode_buffer[key].append(str(video_path))
+            elif self.features[key]["dtype"] in ["image", "video"]:
                 img_path = self._get_image_file_path(
                     episode_index=self.episode_buffer["episode_index"], image_key=key, frame_index=frame_index
                 )
@@ -817,6 +1015,8 @@ class LeRobotDataset(torch.utils.data.Dataset):
         Video encoding is handled automatically based on batch_encoding_size:
         - If batch_encoding_size == 1: Videos are encoded immediately after each episode
         - If batch_encoding_size > 1: Videos are encoded in batches.
+        When the video encoders are started (see 'start_video_encoders()'), videos are instead encoded while
+        the frames are added and only need to be finalized here, regardless of batch_encoding_size.
 
         Args:
             episode_data (dict | None, optional): Dict containing the episode data to save. If None, this will
@@ -826,8 +1026,45 @@ class LeRobotDataset(torch.utils.data.Dataset):
         if not episode_data:
             episode_buffer = self.episode_buffer
 
-        validate_episode_buffer(episode_buffer, self.meta.total_episodes, self.features)
+        if self.episode_saver is not None:
+            episode_index = self.episode_saver.next_episode_index
+        else:
+            episode_index = self.meta.total_episodes
+        validate_episode_buffer(episode_buffer, episode_index, self.features)
+
+        # Streamed videos are ended right away so that the encoders are ready for the next episode
+        streamed_video_keys = []
+        if self.video_encoders is not None:
+            for key, encoder in self.video_encoders.items():
+                encoder.end_episode()
+                streamed_video_keys.append(key)
+        # Images are written by the main process, they must be on disk before saving the episode
+        self._wait_image_writer()
+
+        entry = {"episode_buffer": episode_buffer, "streamed_video_keys": streamed_video_keys}
+        if self.episode_saver is not None:
+            self.episode_saver.submit(entry)
+        else:
+            self._save_episode_entry(entry)
 
+        if not episode_data:  # Reset the buffer
+            self.episode_buffer = self.create_episode_buffer(episode_index + 1)
+
+    def _save_episode_entry(self, entry: dict, from_encoders: bool = True) -> None:
+        """Saves an episode submitted by 'save_episode()', possibly from the journal of an interrupted recording
+        (`from_encoders=False`), in which case the stats of the videos already written are computed from them.
+        """
+        episode_index = entry["episode_buffer"]["episode_index"]
+        video_stats = {}
+        for key in self.meta.video_keys:
+            video_path = self.root / self.meta.get_video_file_path(episode_index, key)
+            if from_encoders and key in entry["streamed_video_keys"]:
+                video_stats[key] = self.video_encoders[key].wait_episode(video_path)
+            elif not from_encoders and video_path.is_file():
+                video_stats[key] = compute_video_stats(video_path)
+        self._save_episode(entry["episode_buffer"], video_stats)
+
+    def _save_episode(self, episode_buffer: dict, video_stats: dict[str, dict]) -> None:
         # size and task are special cases that won't be added to hf_dataset
         episode_length = episode_buffer.pop("size")
         tasks = episode_buffer.pop("task")
@@ -853,17 +1090,24 @@ class LeRobotDataset(torch.utils.data.Dataset):
                 continue
             episode_buffer[key] = np.stack(episode_buffer[key])
 
-        self._wait_image_writer()
-        self._save_episode_table(episode_buffer, episode_index)
-        ep_stats = compute_episode_stats(episode_buffer, self.features)
+        ep_stats = compute_episode_stats(
+            {key: data for key, data in episode_buffer.items() if key not in video_stats}, self.features
+        )
+        ep_stats.update(video_stats)
 
-        has_video_keys = len(self.meta.video_keys) > 0
+        has_video_keys = any(key not in video_stats for key in self.meta.video_keys)
         use_batched_encoding = self.batch_encoding_size > 1
 
         if has_video_keys and not use_batched_encoding:
             self.encode_episode_videos(episode_index)
+        elif len(video_stats) > 0 and episode_index == 0:
+            # Update video info (only needed when first episode is encoded since it reads from episode 0)
+            self.meta.update_video_info()
+            write_info(self.meta.info, self.meta.root)  # ensure video info always written properly
 
-        # `meta.save_episode` should be executed after encoding the videos
+        # The episode table is written last, so that an interrupted save doesn't leave an episode behind in
+        # 'data' for longer than needed, and `meta.save_episode` should be executed after encoding the videos
+        self._save_episode_table(episode_buffer, episode_index)
         self.meta.save_episode(episode_index, episode_length, episode_tasks, ep_stats)
 
         # Check if we should trigger batch encoding
@@ -889,16 +1133,13 @@ class LeRobotDataset(torch.utils.data.Dataset):
             self.tolerance_s,
         )
 
-        # Verify that we have one parquet file per episode and the number of video files matches the number of encoded episodes
-        parquet_files = list(self.root.rglob("*.parquet"))
-        assert len(parquet_files) == self.num_episodes
-        video_files = list(self.root.rglob("*.mp4"))
-        assert len(video_files) == (self.num_episodes - self.episodes_since_last_encoding) * len(
-            self.meta.video_keys
-        )
-
-        if not episode_data:  # Reset the buffer
-            self.episode_buffer = self.create_episode_buffer()
+        # Verify that the files of the episode were written. Only the files of this episode are checked, so
+        # that the cost of this check doesn't grow with the size of the dataset.
+        assert self.meta.total_episodes == episode_index + 1
+        assert (self.root / self.meta.get_data_file_path(episode_index)).is_file()
+        if self.episodes_since_last_encoding == 0:
+            for key in self.meta.video_keys:
+                assert (self.root / self.meta.get_video_file_path(episode_index, key)).is_file()
 
     def _save_episode_table(self, episode_buffer: dict, episode_index: int) -> None:
         episode_dict = {key: episode_buffer[key] for key in self.hf_features}
@@ -906,6 +1147,7 @@ class LeRobotDataset(torch.utils.data.Dataset):
         ep_dataset = embed_images(ep_dataset)
         self.hf_dataset = concatenate_datasets([self.hf_dataset, ep_dataset])
         self.hf_dataset.set_transform(hf_transform_to_torch)
+        self._column_store = None
         ep_data_path = self.root / self.meta.get_data_file_path(ep_index=episode_index)
         ep_data_path.parent.mkdir(parents=True, exist_ok=True)
         ep_dataset.to_parquet(ep_data_path)
@@ -922,8 +1164,12 @@ class LeRobotDataset(torch.utils.data.Dataset):
                 if img_dir.is_dir():
                     shutil.rmtree(img_dir)
 
-        # Reset the buffer
-        self.episode_buffer = self.create_episode_buffer()
+        if self.video_encoders is not None:
+            for encoder in self.video_encoders.values():
+                encoder.cancel_episode()
+
+        # Reset the buffer, keeping its episode index which may be ahead of the saved episodes
+        self.episode_buffer = self.create_episode_buffer(episode_index)
 
     def start_image_writer(self, num_processes: int = 0, num_threads: int = 4) -> None:
         if isinstance(self.image_writer, AsyncImageWriter):
@@ -950,56 +1196,237 @@ class LeRobotDataset(torch.utils.data.Dataset):
         if self.image_writer is not None:
             self.image_writer.wait_until_done()
 
-    def encode_episode_videos(self, episode_index: int) -> None:
+    def start_async_saving(self, max_queue_size: int = 2) -> None:
         """
-        Use ffmpeg to convert frames stored as png into mp4 videos.
-        Note: `encode_video_frames` is a blocking call. Making it asynchronous shouldn't speedup encoding,
-        since video encoding with ffmpeg is already using multithreading.
-
-        This method handles video encoding steps:
-        - Video encoding via ffmpeg
-        - Video info updating in metadata
-        - Raw image cleanup
+        Saves the episodes in a background thread (see `lerobot.datasets.episode_saver`), so that 'save_episode()'
+        returns right away and the next episode can be recorded while the previous ones are being saved.
+        Submitted episodes are journaled on disk until they are saved: the episodes journaled by an
+        interrupted recording are saved first.
 
         Args:
-            episode_index (int): Index of the episode to encode.
+            max_queue_size (int, optional): Maximum number of episodes waiting to be saved, after which
+                'save_episode()' blocks. Defaults to 2.
+        """
+        if self.episode_saver is not None:
+            logging.warning("Episodes are already saved in the background.")
+            return
+
+        self.save_journaled_episodes()
+        self.episode_saver = AsyncEpisodeSaver(
+            self.root, self._save_episode_entry, self.meta.total_episodes, max_queue_size
+        )
+
+    def stop_async_saving(self) -> None:
+        """Waits for the episodes submitted to 'save_episode()' to be saved and stops the background thread."""
+        if self.episode_saver is not None:
+            try:
+                self.episode_saver.stop()
+            finally:
+                self.episode_saver = None
+
+    def save_journaled_episodes(self) -> None:
+        """Saves the episodes left in the journal by a recording which was interrupted while saving them.
+
+        An episode whose streamed videos were not finalized before the interruption can't be saved, as its
+        frames were only kept by the encoders: it is dropped from the journal, along with the episodes
+        journaled after it (their episode index would be wrong).
         """
+        dropped_episode_index = None
+        for episode_index, entry in load_journal(self.root):
+            if episode_index < self.meta.total_episodes:
+                # The episode was saved but not yet removed from the journal
+                remove_journal_entry(self.root, episode_index)
+                continue
+
+            missing_video_keys = [
+                key
+                for key in entry["streamed_video_keys"]
+                if not (self.root / self.meta.get_video_file_path(episode_index, key)).is_file()
+            ]
+            if dropped_episode_index is None and len(missing_video_keys) > 0:
+                logging.warning(
+                    f"The videos of episode {episode_index} for {missing_video_keys} were not finalized before "
+                    "the recording was interrupted. This episode and the following ones are dropped."
+                )
+                dropped_episode_index = episode_index
+
+            self._remove_unsaved_episode_files(episode_index, remove_videos=dropped_episode_index is not None)
+            if dropped_episode_index is None:
+                logging.info(f"Saving episode {episode_index} from the journal of an interrupted recording")
+                self._save_episode_entry(entry, from_encoders=False)
+            remove_journal_entry(self.root, episode_index)
+
+    def _remove_unsaved_episode_files(self, episode_index: int, remove_videos: bool) -> None:
+        """Removes the files left over by an interrupted save of an episode, and optionally its videos and
+        images."""
+        data_path = self.root / self.meta.get_data_file_path(episode_index)
+        if data_path.is_file():
+            # It must not be loaded along with the saved episodes
+            data_path.unlink()
+            self.hf_dataset = self.load_hf_dataset()
+        if not remove_videos:
+            return
         for key in self.meta.video_keys:
             video_path = self.root / self.meta.get_video_file_path(episode_index, key)
-            if video_path.is_file():
-                # Skip if video is already encoded. Could be the case when resuming data recording.
-                continue
-            img_dir = self._get_image_file_path(
-                episode_index=episode_index, image_key=key, frame_index=0
-            ).parent
-            encode_video_frames(img_dir, video_path, self.fps, overwrite=True)
-            shutil.rmtree(img_dir)
+            video_path.unlink(missing_ok=True)
+            get_partial_video_path(video_path).unlink(missing_ok=True)
+        for key in self.meta.camera_keys:
+            img_dir = self._get_image_file_path(episode_index, key, frame_index=0).parent
+            if img_dir.is_dir():
+                shutil.rmtree(img_dir)
+
+    def start_video_encoders(self, num_slots: int = 64) -> None:
+        """
+        Starts one background encoder per video key, to which 'add_frame' streams the camera frames through a
+        shared memory ring buffer (see `lerobot.datasets.streaming_encoder`). This replaces writing the frames
+        as png images and encoding them in 'save_episode', which then only has to finalize the videos.
 
-        # Update video info (only needed when first episode is encoded since it reads from episode 0)
-        if len(self.meta.video_keys) > 0 and episode_index == 0:
-            self.meta.update_video_info()
-            write_info(self.meta.info, self.meta.root)  # ensure video info always written properly
+        Args:
+            num_slots (int, optional): Number of frames each ring buffer can hold before 'add_frame' blocks
+                waiting for the encoder. Defaults to 64.
+        """
+        if self.video_encoders is not None:
+            logging.warning("You are starting new video encoders that are replacing the existing ones.")
+            self.stop_video_encoders()
+
+        self.video_encoders = {}
+        for key in self.meta.video_keys:
+            height, width, _ = self.features[key]["shape"]
+            self.video_encoders[key] = StreamingVideoEncoder(self.fps, height, width, num_slots=num_slots)
+
+    def stop_video_encoders(self) -> None:
+        """
+        Stops the video encoders, discarding the videos of an episode which wasn't saved. Like
+        'stop_image_writer()', this needs to be called before wrapping the dataset inside a parallelized
+        DataLoader.
+        """
+        if self.video_encoders is not None:
+            for encoder in self.video_encoders.values():
+                encoder.stop()
+            self.video_encoders = None
+
+    def encode_episode_videos(self, episode_index: int) -> None:
+        """
+        Use ffmpeg to convert frames stored as png into mp4 videos, one per camera. The cameras are encoded in
+        parallel threads of the main process, see `batch_encode_videos`.
+
+        Args:
+            episode_index (int): Index of the episode to encode.
+        """
+        self.batch_encode_videos(episode_index, episode_index + 1)
 
-    def batch_encode_videos(self, start_episode: int = 0, end_episode: int | None = None) -> None:
+    def batch_encode_videos(
+        self,
+        start_episode: int = 0,
+        end_episode: int | None = None,
+        num_workers: int | None = None,
+        num_threads_per_encoder: int | None = None,
+    ) -> None:
         """
-        Batch encode videos for multiple episodes.
+        Batch encode videos for multiple episodes, encoding the videos of all the episodes and cameras in
+        parallel.
+
+        The videos of a single episode are encoded by threads of the main process, as the encoders mostly run
+        outside of the GIL and this avoids starting processes for every recorded episode. The videos of several
+        episodes are encoded in a pool of processes started with the "spawn" method, as forking the recording
+        process while its camera and robot threads are running could deadlock.
+
+        This method handles video encoding steps:
+        - Video encoding via ffmpeg
+        - Raw image cleanup of each successfully encoded video
+        - Video info updating in metadata, once all the videos are encoded
+
+        A video which fails to encode doesn't interrupt the others: its images are kept on disk and an error
+        listing all the failed videos is raised once the batch is done.
 
         Args:
             start_episode: Starting episode index (inclusive)
             end_episode: Ending episode index (exclusive). If None, encodes all episodes from start_episode
+            num_workers: Number of encoding threads or processes. Set to 0 to encode the videos one after the
+                other in the main process. If None, uses `video_encoding_workers` given at instantiation, which
+                defaults to one worker per video up to the number of CPUs.
+            num_threads_per_encoder: Number of threads used by each encoder. If None, the CPUs are split
+                evenly between the encoding workers.
         """
         if end_episode is None:
             end_episode = self.meta.total_episodes
+        if num_workers is None:
+            num_workers = self.video_encoding_workers
 
         logging.info(f"Starting batch video encoding for episodes {start_episode} to {end_episode - 1}")
 
-        # Encode all episodes with cleanup enabled for individual episodes
+        jobs = []
         for ep_idx in range(start_episode, end_episode):
-            logging.info(f"Encoding videos for episode {ep_idx}")
-            self.encode_episode_videos(ep_idx)
+            for key in self.meta.video_keys:
+                video_path = self.root / self.meta.get_video_file_path(ep_idx, key)
+                if video_path.is_file():
+                    # Skip if video is already encoded. Could be the case when resuming data recording.
+                    continue
+                img_dir = self._get_image_file_path(episode_index=ep_idx, image_key=key, frame_index=0).parent
+                jobs.append((img_dir, video_path))
+
+        num_cpus = os.cpu_count() or 1
+        if num_workers is None:
+            num_workers = min(len(jobs), num_cpus)
+        if num_threads_per_encoder is None:
+            num_threads_per_encoder = max(1, num_cpus // max(1, num_workers))
+
+        encode = partial(
+            _encode_video_frames_safe, fps=self.fps, overwrite=True, num_threads=num_threads_per_encoder
+        )
+        use_pool = num_workers > 0 and len(jobs) > 1
+        if not use_pool:
+            pool = contextlib.nullcontext()
+        elif end_episode - start_episode > 1:
+            pool = ProcessPoolExecutor(
+                max_workers=num_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            pool = ThreadPoolExecutor(max_workers=num_workers)
+        failures = {}
+        with pool as executor:
+            if use_pool:
+                futures = {executor.submit(encode, *job): job for job in jobs}
+                results = ((futures[future], future.result()) for future in as_completed(futures))
+            else:
+                results = ((job, encode(*job)) for job in jobs)
 
+            for num_done, ((img_dir, video_path), error) in enumerate(results, start=1):
+                if error is None:
+                    shutil.rmtree(img_dir)
+                    logging.info(f"Encoded {num_done}/{len(jobs)} videos ({video_path})")
+                else:
+                    logging.error(f"Failed to encode {num_done}/{len(jobs)} videos ({video_path}): {error}")
+                    failures[str(video_path)] = error
+
+        # Update video info (only needed when first episode is encoded since it reads from episode 0)
+        first_videos = [self.root / self.meta.get_video_file_path(0, key) for key in self.meta.video_keys]
+        if start_episode == 0 < end_episode and all(fpath.is_file() for fpath in first_videos):
+            self.meta.update_video_info()
+            write_info(self.meta.info, self.meta.root)  # ensure video info always written properly
+
+        if len(failures) > 0:
+            raise RuntimeError(
+                f"Failed to encode {len(failures)}/{len(jobs)} videos, their images were kept on disk: "
+                f"{list(failures)}"
+            )
         logging.info("Batch video encoding completed")
 
+    def build_frame_cache(self, resize: tuple[int, int] | None = None) -> None:
+        """Decodes all the videos of the selected episodes once and stores their frames as uint8 arrays in
+        'root/frame_cache' (see `lerobot.datasets.frame_cache`). The video keys are then served from this
+        cache, which can be reused by instantiating the dataset with `use_frame_cache=True`.
+
+        Args:
+            resize (tuple[int, int] | None, optional): (height, width) to which frames are rescaled before being
+                stored. Note that video keys are then served at this resolution instead of the one listed in
+                the dataset features. Defaults to None.
+        """
+        video_paths = self._get_video_file_paths()
+        logging.info(f"Decoding {len(video_paths)} videos into the frame cache of {self.root}")
+        videos = ((fpath, decode_all_video_frames(self.root / fpath, resize)) for fpath in video_paths)
+        self.frame_cache = FrameCache.write(self.root, videos, resize)
+
     @classmethod
     def create(
         cls,
@@ -1014,8 +1441,14 @@ class LeRobotDataset(torch.utils.data.Dataset):
         image_writer_threads: int = 0,
         video_backend: str | None = None,
         batch_encoding_size: int = 1,
+        video_encoding_workers: int | None = None,
+        streaming_encoding: bool = False,
     ) -> "LeRobotDataset":
-        """Create a LeRobot Dataset from scratch in order to record data."""
+        """Create a LeRobot Dataset from scratch in order to record data.
+
+        With `streaming_encoding=True`, the camera frames of the video keys are encoded while they are
+        recorded instead of being written as png images (see `start_video_encoders`).
+        """
         obj = cls.__new__(cls)
         obj.meta = LeRobotDatasetMetadata.create(
             repo_id=repo_id,
@@ -1030,12 +1463,18 @@ class LeRobotDataset(torch.utils.data.Dataset):
         obj.revision = None
         obj.tolerance_s = tolerance_s
         obj.image_writer = None
+        obj.video_encoders = None
+        obj.episode_saver = None
         obj.batch_encoding_size = batch_encoding_size
+        obj.video_encoding_workers = video_encoding_workers
         obj.episodes_since_last_encoding = 0
 
         if image_writer_processes or image_writer_threads:
             obj.start_image_writer(image_writer_processes, image_writer_threads)
 
+        if streaming_encoding:
+            obj.start_video_encoders()
+
         # TODO(aliberts, rcadene, alexander-soare): Merge this with OnlineBuffer/DataBuffer
         obj.episode_buffer = obj.create_episode_buffer()
 
@@ -1046,6 +1485,9 @@ class LeRobotDataset(torch.utils.data.Dataset):
         obj.delta_indices = None
         obj.episode_data_index = None
         obj.video_backend = video_backend if video_backend is not None else get_safe_default_codec()
+        obj.video_decoder_cache = None
+        obj._column_store = None
+        obj.frame_cache = None
         return obj
 
 
@@ -1066,6 +1508,7 @@ class MultiLeRobotDataset(torch.utils.data.Dataset):
         tolerances_s: dict | None = None,
         download_videos: bool = True,
         video_backend: str | None = None,
+        video_decoder_cache_size: int = 0,
     ):
         super().__init__()
         self.repo_ids = repo_ids
@@ -1083,6 +1526,7 @@ class MultiLeRobotDataset(torch.utils.data.Dataset):
                 tolerance_s=self.tolerances_s[repo_id],
                 download_videos=download_videos,
                 video_backend=video_backend,
+                video_decoder_cache_size=video_decoder_cache_size,
             )
             for repo_id in repo_ids
         ]
@@ -59,3 +59,98 @@ class EpisodeAwareSampler:
 
     def __len__(self) -> int:
         return len(self.indices)
+
+
+class EpisodeWindowBatchSampler:
+    def __init__(
+        self,
+        episode_data_index: dict,
+        episodes_per_batch: int,
+        frames_per_episode: int,
+        episode_indices_to_use: list | None = None,
+        drop_n_first_frames: int = 0,
+        drop_n_last_frames: int = 0,
+        shuffle: bool = True,
+        drop_last: bool = False,
+    ):
+        """Batch sampler that builds each batch out of contiguous windows of frames from a few episodes.
+
+        Each episode is split into windows of `frames_per_episode` consecutive frames, and each batch is
+        filled with `episodes_per_batch` such windows. Since the frames of a window come from the same video
+        files, they can be decoded together (see `LeRobotDataset.__getitems__`), which amortizes the cost of
+        seeking to the previous key frame over all the frames of the window. This trades a bit of sample
+        independence within a batch for faster data loading.
+
+        When shuffling, window boundaries are randomly offset at every epoch and windows are visited in a
+        random order. The windows at the end of an episode may be shorter than `frames_per_episode`, in
+        which case the batch is completed with the next window, so that all batches (but possibly the last
+        one) contain exactly `episodes_per_batch * frames_per_episode` frames.
+
+        Args:
+            episode_data_index: Dictionary with keys 'from' and 'to' containing the start and end indices of each episode.
+            episodes_per_batch: Number of episode windows per batch.
+            frames_per_episode: Number of consecutive frames in each window.
+            episode_indices_to_use: List of episode indices to use. If None, all episodes are used.
+                                    Assumes that episodes are indexed from 0 to N-1.
+            drop_n_first_frames: Number of frames to drop from the start of each episode.
+            drop_n_last_frames: Number of frames to drop from the end of each episode.
+            shuffle: Whether to shuffle the windows (and their boundaries) at every epoch.
+            drop_last: Whether to drop the last batch if it is incomplete.
+        """
+        if episodes_per_batch < 1 or frames_per_episode < 1:
+            raise ValueError(
+                "`episodes_per_batch` and `frames_per_episode` must be positive integers, got "
+                f"{episodes_per_batch=} and {frames_per_episode=}."
+            )
+
+        episode_ranges = []
+        for episode_idx, (start_index, end_index) in enumerate(
+            zip(episode_data_index["from"], episode_data_index["to"], strict=True)
+        ):
+            if episode_indices_to_use is None or episode_idx in episode_indices_to_use:
+                start = start_index.item() + drop_n_first_frames
+                end = end_index.item() - drop_n_last_frames
+                if end > start:
+                    episode_ranges.append((start, end))
+
+        self.episode_ranges = episode_ranges
+        self.episodes_per_batch = episodes_per_batch
+        self.frames_per_episode = frames_per_episode
+        self.batch_size = episodes_per_batch * frames_per_episode
+        self.num_frames = sum(end - start for start, end in episode_ranges)
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+
+    def _make_windows(self) -> list[range]:
+        windows = []
+        for start, end in self.episode_ranges:
+            first_window_end = start
+            if self.shuffle:
+                # Randomly shift the window boundaries so that the same frames aren't always batched together
+                offset = torch.randint(self.frames_per_episode, (1,)).item()
+                if 0 < offset < end - start:
+                    first_window_end = start + offset
+                    windows.append(range(start, first_window_end))
+            for window_start in range(first_window_end, end, self.frames_per_episode):
+                windows.append(range(window_start, min(window_start + self.frames_per_episode, end)))
+
+        if self.shuffle:
+            windows = [windows[i] for i in torch.randperm(len(windows))]
+        return windows
+
+    def __iter__(self) -> Iterator[list[int]]:
+        batch = []
+        for window in self._make_windows():
+            for idx in window:
+                batch.append(idx)
+                if len(batch) == self.batch_size:
+                    yield batch
+                    batch = []
+
+        if len(batch) > 0 and not self.drop_last:
+            yield batch
+
+    def __len__(self) -> int:
+        if self.drop_last:
+            return self.num_frames // self.batch_size
+        return (self.num_frames + self.batch_size - 1) // self.batch_size
@@ -0,0 +1,323 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Encoding of camera frames into videos while they are being recorded.
+
+Each `StreamingVideoEncoder` owns a background process which encodes the frames of one camera as they arrive,
+so that saving an episode only requires to flush the encoder and close the video container, instead of
+writing every frame as a PNG image and encoding them all at the end of the episode.
+
+Frames are passed to the encoder process through a ring buffer of frame slots in shared memory: only the
+index of the slot holding a frame goes through the command queue, and a semaphore counting the free slots
+blocks `add_frame` whenever the encoder falls too far behind.
+"""
+
+import contextlib
+import logging
+import multiprocessing
+import queue
+import threading
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import av
+import numpy as np
+import torch
+
+from lerobot.datasets.compute_stats import auto_downsample_height_width, get_image_stats, sample_indices
+from lerobot.datasets.image_writer import image_array_to_uint8_hwc
+from lerobot.datasets.video_utils import get_partial_video_path, get_video_encoding_options
+
+# Maximum number of (downsampled) frames kept per episode to compute image stats.
+MAX_NUM_STATS_FRAMES = 500
+
+
+class _EpisodeStatsSampler:
+    """Keeps a downsampled copy of every `stride`-th frame of an episode, doubling the stride whenever more
+    than `MAX_NUM_STATS_FRAMES` are kept, so that the frames sampled by `compute_episode_stats` can be
+    approximated without knowing the episode length in advance nor keeping every frame.
+    """
+
+    def __init__(self):
+        self.frames = []
+        self.stride = 1
+        self.num_frames = 0
+
+    def add(self, frame: np.ndarray) -> None:
+        if self.num_frames % self.stride == 0:
+            self.frames.append(auto_downsample_height_width(frame.transpose(2, 0, 1)).copy())
+            if len(self.frames) > MAX_NUM_STATS_FRAMES:
+                self.frames = self.frames[::2]
+                self.stride *= 2
+        self.num_frames += 1
+
+    def get_stats(self) -> dict[str, np.ndarray]:
+        indices = np.round(np.array(sample_indices(self.num_frames)) / self.stride).astype(int)
+        indices = np.minimum(indices, len(self.frames) - 1)
+        return get_image_stats(np.stack([self.frames[idx] for idx in indices]))
+
+
+def encoder_process(
+    shm_name: str,
+    frames_shape: tuple[int, ...],
+    fps: int,
+    vcodec: str,
+    pix_fmt: str,
+    video_options: dict[str, str],
+    commands: multiprocessing.Queue,
+    results: multiprocessing.Queue,
+    free_slots: multiprocessing.Semaphore,
+):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    frames = np.ndarray(frames_shape, dtype=np.uint8, buffer=shm.buf)
+    logging.getLogger("libav").setLevel(av.logging.ERROR)
+
+    output, stream, part_path, stats_sampler, error = None, None, None, None, None
+    while True:
+        command = commands.get()
+        if command is None:
+            break
+
+        name, arg = command
+        if name == "frame":
+            try:
+                if error is None:
+                    stats_sampler.add(frames[arg])
+                    frame = av.VideoFrame.from_ndarray(frames[arg], format="rgb24")
+                    for packet in stream.encode(frame):
+                        output.mux(packet)
+            except Exception as e:
+                error = e
+            finally:
+                # `from_ndarray` copies the frame, so its slot can be reused right away
+                free_slots.release()
+
+        elif name == "start":
+            video_path = Path(arg)
+            part_path = get_partial_video_path(video_path)
+            stats_sampler, error = _EpisodeStatsSampler(), None
+            try:
+                part_path.parent.mkdir(parents=True, exist_ok=True)
+                output = av.open(str(part_path), "w", format="mp4")
+                stream = output.add_stream(vcodec, fps, options=video_options)
+                stream.pix_fmt = pix_fmt
+                stream.height, stream.width = frames_shape[1:3]
+            except Exception as e:
+                error = e
+
+        elif name == "finish":
+            try:
+                if error is None:
+                    # Flush the encoder
+                    for packet in stream.encode():
+                        output.mux(packet)
+                    output.close()
+                    part_path.rename(video_path)
+                    results.put((str(video_path), "finished", stats_sampler.get_stats()))
+            except Exception as e:
+                error = e
+            if error is not None:
+                if output is not None:
+                    with contextlib.suppress(Exception):
+                        output.close()
+                part_path.unlink(missing_ok=True)
+                results.put((str(video_path), "error", f"Encoding of {video_path} failed: {error!r}"))
+            output, stream, stats_sampler = None, None, None
+
+        elif name == "cancel":
+            if output is not None:
+                output.close()
+            if part_path is not None:
+                part_path.unlink(missing_ok=True)
+            output, stream, stats_sampler = None, None, None
+            results.put((str(video_path), "cancelled", None))
+
+    if output is not None:
+        output.close()
+        part_path.unlink(missing_ok=True)
+    del frames
+    shm.close()
+
+
+def compute_video_stats(video_path: Path | str) -> dict[str, np.ndarray]:
+    """Image stats of a video, sampled like the ones computed by `StreamingVideoEncoder` while encoding."""
+    stats_sampler = _EpisodeStatsSampler()
+    with av.open(str(video_path)) as container:
+        for frame in container.decode(video=0):
+            stats_sampler.add(frame.to_ndarray(format="rgb24"))
+    return stats_sampler.get_stats()
+
+
+class StreamingVideoEncoder:
+    """
+    Encodes the frames of a camera into one video per episode, in a background process, as they are recorded.
+
+    Usage:
+    ```python
+    encoder = StreamingVideoEncoder(fps=30, height=480, width=640)
+    encoder.start_episode("videos/chunk-000/observation.images.front/episode_000000.mp4")
+    for frame in frames:
+        encoder.add_frame(frame)
+    ep_stats = encoder.finish_episode()  # blocks until the video is written
+    encoder.stop()
+    ```
+
+    `finish_episode` can also be split into `end_episode`, which returns immediately so that the next episode
+    can be started, and `wait_episode`, which can be called from another thread.
+
+    The video is written under a temporary '.part' name and only renamed once the container is finalized,
+    so that an interrupted recording never leaves a truncated video behind.
+
+    Args:
+        fps (int): Frame rate of the videos.
+        height (int): Height of the frames.
+        width (int): Width of the frames.
+        num_slots (int, optional): Number of frames the shared memory ring buffer can hold. `add_frame` blocks
+            when the encoder is lagging this many frames behind. Defaults to 64.
+        vcodec, pix_fmt, g, crf, fast_decode: Encoding options, see `encode_video_frames`.
+    """
+
+    def __init__(
+        self,
+        fps: int,
+        height: int,
+        width: int,
+        num_slots: int = 64,
+        vcodec: str = "libsvtav1",
+        pix_fmt: str = "yuv420p",
+        g: int | None = 2,
+        crf: int | None = 30,
+        fast_decode: int = 0,
+    ):
+        if num_slots <= 0:
+            raise ValueError(f"num_slots must be a positive integer, got {num_slots}.")
+
+        pix_fmt, video_options = get_video_encoding_options(vcodec, pix_fmt, g, crf, fast_decode)
+        self.frames_shape = (num_slots, height, width, 3)
+        self.num_slots = num_slots
+        self.video_path = None
+        self._next_slot = 0
+        self._stopped = False
+        self._received = {}
+        self._results_lock = threading.Lock()
+
+        self._shm = shared_memory.SharedMemory(create=True, size=int(np.prod(self.frames_shape)))
+        self._frames = np.ndarray(self.frames_shape, dtype=np.uint8, buffer=self._shm.buf)
+        # The worker is spawned rather than forked, as the recording process runs camera and torch threads
+        ctx = multiprocessing.get_context("spawn")
+        self._free_slots = ctx.Semaphore(num_slots)
+        self._commands = ctx.Queue()
+        self._results = ctx.Queue()
+        self._process = ctx.Process(
+            target=encoder_process,
+            args=(
+                self._shm.name,
+                self.frames_shape,
+                fps,
+                vcodec,
+                pix_fmt,
+                video_options,
+                self._commands,
+                self._results,
+                self._free_slots,
+            ),
+        )
+        self._process.daemon = True
+        self._process.start()
+
+    def start_episode(self, video_path: Path | str) -> None:
+        if self.video_path is not None:
+            raise RuntimeError(f"The encoding of {self.video_path} must be finished or cancelled first.")
+        self.video_path = Path(video_path)
+        self._commands.put(("start", str(self.video_path)))
+
+    def add_frame(self, image: torch.Tensor | np.ndarray) -> None:
+        if self.video_path is None:
+            raise RuntimeError("`start_episode` must be called before adding frames.")
+        if isinstance(image, torch.Tensor):
+            image = image.cpu().numpy()
+        image = image_array_to_uint8_hwc(image)
+        if image.shape != self.frames_shape[1:]:
+            raise ValueError(f"Expected a frame of shape {self.frames_shape[1:]}, got {image.shape}.")
+
+        # Wait for the encoder to release a slot of the ring buffer
+        while not self._free_slots.acquire(timeout=1.0):
+            self._check_alive()
+
+        self._frames[self._next_slot] = image
+        self._commands.put(("frame", self._next_slot))
+        self._next_slot = (self._next_slot + 1) % self.num_slots
+
+    def finish_episode(self) -> dict[str, np.ndarray]:
+        """Finalizes the video of the current episode and returns its image stats (see `get_image_stats`)."""
+        return self.wait_episode(self.end_episode())
+
+    def end_episode(self) -> Path:
+        """Requests the video of the current episode to be finalized, without waiting for it. Returns the path
+        of the video, to be passed to `wait_episode`."""
+        if self.video_path is None:
+            raise RuntimeError("No episode is being encoded.")
+        video_path, self.video_path = self.video_path, None
+        self._commands.put(("finish", None))
+        return video_path
+
+    def wait_episode(self, video_path: Path | str) -> dict[str, np.ndarray]:
+        """Waits for the video of an ended episode to be finalized and returns its image stats."""
+        status, result = self._wait_result(video_path)
+        if status == "error":
+            raise RuntimeError(result)
+        return result
+
+    def cancel_episode(self) -> None:
+        """Stops the encoding of the current episode and deletes its partial video."""
+        if self.video_path is None:
+            return
+        video_path, self.video_path = self.video_path, None
+        self._commands.put(("cancel", None))
+        self._wait_result(video_path)
+
+    def _wait_result(self, video_path: Path | str) -> tuple[str, dict | str | None]:
+        # Results come in the order of the commands, but can be waited for from different threads
+        video_path = str(video_path)
+        while True:
+            with self._results_lock:
+                if video_path in self._received:
+                    return self._received.pop(video_path)
+                try:
+                    path, status, result = self._results.get(timeout=0.1)
+                    self._received[path] = (status, result)
+                except queue.Empty:
+                    self._check_alive()
+
+    def _check_alive(self) -> None:
+        if not self._process.is_alive():
+            raise RuntimeError(f"The encoder process died (exit code {self._process.exitcode}).")
+
+    def stop(self) -> None:
+        if self._stopped:
+            return
+
+        if self._process.is_alive():
+            # Any episode still being encoded is discarded
+            self._commands.put(None)
+            self._process.join()
+        self.video_path = None
+
+        del self._frames
+        self._shm.close()
+        self._shm.unlink()
+        self._commands.close()
+        self._results.close()
+        self._stopped = True
@@ -16,13 +16,16 @@
 import glob
 import importlib
 import logging
+import os
 import shutil
 import warnings
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, ClassVar
 
 import av
+import numpy as np
 import pyarrow as pa
 import torch
 import torchvision
@@ -40,11 +43,109 @@ def get_safe_default_codec():
         return "pyav"
 
 
+def _open_video_decoder(video_path: Path | str, backend: str, device: str = "cpu"):
+    """Opens a decoder for `video_path` with the given backend ("torchcodec", "pyav" or "video_reader")."""
+    if backend == "torchcodec":
+        if importlib.util.find_spec("torchcodec"):
+            from torchcodec.decoders import VideoDecoder
+        else:
+            raise ImportError("torchcodec is required but not available.")
+        return VideoDecoder(str(video_path), device=device, seek_mode="approximate")
+    elif backend in ["pyav", "video_reader"]:
+        torchvision.set_video_backend(backend)
+        # TODO(rcadene): also load audio stream at the same time
+        return torchvision.io.VideoReader(str(video_path), "video")
+    else:
+        raise ValueError(f"Unsupported video backend: {backend}")
+
+
+def _close_video_decoder(decoder, backend: str) -> None:
+    if backend == "pyav":
+        decoder.container.close()
+
+
+class VideoDecoderCache:
+    """LRU cache of open video decoders, keyed by video path, backend and device.
+
+    Opening a video file and parsing its container index is a large share of the time needed to decode a
+    handful of frames. Keeping the most recently used decoders open lets successive queries on the same file
+    skip that work. Once `max_size` decoders are open, the least recently used one is closed.
+
+    The cache is process-local: it is emptied when pickled and when accessed from another process than the
+    one that filled it (e.g. a forked DataLoader worker), so that each worker opens its own decoders.
+    """
+
+    def __init__(self, max_size: int = 16):
+        if max_size < 1:
+            raise ValueError(f"`max_size` must be a positive integer, got {max_size}.")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._decoders = OrderedDict()
+        self._pid = os.getpid()
+
+    def get(self, video_path: Path | str, backend: str, device: str = "cpu"):
+        """Returns an open decoder for `video_path`, creating it (and evicting the LRU entry) if needed."""
+        if self._pid != os.getpid():
+            # Decoders inherited from a parent process must not be shared, only dropped.
+            self._decoders = OrderedDict()
+            self._pid = os.getpid()
+
+        key = (str(video_path), backend, device)
+        decoder = self._decoders.get(key)
+        if decoder is not None:
+            self._decoders.move_to_end(key)
+            self.hits += 1
+            return decoder
+
+        self.misses += 1
+        decoder = _open_video_decoder(video_path, backend, device)
+        self._decoders[key] = decoder
+        if len(self._decoders) > self.max_size:
+            (_, evicted_backend, _), evicted = self._decoders.popitem(last=False)
+            _close_video_decoder(evicted, evicted_backend)
+            self.evictions += 1
+        return decoder
+
+    def clear(self) -> None:
+        """Closes all the open decoders."""
+        if self._pid == os.getpid():
+            for (_, backend, _), decoder in self._decoders.items():
+                _close_video_decoder(decoder, backend)
+        self._decoders = OrderedDict()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._decoders),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def __len__(self) -> int:
+        return len(self._decoders)
+
+    def __contains__(self, video_path: Path | str) -> bool:
+        return any(path == str(video_path) for path, _, _ in self._decoders)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_decoders"] = OrderedDict()
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._pid = os.getpid()
+
+
 def decode_video_frames(
     video_path: Path | str,
     timestamps: list[float],
     tolerance_s: float,
     backend: str | None = None,
+    decoder_cache: VideoDecoderCache | None = None,
 ) -> torch.Tensor:
     """
     Decodes video frames using the specified backend.
@@ -54,6 +155,8 @@ def decode_video_frames(
         timestamps (list[float]): List of timestamps to extract frames.
         tolerance_s (float): Allowed deviation in seconds for frame retrieval.
         backend (str, optional): Backend to use for decoding. Defaults to "torchcodec" when available in the platform; otherwise, defaults to "pyav"..
+        decoder_cache (VideoDecoderCache, optional): Cache of open decoders to reuse across calls. When None,
+            a new decoder is opened (and closed) for every call.
 
     Returns:
         torch.Tensor: Decoded frames.
@@ -63,9 +166,13 @@ def decode_video_frames(
     if backend is None:
         backend = get_safe_default_codec()
     if backend == "torchcodec":
-        return decode_video_frames_torchcodec(video_path, timestamps, tolerance_s)
+        return decode_video_frames_torchcodec(
+            video_path, timestamps, tolerance_s, decoder_cache=decoder_cache
+        )
     elif backend in ["pyav", "video_reader"]:
-        return decode_video_frames_torchvision(video_path, timestamps, tolerance_s, backend)
+        return decode_video_frames_torchvision(
+            video_path, timestamps, tolerance_s, backend, decoder_cache=decoder_cache
+        )
     else:
         raise ValueError(f"Unsupported video backend: {backend}")
 
@@ -76,6 +183,7 @@ def decode_video_frames_torchvision(
     tolerance_s: float,
     backend: str = "pyav",
     log_loaded_timestamps: bool = False,
+    decoder_cache: VideoDecoderCache | None = None,
 ) -> torch.Tensor:
     """Loads frames associated to the requested timestamps of a video
 
@@ -95,6 +203,8 @@ def decode_video_frames_torchvision(
     that key frame. As a consequence, to access a requested frame, we need to load the preceding key frame,
     and all subsequent frames until reaching the requested frame. The number of key frames in a video
     can be adjusted during encoding to take into account decoding time and video size in bytes.
+
+    When a `decoder_cache` is given, the video stream reader is taken from (and left open in) the cache.
     """
     video_path = str(video_path)
 
@@ -105,8 +215,10 @@ def decode_video_frames_torchvision(
         keyframes_only = True  # pyav doesn't support accurate seek
 
     # set a video stream reader
-    # TODO(rcadene): also load audio stream at the same time
-    reader = torchvision.io.VideoReader(video_path, "video")
+    if decoder_cache is not None:
+        reader = decoder_cache.get(video_path, backend)
+    else:
+        reader = _open_video_decoder(video_path, backend)
 
     # set the first and last requested timestamps
     # Note: previous timestamps are usually loaded, since we need to access the previous key frame
@@ -130,8 +242,8 @@ def decode_video_frames_torchvision(
         if current_ts >= last_ts:
             break
 
-    if backend == "pyav":
-        reader.container.close()
+    if decoder_cache is None:
+        _close_video_decoder(reader, backend)
 
     reader = None
 
@@ -174,6 +286,7 @@ def decode_video_frames_torchcodec(
     tolerance_s: float,
     device: str = "cpu",
     log_loaded_timestamps: bool = False,
+    decoder_cache: VideoDecoderCache | None = None,
 ) -> torch.Tensor:
     """Loads frames associated with the requested timestamps of a video using torchcodec.
 
@@ -184,15 +297,14 @@ def decode_video_frames_torchcodec(
     that key frame. As a consequence, to access a requested frame, we need to load the preceding key frame,
     and all subsequent frames until reaching the requested frame. The number of key frames in a video
     can be adjusted during encoding to take into account decoding time and video size in bytes.
-    """
-
-    if importlib.util.find_spec("torchcodec"):
-        from torchcodec.decoders import VideoDecoder
-    else:
-        raise ImportError("torchcodec is required but not available.")
 
+    When a `decoder_cache` is given, the decoder is taken from (and left open in) the cache.
+    """
     # initialize video decoder
-    decoder = VideoDecoder(video_path, device=device, seek_mode="approximate")
+    if decoder_cache is not None:
+        decoder = decoder_cache.get(video_path, "torchcodec", device)
+    else:
+        decoder = _open_video_decoder(video_path, "torchcodec", device)
     loaded_frames = []
     loaded_ts = []
     # get metadata for frame information
@@ -243,6 +355,90 @@ def decode_video_frames_torchcodec(
     return closest_frames
 
 
+def decode_all_video_frames(
+    video_path: Path | str, resize: tuple[int, int] | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """Decodes every frame of a video with PyAV.
+
+    Args:
+        video_path (Path): Path to the video file.
+        resize (tuple[int, int], optional): (height, width) to which the frames are rescaled. Defaults to
+            None, in which case frames keep the resolution of the video.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The uint8 frames in channel first format (T, C, H, W), and their
+            presentation timestamps in seconds (T,).
+    """
+    frames = []
+    timestamps = []
+    with av.open(str(video_path), "r") as container:
+        stream = container.streams.video[0]
+        for frame in container.decode(stream):
+            if resize is not None:
+                frame = frame.reformat(width=resize[1], height=resize[0])
+            frames.append(frame.to_ndarray(format="rgb24"))
+            timestamps.append(frame.time)
+
+    if len(frames) == 0:
+        raise OSError(f"No frame could be decoded from {video_path}.")
+
+    return np.stack(frames).transpose(0, 3, 1, 2), np.array(timestamps)
+
+
+def get_video_encoding_options(
+    vcodec: str = "libsvtav1",
+    pix_fmt: str = "yuv420p",
+    g: int | None = 2,
+    crf: int | None = 30,
+    fast_decode: int = 0,
+    num_threads: int | None = None,
+) -> tuple[str, dict[str, str]]:
+    """Checks the codec and returns the pixel format and the codec options to open an output stream with.
+    `num_threads` limits the number of threads used by the encoder (by default, the encoder decides).
+    """
+    # Check encoder availability
+    if vcodec not in ["h264", "hevc", "libsvtav1"]:
+        raise ValueError(f"Unsupported video codec: {vcodec}. Supported codecs are: h264, hevc, libsvtav1.")
+
+    # Encoders/pixel formats incompatibility check
+    if (vcodec == "libsvtav1" or vcodec == "hevc") and pix_fmt == "yuv444p":
+        logging.warning(
+            f"Incompatible pixel format 'yuv444p' for codec {vcodec}, auto-selecting format 'yuv420p'"
+        )
+        pix_fmt = "yuv420p"
+
+    # Define video codec options
+    video_options = {}
+
+    if g is not None:
+        video_options["g"] = str(g)
+
+    if crf is not None:
+        video_options["crf"] = str(crf)
+
+    if fast_decode:
+        key = "svtav1-params" if vcodec == "libsvtav1" else "tune"
+        value = f"fast-decode={fast_decode}" if vcodec == "libsvtav1" else "fastdecode"
+        video_options[key] = value
+
+    if num_threads is not None:
+        if vcodec == "libsvtav1":
+            # SVT-AV1 ignores the generic "threads" option, its thread pool is sized by its level of parallelism
+            svtav1_params = [video_options["svtav1-params"]] if "svtav1-params" in video_options else []
+            video_options["svtav1-params"] = ":".join([*svtav1_params, f"lp={num_threads}"])
+        else:
+            video_options["threads"] = str(num_threads)
+
+    return pix_fmt, video_options
+
+
+def get_partial_video_path(video_path: Path | str) -> Path:
+    """Temporary path under which a video is written, before being renamed to `video_path` once finalized, so
+    that an interrupted encoding never leaves a truncated video behind."""
+    video_path = Path(video_path)
+    return video_path.with_name(video_path.name + ".part")
+
+
 def encode_video_frames(
     imgs_dir: Path | str,
     video_path: Path | str,
@@ -254,24 +450,16 @@ def encode_video_frames(
     fast_decode: int = 0,
     log_level: int | None = av.logging.ERROR,
     overwrite: bool = False,
+    num_threads: int | None = None,
 ) -> None:
     """More info on ffmpeg arguments tuning on `benchmark/video/README.md`"""
-    # Check encoder availability
-    if vcodec not in ["h264", "hevc", "libsvtav1"]:
-        raise ValueError(f"Unsupported video codec: {vcodec}. Supported codecs are: h264, hevc, libsvtav1.")
+    pix_fmt, video_options = get_video_encoding_options(vcodec, pix_fmt, g, crf, fast_decode, num_threads)
 
     video_path = Path(video_path)
     imgs_dir = Path(imgs_dir)
 
     video_path.parent.mkdir(parents=True, exist_ok=overwrite)
 
-    # Encoders/pixel formats incompatibility check
-    if (vcodec == "libsvtav1" or vcodec == "hevc") and pix_fmt == "yuv444p":
-        logging.warning(
-            f"Incompatible pixel format 'yuv444p' for codec {vcodec}, auto-selecting format 'yuv420p'"
-        )
-        pix_fmt = "yuv420p"
-
     # Get input frames
     template = "frame_" + ("[0-9]" * 6) + ".png"
     input_list = sorted(
@@ -284,51 +472,44 @@ def encode_video_frames(
     dummy_image = Image.open(input_list[0])
     width, height = dummy_image.size
 
-    # Define video codec options
-    video_options = {}
-
-    if g is not None:
-        video_options["g"] = str(g)
-
-    if crf is not None:
-        video_options["crf"] = str(crf)
-
-    if fast_decode:
-        key = "svtav1-params" if vcodec == "libsvtav1" else "tune"
-        value = f"fast-decode={fast_decode}" if vcodec == "libsvtav1" else "fastdecode"
-        video_options[key] = value
-
     # Set logging level
     if log_level is not None:
         # "While less efficient, it is generally preferable to modify logging with Python’s logging"
         logging.getLogger("libav").setLevel(log_level)
 
-    # Create and open output file (overwrite by default)
-    with av.open(str(video_path), "w") as output:
-        output_stream = output.add_stream(vcodec, fps, options=video_options)
-        output_stream.pix_fmt = pix_fmt
-        output_stream.width = width
-        output_stream.height = height
-
-        # Loop through input frames and encode them
-        for input_data in input_list:
-            input_image = Image.open(input_data).convert("RGB")
-            input_frame = av.VideoFrame.from_image(input_image)
-            packet = output_stream.encode(input_frame)
+    # Create and open output file (overwrite by default). The video is written under a temporary name and
+    # renamed once finalized.
+    part_path = get_partial_video_path(video_path)
+    try:
+        with av.open(str(part_path), "w", format=video_path.suffix.lstrip(".")) as output:
+            output_stream = output.add_stream(vcodec, fps, options=video_options)
+            output_stream.pix_fmt = pix_fmt
+            output_stream.width = width
+            output_stream.height = height
+
+            # Loop through input frames and encode them
+            for input_data in input_list:
+                input_image = Image.open(input_data).convert("RGB")
+                input_frame = av.VideoFrame.from_image(input_image)
+                packet = output_stream.encode(input_frame)
+                if packet:
+                    output.mux(packet)
+
+            # Flush the encoder
+            packet = output_stream.encode()
             if packet:
                 output.mux(packet)
-
-        # Flush the encoder
-        packet = output_stream.encode()
-        if packet:
-            output.mux(packet)
+    except Exception:
+        part_path.unlink(missing_ok=True)
+        raise
 
     # Reset logging level
     if log_level is not None:
         av.logging.restore_default_callback()
 
-    if not video_path.exists():
-        raise OSError(f"Video encoding did not work. File not found: {video_path}.")
+    if not part_path.exists():
+        raise OSError(f"Video encoding did not work. File not found: {part_path}.")
+    part_path.replace(video_path)
 
 
 @dataclass
@@ -459,7 +640,9 @@ class VideoEncodingManager:
     Context manager that ensures proper video encoding and data cleanup even if exceptions occur.
 
     This manager handles:
+    - Waiting for the episodes being saved in the background
     - Batch encoding for any remaining episodes when recording interrupted
+    - Stopping the streaming video encoders, discarding the video of an interrupted episode
     - Cleaning up temporary image files from interrupted episodes
     - Removing empty image directories
 
@@ -474,6 +657,14 @@ class VideoEncodingManager:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        # Episodes which fail to be saved in the background stay in the journal, to be saved on resume
+        saving_error = None
+        try:
+            self.dataset.stop_async_saving()
+        except Exception as e:
+            logging.exception("Saving episodes in the background failed")
+            saving_error = e
+
         # Handle any remaining episodes that haven't been batch encoded
         if self.dataset.episodes_since_last_encoding > 0:
             if exc_type is not None:
@@ -489,6 +680,8 @@ class VideoEncodingManager:
             )
             self.dataset.batch_encode_videos(start_ep, end_ep)
 
+        self.dataset.stop_video_encoders()
+
         # Clean up episode images if recording was interrupted
         if exc_type is not None:
             interrupted_episode_index = self.dataset.num_episodes
@@ -514,4 +707,6 @@ class VideoEncodingManager:
         else:
             logging.debug(f"Images directory is not empty, containing {len(png_files)} PNG files")
 
+        if saving_error is not None and exc_type is None:
+            raise saving_error
         return False  # Don't suppress the original exception
@@ -22,7 +22,7 @@ import logging
 from copy import deepcopy
 from enum import Enum
 
-from lerobot.utils.encoding_utils import decode_twos_complement, encode_twos_complement
+import numpy as np
 
 from ..motors_bus import Motor, MotorCalibration, MotorsBus, NameOrID, Value, get_address
 from .tables import (
@@ -212,24 +212,37 @@ class DynamixelMotorsBus(MotorsBus):
             self.write("Torque_Enable", motor, TorqueMode.ENABLED.value, num_retry=num_retry)
 
     def _encode_sign(self, data_name: str, ids_values: dict[int, int]) -> dict[int, int]:
-        for id_ in ids_values:
-            model = self._id_to_model(id_)
-            encoding_table = self.model_encoding_table.get(model)
-            if encoding_table and data_name in encoding_table:
-                n_bytes = encoding_table[data_name]
-                ids_values[id_] = encode_twos_complement(ids_values[id_], n_bytes)
-
-        return ids_values
+        ids = np.fromiter(ids_values, dtype=int, count=len(ids_values))
+        n_bytes = self._sign_encoding(data_name)[ids]
+        if (n_bytes < 0).all():
+            return ids_values
+
+        values = np.fromiter(ids_values.values(), dtype=np.int64, count=len(ids_values))
+        encoded = n_bytes >= 0
+        bit_widths = np.maximum(n_bytes, 1) * 8
+        min_values, max_values = -(1 << (bit_widths - 1)), (1 << (bit_widths - 1)) - 1
+        if (out_of_range := encoded & ((values < min_values) | (values > max_values))).any():
+            idx = np.flatnonzero(out_of_range)[0]
+            raise ValueError(
+                f"Value {values[idx]} out of range for {n_bytes[idx]}-byte two's complement: "
+                f"[{min_values[idx]}, {max_values[idx]}]"
+            )
+        # See `encode_twos_complement`
+        values = np.where(encoded & (values < 0), (1 << bit_widths) + values, values)
+        return dict(zip(ids_values, values.tolist(), strict=True))
 
     def _decode_sign(self, data_name: str, ids_values: dict[int, int]) -> dict[int, int]:
-        for id_ in ids_values:
-            model = self._id_to_model(id_)
-            encoding_table = self.model_encoding_table.get(model)
-            if encoding_table and data_name in encoding_table:
-                n_bytes = encoding_table[data_name]
-                ids_values[id_] = decode_twos_complement(ids_values[id_], n_bytes)
-
-        return ids_values
+        ids = np.fromiter(ids_values, dtype=int, count=len(ids_values))
+        n_bytes = self._sign_encoding(data_name)[ids]
+        if (n_bytes < 0).all():
+            return ids_values
+
+        values = np.fromiter(ids_values.values(), dtype=np.int64, count=len(ids_values))
+        # See `decode_twos_complement`
+        bit_widths = np.maximum(n_bytes, 1) * 8
+        negative = (n_bytes >= 0) & ((values & (1 << (bit_widths - 1))) != 0)
+        values = np.where(negative, values - (1 << bit_widths), values)
+        return dict(zip(ids_values, values.tolist(), strict=True))
 
     def _get_half_turn_homings(self, positions: dict[NameOrID, Value]) -> dict[NameOrID, Value]:
         """
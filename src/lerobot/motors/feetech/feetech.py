@@ -17,7 +17,7 @@ from copy import deepcopy
 from enum import Enum
 from pprint import pformat
 
-from lerobot.utils.encoding_utils import decode_sign_magnitude, encode_sign_magnitude
+import numpy as np
 
 from ..motors_bus import Motor, MotorCalibration, MotorsBus, NameOrID, Value, get_address
 from .tables import (
@@ -310,24 +310,39 @@ class FeetechMotorsBus(MotorsBus):
             self.write("Lock", motor, 1, num_retry=num_retry)
 
     def _encode_sign(self, data_name: str, ids_values: dict[int, int]) -> dict[int, int]:
-        for id_ in ids_values:
-            model = self._id_to_model(id_)
-            encoding_table = self.model_encoding_table.get(model)
-            if encoding_table and data_name in encoding_table:
-                sign_bit = encoding_table[data_name]
-                ids_values[id_] = encode_sign_magnitude(ids_values[id_], sign_bit)
-
-        return ids_values
+        ids = np.fromiter(ids_values, dtype=int, count=len(ids_values))
+        sign_bits = self._sign_encoding(data_name)[ids]
+        if (sign_bits < 0).all():
+            return ids_values
+
+        values = np.fromiter(ids_values.values(), dtype=np.int64, count=len(ids_values))
+        encoded = sign_bits >= 0
+        max_magnitudes = (1 << np.maximum(sign_bits, 0)) - 1
+        magnitudes = np.abs(values)
+        if (too_large := encoded & (magnitudes > max_magnitudes)).any():
+            idx = np.flatnonzero(too_large)[0]
+            raise ValueError(
+                f"Magnitude {magnitudes[idx]} exceeds {max_magnitudes[idx]} (max for sign_bit_index={sign_bits[idx]})"
+            )
+        # See `encode_sign_magnitude`
+        values = np.where(
+            encoded, ((values < 0).astype(np.int64) << np.maximum(sign_bits, 0)) | magnitudes, values
+        )
+        return dict(zip(ids_values, values.tolist(), strict=True))
 
     def _decode_sign(self, data_name: str, ids_values: dict[int, int]) -> dict[int, int]:
-        for id_ in ids_values:
-            model = self._id_to_model(id_)
-            encoding_table = self.model_encoding_table.get(model)
-            if encoding_table and data_name in encoding_table:
-                sign_bit = encoding_table[data_name]
-                ids_values[id_] = decode_sign_magnitude(ids_values[id_], sign_bit)
-
-        return ids_values
+        ids = np.fromiter(ids_values, dtype=int, count=len(ids_values))
+        sign_bits = self._sign_encoding(data_name)[ids]
+        if (sign_bits < 0).all():
+            return ids_values
+
+        values = np.fromiter(ids_values.values(), dtype=np.int64, count=len(ids_values))
+        # See `decode_sign_magnitude`
+        shifts = np.maximum(sign_bits, 0)
+        magnitudes = values & ((1 << shifts) - 1)
+        decoded = np.where((values >> shifts) & 1, -magnitudes, magnitudes)
+        values = np.where(sign_bits >= 0, decoded, values)
+        return dict(zip(ids_values, values.tolist(), strict=True))
 
     def _split_into_byte_chunks(self, value: int, length: int) -> list[int]:
         return _split_into_byte_chunks(value, length)
@@ -21,6 +21,8 @@
 
 import abc
 import logging
+import time
+from collections import defaultdict
 from contextlib import contextmanager
 from dataclasses import dataclass
 from enum import Enum
@@ -28,6 +30,7 @@ from functools import cached_property
 from pprint import pformat
 from typing import Protocol, TypeAlias
 
+import numpy as np
 import serial
 from deepdiff import DeepDiff
 from tqdm import tqdm
@@ -40,6 +43,9 @@ Value: TypeAlias = int | float
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of group sync readers (resp. writers) kept by a bus, one per (ids, address range) accessed
+MAX_CACHED_SYNC_GROUPS = 8
+
 
 def get_ctrl_table(model_ctrl_table: dict[str, dict], model: str) -> dict[str, tuple[int, int]]:
     ctrl_table = model_ctrl_table.get(model)
@@ -99,6 +105,43 @@ class Motor:
     norm_mode: MotorNormMode
 
 
+# Codes of the normalization modes in `CalibrationTable.norm_modes`
+NORM_MODE_CODES = {mode: code for code, mode in enumerate(MotorNormMode)}
+
+
+@dataclass
+class TransactionStats:
+    """Latencies of the bus transactions of one kind (e.g. "sync_read"), in seconds. Each try counts as one
+    transaction."""
+
+    count: int = 0
+    total: float = 0.0
+    last: float = 0.0
+    max: float = 0.0
+
+    def add(self, latency: float) -> None:
+        self.count += 1
+        self.total += latency
+        self.last = latency
+        self.max = max(self.max, latency)
+
+    @property
+    def avg(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+@dataclass
+class CalibrationTable:
+    """Calibration of the motors of a bus compiled into arrays indexed by motor id, to normalize the values of
+    several motors with array operations. Motors without calibration have a `norm_modes` of -1."""
+
+    range_min: np.ndarray
+    range_max: np.ndarray
+    drive_modes: np.ndarray
+    norm_modes: np.ndarray
+    max_res: np.ndarray
+
+
 class JointOutOfRangeError(Exception):
     def __init__(self, message="Joint is out of range"):
         self.message = message
@@ -268,12 +311,18 @@ class MotorsBus(abc.ABC):
     ):
         self.port = port
         self.motors = motors
+        self._calibration_table: CalibrationTable | None = None
+        self._sign_encodings: dict[str, np.ndarray] = {}
         self.calibration = calibration if calibration else {}
 
         self.port_handler: PortHandler
         self.packet_handler: PacketHandler
         self.sync_reader: GroupSyncRead
         self.sync_writer: GroupSyncWrite
+        self._sync_readers: dict[tuple[tuple[int, ...], int, int], GroupSyncRead] = {}
+        self._sync_writers: dict[tuple[tuple[int, ...], int, int], GroupSyncWrite] = {}
+        # Latencies of the transactions with the motors, per kind of transaction
+        self.transaction_stats: defaultdict[str, TransactionStats] = defaultdict(TransactionStats)
         self._comm_success: int
         self._no_error: int
 
@@ -294,6 +343,52 @@ class MotorsBus(abc.ABC):
             ")',\n"
         )
 
+    @property
+    def calibration(self) -> dict[str, MotorCalibration]:
+        return self._calibration
+
+    @calibration.setter
+    def calibration(self, calibration: dict[str, MotorCalibration]) -> None:
+        # The calibration table is compiled again on its next use
+        self._calibration = calibration
+        self._calibration_table = None
+
+    @property
+    def calibration_table(self) -> CalibrationTable:
+        if self._calibration_table is None:
+            self._calibration_table = self._compile_calibration()
+        return self._calibration_table
+
+    def _compile_calibration(self) -> CalibrationTable:
+        size = max(self.ids, default=-1) + 1
+        table = CalibrationTable(
+            range_min=np.zeros(size),
+            range_max=np.zeros(size),
+            drive_modes=np.zeros(size, dtype=bool),
+            norm_modes=np.full(size, -1),
+            max_res=np.zeros(size),
+        )
+        for motor, calibration in self.calibration.items():
+            id_ = self.motors[motor].id
+            table.range_min[id_] = calibration.range_min
+            table.range_max[id_] = calibration.range_max
+            table.drive_modes[id_] = self.apply_drive_mode and calibration.drive_mode
+            table.norm_modes[id_] = NORM_MODE_CODES[self.motors[motor].norm_mode]
+            table.max_res[id_] = self.model_resolution_table[self.motors[motor].model] - 1
+        return table
+
+    def _sign_encoding(self, data_name: str) -> np.ndarray:
+        """Value of `model_encoding_table` for `data_name` (sign bit or number of bytes) of each motor id, or -1
+        for the motors whose model doesn't encode the sign of this data."""
+        if data_name not in self._sign_encodings:
+            encodings = np.full(max(self.ids, default=-1) + 1, -1)
+            for id_, model in self._id_to_model_dict.items():
+                encoding_table = self.model_encoding_table.get(model)
+                if encoding_table and data_name in encoding_table:
+                    encodings[id_] = encoding_table[data_name]
+            self._sign_encodings[data_name] = encodings
+        return self._sign_encodings[data_name]
+
     @cached_property
     def _has_different_ctrl_tables(self) -> bool:
         if len(self.models) < 2:
@@ -435,6 +530,8 @@ class MotorsBus(abc.ABC):
 
         self._connect(handshake)
         self.set_timeout()
+        if self.calibration:
+            self._calibration_table = self._compile_calibration()
         logger.debug(f"{self.__class__.__name__} connected.")
 
     def _connect(self, handshake: bool = True) -> None:
@@ -773,64 +870,61 @@ class MotorsBus(abc.ABC):
 
         return mins, maxes
 
-    def _normalize(self, ids_values: dict[int, int]) -> dict[int, float]:
+    def _get_calibration_rows(self, ids: np.ndarray) -> tuple[np.ndarray, ...]:
         if not self.calibration:
             raise RuntimeError(f"{self} has no calibration registered.")
 
-        normalized_values = {}
-        for id_, val in ids_values.items():
-            motor = self._id_to_name(id_)
-            min_ = self.calibration[motor].range_min
-            max_ = self.calibration[motor].range_max
-            drive_mode = self.apply_drive_mode and self.calibration[motor].drive_mode
-            if max_ == min_:
-                raise ValueError(f"Invalid calibration for motor '{motor}': min and max are equal.")
-
-            bounded_val = min(max_, max(min_, val))
-            if self.motors[motor].norm_mode is MotorNormMode.RANGE_M100_100:
-                norm = (((bounded_val - min_) / (max_ - min_)) * 200) - 100
-                normalized_values[id_] = -norm if drive_mode else norm
-            elif self.motors[motor].norm_mode is MotorNormMode.RANGE_0_100:
-                norm = ((bounded_val - min_) / (max_ - min_)) * 100
-                normalized_values[id_] = 100 - norm if drive_mode else norm
-            elif self.motors[motor].norm_mode is MotorNormMode.DEGREES:
-                mid = (min_ + max_) / 2
-                max_res = self.model_resolution_table[self._id_to_model(id_)] - 1
-                normalized_values[id_] = (val - mid) * 360 / max_res
-            else:
-                raise NotImplementedError
+        table = self.calibration_table
+        norm_modes = table.norm_modes[ids]
+        if (norm_modes < 0).any():
+            missing = [self._id_to_name(id_) for id_ in ids[norm_modes < 0]]
+            raise KeyError(f"No calibration registered for {missing}.")
+        min_, max_ = table.range_min[ids], table.range_max[ids]
+        if (max_ == min_).any():
+            motor = self._id_to_name(int(ids[max_ == min_][0]))
+            raise ValueError(f"Invalid calibration for motor '{motor}': min and max are equal.")
+        return min_, max_, table.drive_modes[ids], norm_modes, table.max_res[ids]
 
-        return normalized_values
+    def _normalize(self, ids_values: dict[int, int]) -> dict[int, float]:
+        ids = np.fromiter(ids_values, dtype=int, count=len(ids_values))
+        values = np.fromiter(ids_values.values(), dtype=float, count=len(ids_values))
+        min_, max_, drive_modes, norm_modes, max_res = self._get_calibration_rows(ids)
+
+        ratios = (np.clip(values, min_, max_) - min_) / (max_ - min_)
+        range_m100_100 = ratios * 200 - 100
+        range_0_100 = ratios * 100
+        normalized_values = np.select(
+            [
+                norm_modes == NORM_MODE_CODES[MotorNormMode.RANGE_M100_100],
+                norm_modes == NORM_MODE_CODES[MotorNormMode.RANGE_0_100],
+            ],
+            [
+                np.where(drive_modes, -range_m100_100, range_m100_100),
+                np.where(drive_modes, 100 - range_0_100, range_0_100),
+            ],
+            default=(values - (min_ + max_) / 2) * 360 / max_res,
+        )
+        return dict(zip(ids_values, normalized_values.tolist(), strict=True))
 
     def _unnormalize(self, ids_values: dict[int, float]) -> dict[int, int]:
-        if not self.calibration:
-            raise RuntimeError(f"{self} has no calibration registered.")
-
-        unnormalized_values = {}
-        for id_, val in ids_values.items():
-            motor = self._id_to_name(id_)
-            min_ = self.calibration[motor].range_min
-            max_ = self.calibration[motor].range_max
-            drive_mode = self.apply_drive_mode and self.calibration[motor].drive_mode
-            if max_ == min_:
-                raise ValueError(f"Invalid calibration for motor '{motor}': min and max are equal.")
-
-            if self.motors[motor].norm_mode is MotorNormMode.RANGE_M100_100:
-                val = -val if drive_mode else val
-                bounded_val = min(100.0, max(-100.0, val))
-                unnormalized_values[id_] = int(((bounded_val + 100) / 200) * (max_ - min_) + min_)
-            elif self.motors[motor].norm_mode is MotorNormMode.RANGE_0_100:
-                val = 100 - val if drive_mode else val
-                bounded_val = min(100.0, max(0.0, val))
-                unnormalized_values[id_] = int((bounded_val / 100) * (max_ - min_) + min_)
-            elif self.motors[motor].norm_mode is MotorNormMode.DEGREES:
-                mid = (min_ + max_) / 2
-                max_res = self.model_resolution_table[self._id_to_model(id_)] - 1
-                unnormalized_values[id_] = int((val * max_res / 360) + mid)
-            else:
-                raise NotImplementedError
-
-        return unnormalized_values
+        ids = np.fromiter(ids_values, dtype=int, count=len(ids_values))
+        values = np.fromiter(ids_values.values(), dtype=float, count=len(ids_values))
+        min_, max_, drive_modes, norm_modes, max_res = self._get_calibration_rows(ids)
+
+        is_range_m100_100 = norm_modes == NORM_MODE_CODES[MotorNormMode.RANGE_M100_100]
+        is_range_0_100 = norm_modes == NORM_MODE_CODES[MotorNormMode.RANGE_0_100]
+        range_m100_100 = np.clip(np.where(drive_modes, -values, values), -100.0, 100.0)
+        range_0_100 = np.clip(np.where(drive_modes, 100 - values, values), 0.0, 100.0)
+        unnormalized_values = np.select(
+            [is_range_m100_100, is_range_0_100],
+            [
+                ((range_m100_100 + 100) / 200) * (max_ - min_) + min_,
+                (range_0_100 / 100) * (max_ - min_) + min_,
+            ],
+            default=(values * max_res / 360) + (min_ + max_) / 2,
+        )
+        # Truncated towards zero, like `int`
+        return dict(zip(ids_values, np.trunc(unnormalized_values).astype(int).tolist(), strict=True))
 
     @abc.abstractmethod
     def _encode_sign(self, data_name: str, ids_values: dict[int, int]) -> dict[int, int]:
@@ -972,7 +1066,9 @@ class MotorsBus(abc.ABC):
             raise ValueError(length)
 
         for n_try in range(1 + num_retry):
+            start = time.perf_counter()
             value, comm, error = read_fn(self.port_handler, motor_id, address)
+            self.transaction_stats["read"].add(time.perf_counter() - start)
             if self._is_comm_success(comm):
                 break
             logger.debug(
@@ -1035,7 +1131,9 @@ class MotorsBus(abc.ABC):
     ) -> tuple[int, int]:
         data = self._serialize_data(value, length)
         for n_try in range(1 + num_retry):
+            start = time.perf_counter()
             comm, error = self.packet_handler.writeTxRx(self.port_handler, motor_id, addr, length, data)
+            self.transaction_stats["write"].add(time.perf_counter() - start)
             if self._is_comm_success(comm):
                 break
             logger.debug(
@@ -1098,6 +1196,63 @@ class MotorsBus(abc.ABC):
 
         return {self._id_to_name(id_): value for id_, value in ids_values.items()}
 
+    def sync_read_multiple(
+        self,
+        data_names: list[str],
+        motors: str | list[str] | None = None,
+        *,
+        normalize: bool = True,
+        num_retry: int = 0,
+    ) -> dict[str, dict[str, Value]]:
+        """Read several registers from several motors in a single transaction.
+
+        The registers are read as one block, from the lowest to the highest of their addresses, so they should
+        be close to each other in the control table (e.g. `"Present_Position"`, `"Present_Velocity"` and
+        `"Present_Current"`).
+
+        Args:
+            data_names (list[str]): Register names.
+            motors (str | list[str] | None, optional): Motors to query. `None` (default) reads every motor.
+            normalize (bool, optional): Normalisation flag.  Defaults to `True`.
+            num_retry (int, optional): Retry attempts.  Defaults to `0`.
+
+        Returns:
+            dict[str, dict[str, Value]]: Mapping *register name → motor name → value*.
+        """
+        if not self.is_connected:
+            raise DeviceNotConnectedError(
+                f"{self.__class__.__name__}('{self.port}') is not connected. You need to run `{self.__class__.__name__}.connect()`."
+            )
+        if not data_names:
+            raise ValueError("At least one register name must be provided.")
+
+        self._assert_protocol_is_compatible("sync_read")
+
+        names = self._get_motors_list(motors)
+        ids = [self.motors[motor].id for motor in names]
+        models = [self.motors[motor].model for motor in names]
+
+        if self._has_different_ctrl_tables:
+            for data_name in data_names:
+                assert_same_address(self.model_ctrl_table, models, data_name)
+
+        model = next(iter(models))
+        fields = [get_address(self.model_ctrl_table, model, data_name) for data_name in data_names]
+
+        err_msg = f"Failed to sync read {data_names} on {ids=} after {num_retry + 1} tries."
+        fields_values, _ = self._sync_read_fields(
+            fields, ids, num_retry=num_retry, raise_on_error=True, err_msg=err_msg
+        )
+
+        values = {}
+        for data_name, ids_values in zip(data_names, fields_values, strict=True):
+            ids_values = self._decode_sign(data_name, ids_values)
+            if normalize and data_name in self.normalized_data:
+                ids_values = self._normalize(ids_values)
+            values[data_name] = {self._id_to_name(id_): value for id_, value in ids_values.items()}
+
+        return values
+
     def _sync_read(
         self,
         addr: int,
@@ -1108,9 +1263,28 @@ class MotorsBus(abc.ABC):
         raise_on_error: bool = True,
         err_msg: str = "",
     ) -> tuple[dict[int, int], int]:
-        self._setup_sync_reader(motor_ids, addr, length)
+        fields_values, comm = self._sync_read_fields(
+            [(addr, length)], motor_ids, num_retry=num_retry, raise_on_error=raise_on_error, err_msg=err_msg
+        )
+        return fields_values[0], comm
+
+    def _sync_read_fields(
+        self,
+        fields: list[tuple[int, int]],
+        motor_ids: list[int],
+        *,
+        num_retry: int = 0,
+        raise_on_error: bool = True,
+        err_msg: str = "",
+    ) -> tuple[list[dict[int, int]], int]:
+        """Reads the (address, length) `fields` of the motors in one transaction spanning all of them."""
+        addr = min(field_addr for field_addr, _ in fields)
+        length = max(field_addr + field_length for field_addr, field_length in fields) - addr
+        self._use_sync_reader(motor_ids, addr, length)
         for n_try in range(1 + num_retry):
+            start = time.perf_counter()
             comm = self.sync_reader.txRxPacket()
+            self.transaction_stats["sync_read"].add(time.perf_counter() - start)
             if self._is_comm_success(comm):
                 break
             logger.debug(
@@ -1121,8 +1295,39 @@ class MotorsBus(abc.ABC):
         if not self._is_comm_success(comm) and raise_on_error:
             raise ConnectionError(f"{err_msg} {self.packet_handler.getTxRxResult(comm)}")
 
-        values = {id_: self.sync_reader.getData(id_, addr, length) for id_ in motor_ids}
-        return values, comm
+        fields_values = [
+            {id_: self.sync_reader.getData(id_, field_addr, field_length) for id_ in motor_ids}
+            for field_addr, field_length in fields
+        ]
+        return fields_values, comm
+
+    def _get_cached_group(
+        self,
+        cache: dict[tuple, GroupSyncRead | GroupSyncWrite],
+        group: GroupSyncRead | GroupSyncWrite,
+        key: tuple,
+    ) -> tuple[GroupSyncRead | GroupSyncWrite, bool]:
+        """Returns the group cached for `key` = (ids, addr, length) and whether it was cached. Otherwise, a new
+        group of the same type as `group` is cached, dropping the least recently used one if the cache is full."""
+        cached = cache.pop(key, None)
+        is_cached = cached is not None
+        if not is_cached:
+            _, addr, length = key
+            # The group created with the bus is used first
+            cached = type(group)(self.port_handler, self.packet_handler, addr, length) if cache else group
+            if len(cache) >= MAX_CACHED_SYNC_GROUPS:
+                cache.pop(next(iter(cache)))
+        cache[key] = cached
+        return cached, is_cached
+
+    def _use_sync_reader(self, motor_ids: list[int], addr: int, length: int) -> None:
+        # Readers are kept per (ids, address range), so that repeated reads of the same registers don't rebuild
+        # their parameters
+        self.sync_reader, is_cached = self._get_cached_group(
+            self._sync_readers, self.sync_reader, (tuple(motor_ids), addr, length)
+        )
+        if not is_cached:
+            self._setup_sync_reader(motor_ids, addr, length)
 
     def _setup_sync_reader(self, motor_ids: list[int], addr: int, length: int) -> None:
         self.sync_reader.clearParam()
@@ -1196,9 +1401,11 @@ class MotorsBus(abc.ABC):
         raise_on_error: bool = True,
         err_msg: str = "",
     ) -> int:
-        self._setup_sync_writer(ids_values, addr, length)
+        self._use_sync_writer(ids_values, addr, length)
         for n_try in range(1 + num_retry):
+            start = time.perf_counter()
             comm = self.sync_writer.txPacket()
+            self.transaction_stats["sync_write"].add(time.perf_counter() - start)
             if self._is_comm_success(comm):
                 break
             logger.debug(
@@ -1211,6 +1418,18 @@ class MotorsBus(abc.ABC):
 
         return comm
 
+    def _use_sync_writer(self, ids_values: dict[int, int], addr: int, length: int) -> None:
+        # Writers are kept per (ids, address range) as well, only the data of their parameters is changed
+        self.sync_writer, is_cached = self._get_cached_group(
+            self._sync_writers, self.sync_writer, (tuple(ids_values), addr, length)
+        )
+        if not is_cached:
+            self._setup_sync_writer(ids_values, addr, length)
+            return
+
+        for id_, value in ids_values.items():
+            self.sync_writer.changeParam(id_, self._serialize_data(value, length))
+
     def _setup_sync_writer(self, ids_values: dict[int, int], addr: int, length: int) -> None:
         self.sync_writer.clearParam()
         self.sync_writer.start_address = addr
@@ -85,6 +85,14 @@ class ACTConfig(PreTrainedConfig):
             ensembling. Defaults to None which means temporal ensembling is not used. `n_action_steps` must be
             1 when using this feature, as inference needs to happen at every step to form an ensemble. For
             more information on how ensembling works, please see `ACTTemporalEnsembler`.
+        async_lookahead: Enables asynchronous action chunking when set: the next chunk is predicted in a
+            background thread, from the observation received when `async_lookahead` actions of the current
+            chunk remain to be executed, so that `select_action` doesn't wait for the inference as long as it
+            takes less than `async_lookahead` steps. The actions executed meanwhile are skipped from the new
+            chunk. Requires `n_action_steps + async_lookahead + async_blend_steps <= chunk_size`. See
+            `ACTAsyncChunker`.
+        async_blend_steps: Number of actions at the start of each new chunk which are linearly blended with
+            the actions the previous chunk predicted for the same steps, to smooth the chunk boundaries.
         dropout: Dropout to use in the transformer layers (see code for details).
         kl_weight: The weight to use for the KL-divergence component of the loss if the variational objective
             is enabled. Loss is then calculated as: `reconstruction_loss + kl_weight * kld_loss`.
@@ -127,6 +135,8 @@ class ACTConfig(PreTrainedConfig):
     # Inference.
     # Note: the value used in ACT when temporal ensembling is enabled is 0.01.
     temporal_ensemble_coeff: float | None = None
+    async_lookahead: int | None = None
+    async_blend_steps: int = 0
 
     # Training and loss computation.
     dropout: float = 0.1
@@ -155,6 +165,19 @@ class ACTConfig(PreTrainedConfig):
                 f"The chunk size is the upper bound for the number of action steps per model invocation. Got "
                 f"{self.n_action_steps} for `n_action_steps` and {self.chunk_size} for `chunk_size`."
             )
+        if self.async_lookahead is not None:
+            if self.temporal_ensemble_coeff is not None:
+                raise ValueError("Asynchronous action chunking can't be used with temporal ensembling.")
+            if not 1 <= self.async_lookahead <= self.n_action_steps:
+                raise ValueError(
+                    f"`async_lookahead` must be between 1 and `n_action_steps`. Got {self.async_lookahead}."
+                )
+            if self.n_action_steps + self.async_lookahead + self.async_blend_steps > self.chunk_size:
+                raise ValueError(
+                    "With asynchronous action chunking, `n_action_steps + async_lookahead + async_blend_steps` "
+                    f"can't exceed `chunk_size`. Got {self.n_action_steps=}, {self.async_lookahead=}, "
+                    f"{self.async_blend_steps=} and {self.chunk_size=}."
+                )
         if self.n_obs_steps != 1:
             raise ValueError(
                 f"Multiple observation steps not handled yet. Got `nobs_steps={self.n_obs_steps}`"
@@ -22,6 +22,7 @@ The majority of changes here involve removing unused code, unifying naming, and
 import math
 from collections import deque
 from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from itertools import chain
 
 import einops
@@ -76,6 +77,13 @@ class ACTPolicy(PreTrainedPolicy):
 
         if config.temporal_ensemble_coeff is not None:
             self.temporal_ensembler = ACTTemporalEnsembler(config.temporal_ensemble_coeff, config.chunk_size)
+        if config.async_lookahead is not None:
+            self.async_chunker = ACTAsyncChunker(
+                self.predict_action_chunk,
+                config.n_action_steps,
+                config.async_lookahead,
+                config.async_blend_steps,
+            )
 
         self.reset()
 
@@ -104,6 +112,8 @@ class ACTPolicy(PreTrainedPolicy):
         """This should be called whenever the environment is reset."""
         if self.config.temporal_ensemble_coeff is not None:
             self.temporal_ensembler.reset()
+        elif self.config.async_lookahead is not None:
+            self.async_chunker.reset()
         else:
             self._action_queue = deque([], maxlen=self.config.n_action_steps)
 
@@ -122,6 +132,9 @@ class ACTPolicy(PreTrainedPolicy):
             action = self.temporal_ensembler.update(actions)
             return action
 
+        if self.config.async_lookahead is not None:
+            return self.async_chunker.select_action(batch)
+
         # Action queue logic for n_action_steps > 1. When the action_queue is depleted, populate it by
         # querying the policy.
         if len(self._action_queue) == 0:
@@ -268,6 +281,81 @@ class ACTTemporalEnsembler:
         return action
 
 
+class ACTAsyncChunker:
+    def __init__(
+        self,
+        predict_fn: Callable[[dict[str, Tensor]], Tensor],
+        n_action_steps: int,
+        lookahead: int,
+        blend_steps: int = 0,
+    ) -> None:
+        """Asynchronous action chunking: the next chunk is predicted in a background thread while the current
+        one is executed.
+
+        When `lookahead` actions of the current chunk remain to be executed, the next chunk is requested from
+        the current observation. It is used once the current chunk is exhausted, `lookahead` steps later, so
+        its first `lookahead` actions, which correspond to the steps executed meanwhile, are skipped.
+        `select_action` only waits for the prediction if it takes longer than `lookahead` steps.
+
+        For the first `blend_steps` actions of a new chunk, the action executed is a linear blend of the new
+        chunk's action (weighted by (i + 1) / (blend_steps + 1) for the i-th action) and of the action the
+        previous chunk predicted for the same step.
+
+        Args:
+            predict_fn: Predicts a (batch, chunk_size, action_dim) chunk of actions from an observation.
+            n_action_steps: Number of actions executed per chunk.
+            lookahead: Number of remaining actions of the current chunk when the next one is requested.
+            blend_steps: Number of actions blended at the start of a new chunk.
+        """
+        self.predict_fn = predict_fn
+        self.n_action_steps = n_action_steps
+        self.lookahead = lookahead
+        self.blend_steps = blend_steps
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="act_async_chunker")
+        self.pending_chunk: Future | None = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Drops the current chunk, as well as the chunk being predicted once its prediction is done."""
+        if self.pending_chunk is not None:
+            self.pending_chunk.cancel()
+            self.pending_chunk = None
+        # Actions of the current chunk from the step at which it started to be executed, and the number of
+        # them already executed
+        self.chunk = None
+        self.step = 0
+
+    def select_action(self, batch: dict[str, Tensor]) -> Tensor:
+        if self.chunk is None:
+            self.chunk, self.step = self.predict_fn(batch), 0
+        elif self.step == self.n_action_steps:
+            self._switch_to_pending_chunk()
+
+        if self.n_action_steps - self.step == self.lookahead:
+            # The observation could be modified in place by the caller while the chunk is being predicted
+            batch = {
+                key: value.clone() if isinstance(value, Tensor) else value for key, value in batch.items()
+            }
+            self.pending_chunk = self.executor.submit(self.predict_fn, batch)
+
+        action = self.chunk[:, self.step]
+        self.step += 1
+        return action
+
+    def _switch_to_pending_chunk(self) -> None:
+        new_chunk = self.pending_chunk.result()[:, self.lookahead :]
+        self.pending_chunk = None
+        if self.blend_steps > 0:
+            new_chunk = new_chunk.clone()
+            weights = torch.arange(1, self.blend_steps + 1, device=new_chunk.device) / (self.blend_steps + 1)
+            weights = weights[None, :, None]
+            previous = self.chunk[:, self.step : self.step + self.blend_steps]
+            new_chunk[:, : self.blend_steps] = (
+                weights * new_chunk[:, : self.blend_steps] + (1 - weights) * previous
+            )
+        self.chunk, self.step = new_chunk, 0
+
+
 class ACT(nn.Module):
     """Action Chunking Transformer: The underlying neural network for ACTPolicy.
 
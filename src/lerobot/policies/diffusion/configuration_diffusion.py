@@ -98,6 +98,11 @@ class DiffusionConfig(PreTrainedConfig):
         clip_sample_range: The magnitude of the clipping range as described above.
         num_inference_steps: Number of reverse diffusion steps to use at inference time (steps are evenly
             spaced). If not provided, this defaults to be the same as `num_train_timesteps`.
+        use_ddim_sampler: Whether to sample actions with a deterministic DDIM sampler (see `DDIMSampler`) taking
+            `num_inference_steps` steps, whatever the noise scheduler used for training. Its denoising loop has
+            static shapes, so that it can be compiled.
+        compile_sampler: Whether to compile the observation encoders and the DDIM denoising loop into a single
+            graph with `torch.compile`. Requires `use_ddim_sampler`.
         do_mask_loss_for_padding: Whether to mask the loss when there are copy-padded actions. See
             `LeRobotDataset` and `load_previous_and_future_frames` for more information. Note, this defaults
             to False as the original Diffusion Policy implementation does the same.
@@ -147,6 +152,8 @@ class DiffusionConfig(PreTrainedConfig):
 
     # Inference
     num_inference_steps: int | None = None
+    use_ddim_sampler: bool = False
+    compile_sampler: bool = False
 
     # Loss computation
     do_mask_loss_for_padding: bool = False
@@ -180,6 +187,9 @@ class DiffusionConfig(PreTrainedConfig):
                 f"Got {self.noise_scheduler_type}."
             )
 
+        if self.compile_sampler and not self.use_ddim_sampler:
+            raise ValueError("`compile_sampler` requires `use_ddim_sampler` to be True.")
+
         # Check that the horizon size and U-Net downsampling is compatible.
         # U-Net downsamples by 2 with each stage.
         downsampling_factor = 2 ** len(self.down_dims)
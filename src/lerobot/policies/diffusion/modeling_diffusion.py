@@ -172,6 +172,81 @@ def _make_noise_scheduler(name: str, **kwargs: dict) -> DDPMScheduler | DDIMSche
         raise ValueError(f"Unsupported noise scheduler type {name}")
 
 
+class DDIMSampler(nn.Module):
+    """
+    Deterministic DDIM sampling (eta = 0, as `DDIMScheduler` with its default options) following the noise
+    schedule of the scheduler used for training, with any number of steps.
+
+    The coefficients of every step are precomputed, so that a step only consists of tensor operations and the
+    denoising loop has static shapes. Stepping through `timesteps` with `step` gives the same samples as
+    `DDIMScheduler.step` with the same number of inference steps.
+
+    Args:
+        noise_scheduler: Scheduler used for training, providing `alphas_cumprod`.
+        num_inference_steps: Number of denoising steps.
+        prediction_type, clip_sample, clip_sample_range: See `DiffusionConfig`.
+    """
+
+    def __init__(
+        self,
+        noise_scheduler: DDPMScheduler | DDIMScheduler,
+        num_inference_steps: int,
+        prediction_type: str = "epsilon",
+        clip_sample: bool = True,
+        clip_sample_range: float = 1.0,
+    ):
+        super().__init__()
+        num_train_timesteps = noise_scheduler.config.num_train_timesteps
+        if not 0 < num_inference_steps <= num_train_timesteps:
+            raise ValueError(
+                f"`num_inference_steps` must be between 1 and {num_train_timesteps=}. Got {num_inference_steps}."
+            )
+        self.prediction_type = prediction_type
+        self.clip_sample = clip_sample
+        self.clip_sample_range = clip_sample_range
+
+        # "leading" timesteps spacing
+        step_ratio = num_train_timesteps // num_inference_steps
+        timesteps = torch.arange(num_inference_steps - 1, -1, -1, dtype=torch.long) * step_ratio
+        prev_timesteps = timesteps - step_ratio
+
+        alphas_cumprod = noise_scheduler.alphas_cumprod
+        alpha_prod = alphas_cumprod[timesteps]
+        # The last step goes to an alpha_cumprod of 1
+        alpha_prod_prev = torch.where(prev_timesteps >= 0, alphas_cumprod[prev_timesteps.clamp(min=0)], 1.0)
+
+        # Not saved in the state dict: they are derived from the config
+        self.register_buffer("timesteps", timesteps, persistent=False)
+        self.register_buffer("sqrt_alpha_prod", alpha_prod**0.5, persistent=False)
+        self.register_buffer("sqrt_beta_prod", (1 - alpha_prod) ** 0.5, persistent=False)
+        self.register_buffer("sqrt_alpha_prod_prev", alpha_prod_prev**0.5, persistent=False)
+        self.register_buffer("sqrt_beta_prod_prev", (1 - alpha_prod_prev) ** 0.5, persistent=False)
+
+    def __len__(self) -> int:
+        return len(self.timesteps)
+
+    def step(self, step_idx: int, model_output: Tensor, sample: Tensor) -> Tensor:
+        """Computes the sample of the previous timestep from the model output at `timesteps[step_idx]`."""
+        if self.prediction_type == "epsilon":
+            pred_original_sample = (
+                sample - self.sqrt_beta_prod[step_idx] * model_output
+            ) / self.sqrt_alpha_prod[step_idx]
+            pred_epsilon = model_output
+        else:
+            pred_original_sample = model_output
+            pred_epsilon = (sample - self.sqrt_alpha_prod[step_idx] * model_output) / self.sqrt_beta_prod[
+                step_idx
+            ]
+
+        if self.clip_sample:
+            pred_original_sample = pred_original_sample.clamp(-self.clip_sample_range, self.clip_sample_range)
+
+        return (
+            self.sqrt_alpha_prod_prev[step_idx] * pred_original_sample
+            + self.sqrt_beta_prod_prev[step_idx] * pred_epsilon
+        )
+
+
 class DiffusionModel(nn.Module):
     def __init__(self, config: DiffusionConfig):
         super().__init__()
@@ -209,6 +284,20 @@ class DiffusionModel(nn.Module):
         else:
             self.num_inference_steps = config.num_inference_steps
 
+        self.ddim_sampler = None
+        self._sample_ddim_fn = None
+        if config.use_ddim_sampler:
+            self.ddim_sampler = DDIMSampler(
+                self.noise_scheduler,
+                self.num_inference_steps,
+                prediction_type=config.prediction_type,
+                clip_sample=config.clip_sample,
+                clip_sample_range=config.clip_sample_range,
+            )
+            self._sample_ddim_fn = self.sample_ddim
+            if config.compile_sampler:
+                self._sample_ddim_fn = torch.compile(self.sample_ddim, dynamic=False)
+
     # ========= inference  ============
     def conditional_sample(
         self, batch_size: int, global_cond: Tensor | None = None, generator: torch.Generator | None = None
@@ -238,6 +327,18 @@ class DiffusionModel(nn.Module):
 
         return sample
 
+    def sample_ddim(self, batch: dict[str, Tensor], sample: Tensor) -> Tensor:
+        """Encodes the observations and denoises `sample`, the prior, with the DDIM sampler.
+
+        The number of steps is fixed, so that the whole sampling can be compiled (see `compile_sampler`).
+        """
+        global_cond = self._prepare_global_conditioning(batch)
+        for step_idx in range(len(self.ddim_sampler)):
+            timestep = self.ddim_sampler.timesteps[step_idx].expand(sample.shape[0])
+            model_output = self.unet(sample, timestep, global_cond=global_cond)
+            sample = self.ddim_sampler.step(step_idx, model_output, sample)
+        return sample
+
     def _prepare_global_conditioning(self, batch: dict[str, Tensor]) -> Tensor:
         """Encode image features and concatenate them all together along with the state vector."""
         batch_size, n_obs_steps = batch[OBS_STATE].shape[:2]
@@ -290,11 +391,19 @@ class DiffusionModel(nn.Module):
         batch_size, n_obs_steps = batch["observation.state"].shape[:2]
         assert n_obs_steps == self.config.n_obs_steps
 
-        # Encode image features and concatenate them all together along with the state vector.
-        global_cond = self._prepare_global_conditioning(batch)  # (B, global_cond_dim)
+        if self.ddim_sampler is not None:
+            prior = torch.randn(
+                size=(batch_size, self.config.horizon, self.config.action_feature.shape[0]),
+                dtype=get_dtype_from_parameters(self),
+                device=get_device_from_parameters(self),
+            )
+            actions = self._sample_ddim_fn(batch, prior)
+        else:
+            # Encode image features and concatenate them all together along with the state vector.
+            global_cond = self._prepare_global_conditioning(batch)  # (B, global_cond_dim)
 
-        # run sampling
-        actions = self.conditional_sample(batch_size, global_cond=global_cond)
+            # run sampling
+            actions = self.conditional_sample(batch_size, global_cond=global_cond)
 
         # Extract `n_action_steps` steps worth of actions (from the current observation).
         start = n_obs_steps - 1
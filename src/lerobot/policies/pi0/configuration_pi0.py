@@ -59,6 +59,8 @@ class PI0Config(PreTrainedConfig):
 
     # Tokenizer
     tokenizer_max_length: int = 48
+    # At inference, reuse the tokens and embeddings of the task as long as it doesn't change
+    cache_language: bool = True
 
     # Projector
     proj_width: int = 1024
@@ -68,6 +70,9 @@ class PI0Config(PreTrainedConfig):
 
     # Attention utils
     use_cache: bool = True
+    # At inference, reuse the key value cache of the prefix while its inputs don't change. Opt-in, since the
+    # inputs are compared to and copied from the last call at every inference.
+    reuse_prefix_cache: bool = False
     attention_implementation: str = "eager"  # or fa2, flex
 
     # Finetuning settings
@@ -53,6 +53,13 @@ class ActorLearnerConfig:
     learner_port: int = 50051
     policy_parameters_push_frequency: int = 4
     queue_get_timeout: float = 2
+    # How parameters are pushed to the actor: "full" state dicts, only the "changed" tensors, or the deltas of the
+    # changed tensors quantized to int8 ("int8_delta"). See `lerobot.transport.parameter_sync`.
+    parameter_sync_mode: str = "full"
+    # Precision in which floating point parameters are sent ("float16", "bfloat16" or None to keep theirs)
+    parameter_sync_dtype: str | None = None
+    # Number of pushes between two full snapshots of the parameters when only changes are sent (0 to disable)
+    full_parameter_sync_frequency: int = 20
 
 
 @dataclass
@@ -145,6 +152,18 @@ class SACConfig(PreTrainedConfig):
     online_buffer_capacity: int = 100000
     # Capacity of the offline replay buffer
     offline_buffer_capacity: int = 100000
+    # Whether to store the images of the replay buffers as uint8 instead of float32 (4 times less memory)
+    store_images_as_uint8: bool = False
+    # Whether to keep the replay buffers in memory-mapped files of the output directory, which are flushed at
+    # each checkpoint so that resuming reattaches to them instead of rebuilding them from datasets. This also
+    # allows buffers larger than the RAM.
+    disk_backed_buffers: bool = False
+    # Whether to sample the transitions of the replay buffers proportionally to their TD error (prioritized replay)
+    prioritized_replay: bool = False
+    # Exponent applied to the TD errors to get the priorities (0 is uniform sampling)
+    priority_alpha: float = 0.6
+    # Exponent of the importance sampling weights correcting the bias of prioritized sampling
+    priority_beta: float = 0.4
     # Whether to use asynchronous prefetching for the buffers
     async_prefetch: bool = False
     # Number of steps before learning starts
@@ -15,6 +15,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
 import math
 from collections.abc import Callable
 from dataclasses import asdict
@@ -171,8 +172,10 @@ class SACPolicy(
             next_observations: dict[str, Tensor] = batch["next_state"]
             done: Tensor = batch["done"]
             next_observation_features: Tensor = batch.get("next_observation_feature")
+            # Importance sampling weights of the transitions, with a prioritized replay buffer
+            complementary_info = batch.get("complementary_info") or {}
 
-            loss_critic = self.compute_loss_critic(
+            loss_critic, td_error = self.compute_loss_critic(
                 observations=observations,
                 actions=actions,
                 rewards=rewards,
@@ -180,9 +183,10 @@ class SACPolicy(
                 done=done,
                 observation_features=observation_features,
                 next_observation_features=next_observation_features,
+                importance_weights=complementary_info.get("importance_weights"),
             )
 
-            return {"loss_critic": loss_critic}
+            return {"loss_critic": loss_critic, "td_error": td_error}
 
         if model == "discrete_critic" and self.config.num_discrete_actions is not None:
             # Extract critic-specific components
@@ -254,7 +258,10 @@ class SACPolicy(
         done,
         observation_features: Tensor | None = None,
         next_observation_features: Tensor | None = None,
-    ) -> Tensor:
+        importance_weights: Tensor | None = None,
+    ) -> tuple[Tensor, Tensor]:
+        """Returns the critics loss, and the TD error of each transition (averaged over the critics), to update
+        the priorities of a prioritized replay buffer."""
         with torch.no_grad():
             next_action_preds, next_log_probs, _ = self.actor(next_observations, next_observation_features)
 
@@ -297,14 +304,16 @@ class SACPolicy(
         # Compute state-action value loss (TD loss) for all of the Q functions in the ensemble.
         td_target_duplicate = einops.repeat(td_target, "b -> e b", e=q_preds.shape[0])
         # You compute the mean loss of the batch for each critic and then to compute the final loss you sum them up
-        critics_loss = (
-            F.mse_loss(
-                input=q_preds,
-                target=td_target_duplicate,
-                reduction="none",
-            ).mean(dim=1)
-        ).sum()
-        return critics_loss
+        losses = F.mse_loss(
+            input=q_preds,
+            target=td_target_duplicate,
+            reduction="none",
+        )
+        if importance_weights is not None:
+            losses = losses * importance_weights
+        critics_loss = losses.mean(dim=1).sum()
+        td_error = (q_preds - td_target_duplicate).abs().mean(dim=0).detach()
+        return critics_loss, td_error
 
     def compute_loss_discrete_critic(
         self,
@@ -740,10 +749,72 @@ class CriticHead(nn.Module):
         return self.output_layer(self.net(x))
 
 
+class EnsembleLinear(nn.Module):
+    """Linear layers of the members of an ensemble, with their weights stacked along a first dimension.
+
+    Takes inputs of shape (batch_size, in_features), shared by all members, or (ensemble_size, batch_size,
+    in_features), and returns outputs of shape (ensemble_size, batch_size, out_features).
+    """
+
+    def __init__(self, layers: list[nn.Linear]):
+        super().__init__()
+        self.weight = nn.Parameter(torch.stack([layer.weight.detach() for layer in layers]))
+        self.bias = nn.Parameter(torch.stack([layer.bias.detach() for layer in layers]))
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        if x.dim() == 2:
+            return torch.matmul(x, self.weight.transpose(1, 2)) + self.bias.unsqueeze(1)
+        return torch.baddbmm(self.bias.unsqueeze(1), x, self.weight.transpose(1, 2))
+
+
+class EnsembleLayerNorm(nn.Module):
+    """LayerNorms of the members of an ensemble, with their affine parameters stacked along a first dimension."""
+
+    def __init__(self, layers: list[nn.LayerNorm]):
+        super().__init__()
+        self.normalized_shape = layers[0].normalized_shape
+        self.eps = layers[0].eps
+        self.weight = nn.Parameter(torch.stack([layer.weight.detach() for layer in layers]))
+        self.bias = nn.Parameter(torch.stack([layer.bias.detach() for layer in layers]))
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        x = F.layer_norm(x, self.normalized_shape, eps=self.eps)
+        return torch.addcmul(self.bias.unsqueeze(1), x, self.weight.unsqueeze(1))
+
+
+def stack_ensemble_modules(modules: list[nn.Module]) -> nn.Module:
+    """Fuses identically structured modules into one module evaluating all of them at once.
+
+    The structure of the first module is kept, with its `nn.Linear` and `nn.LayerNorm` layers replaced by
+    `EnsembleLinear` and `EnsembleLayerNorm` layers holding the stacked parameters of all the modules. The
+    parameters of the fused module therefore have the same names as the ones of each module.
+    """
+    template = modules[0]
+    if isinstance(template, nn.Linear):
+        return EnsembleLinear(modules)
+    if isinstance(template, nn.LayerNorm):
+        return EnsembleLayerNorm(modules)
+    if not list(template.children()):
+        if list(template.parameters(recurse=False)):
+            raise ValueError(f"Unsupported ensemble layer {type(template).__name__} with parameters.")
+        return template
+
+    fused = copy.copy(template)
+    fused._modules = {
+        name: stack_ensemble_modules([module.get_submodule(name) for module in modules])
+        for name in template._modules
+    }
+    return fused
+
+
 class CriticEnsemble(nn.Module):
     """
     CriticEnsemble wraps multiple CriticHead modules into an ensemble.
 
+    The parameters of the heads are stacked (see `stack_ensemble_modules`) so that all the critics are evaluated
+    with one batched matmul per layer. State dicts with one module per head (`critics.<i>.<name>`) are
+    converted when loaded, and `head_state_dicts` converts the stacked parameters back to this layout.
+
     Args:
         encoder (SACObservationEncoder): encoder for observations.
         ensemble (List[CriticHead]): list of critic heads.
@@ -764,7 +835,25 @@ class CriticEnsemble(nn.Module):
         self.encoder = encoder
         self.init_final = init_final
         self.output_normalization = output_normalization
-        self.critics = nn.ModuleList(ensemble)
+        self.num_critics = len(ensemble)
+        self.heads = stack_ensemble_modules(ensemble)
+
+    def head_state_dicts(self) -> list[dict[str, torch.Tensor]]:
+        """Returns the state dict of each head, as a `CriticHead` state dict."""
+        state_dict = self.heads.state_dict()
+        return [{name: tensor[i] for name, tensor in state_dict.items()} for i in range(self.num_critics)]
+
+    def _load_from_state_dict(self, state_dict, prefix, *args, **kwargs):
+        # Stack the parameters of state dicts with one module per head, loaded by `heads` afterwards
+        heads_prefix = f"{prefix}critics."
+        if head_keys := [key for key in state_dict if key.startswith(heads_prefix)]:
+            per_head: dict[str, dict[int, torch.Tensor]] = {}
+            for key in head_keys:
+                index, name = key.removeprefix(heads_prefix).split(".", 1)
+                per_head.setdefault(name, {})[int(index)] = state_dict.pop(key)
+            for name, tensors in per_head.items():
+                state_dict[f"{prefix}heads.{name}"] = torch.stack([tensors[i] for i in sorted(tensors)])
+        super()._load_from_state_dict(state_dict, prefix, *args, **kwargs)
 
     def forward(
         self,
@@ -785,14 +874,8 @@ class CriticEnsemble(nn.Module):
 
         inputs = torch.cat([obs_enc, actions], dim=-1)
 
-        # Loop through critics and collect outputs
-        q_values = []
-        for critic in self.critics:
-            q_values.append(critic(inputs))
-
-        # Stack outputs to match expected shape [num_critics, batch_size]
-        q_values = torch.stack([q.squeeze(-1) for q in q_values], dim=0)
-        return q_values
+        # All the critics at once, with shape [num_critics, batch_size]
+        return self.heads(inputs).squeeze(-1)
 
 
 class DiscreteCritic(nn.Module):
@@ -59,12 +59,17 @@ class SmolVLAConfig(PreTrainedConfig):
 
     # Tokenizer
     tokenizer_max_length: int = 48
+    # At inference, reuse the tokens and embeddings of the task as long as it doesn't change
+    cache_language: bool = True
 
     # Decoding
     num_steps: int = 10
 
     # Attention utils
     use_cache: bool = True
+    # At inference, reuse the key value cache of the prefix while its inputs don't change. Opt-in, since the
+    # inputs are compared to and copied from the last call at every inference.
+    reuse_prefix_cache: bool = False
 
     # Finetuning settings
     freeze_vision_encoder: bool = True
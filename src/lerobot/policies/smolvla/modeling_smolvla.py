@@ -362,6 +362,9 @@ class SmolVLAPolicy(PreTrainedPolicy):
         self._queues = {
             ACTION: deque(maxlen=self.config.n_action_steps),
         }
+        # Task and device of the last tokenized tasks, with their tokens and masks
+        self._language_cache = None
+        self.model.clear_caches()
 
     # HACK(aliberts, danaaubakirova): we overwrite this classmethod here to fix smolVLA-specific issues
     @classmethod
@@ -383,7 +386,9 @@ class SmolVLAPolicy(PreTrainedPolicy):
     def get_optim_params(self) -> dict:
         return self.parameters()
 
-    def _get_action_chunk(self, batch: dict[str, Tensor], noise: Tensor | None = None) -> Tensor:
+    def _get_action_chunk(
+        self, batch: dict[str, Tensor], noise: Tensor | None = None, num_steps: int | None = None
+    ) -> Tensor:
         for k in batch:
             if k in self._queues:
                 batch[k] = torch.stack(list(self._queues[k]), dim=1)
@@ -392,7 +397,9 @@ class SmolVLAPolicy(PreTrainedPolicy):
         state = self.prepare_state(batch)
         lang_tokens, lang_masks = self.prepare_language(batch)
 
-        actions = self.model.sample_actions(images, img_masks, lang_tokens, lang_masks, state, noise=noise)
+        actions = self.model.sample_actions(
+            images, img_masks, lang_tokens, lang_masks, state, noise=noise, num_steps=num_steps
+        )
 
         # Unpad actions
         original_action_dim = self.config.action_feature.shape[0]
@@ -414,22 +421,27 @@ class SmolVLAPolicy(PreTrainedPolicy):
         return batch
 
     @torch.no_grad()
-    def predict_action_chunk(self, batch: dict[str, Tensor], noise: Tensor | None = None) -> Tensor:
+    def predict_action_chunk(
+        self, batch: dict[str, Tensor], noise: Tensor | None = None, num_steps: int | None = None
+    ) -> Tensor:
+        """Predict a chunk of actions. `num_steps` overrides the number of denoising steps of the config."""
         self.eval()
 
         batch = self._prepare_batch(batch)
         self._queues = populate_queues(self._queues, batch, exclude_keys=[ACTION])
 
-        actions = self._get_action_chunk(batch, noise)
+        actions = self._get_action_chunk(batch, noise, num_steps)
         return actions
 
     @torch.no_grad()
-    def select_action(self, batch: dict[str, Tensor], noise: Tensor | None = None) -> Tensor:
+    def select_action(
+        self, batch: dict[str, Tensor], noise: Tensor | None = None, num_steps: int | None = None
+    ) -> Tensor:
         """Select a single action given environment observations.
 
         This method wraps `select_actions` in order to return one action at a time for execution in the
         environment. It works by managing the actions in a queue and only calling `select_actions` when the
-        queue is empty.
+        queue is empty. `num_steps` overrides the number of denoising steps of the config.
         """
         self.eval()
         batch = self._prepare_batch(batch)
@@ -438,7 +450,7 @@ class SmolVLAPolicy(PreTrainedPolicy):
         # Action queue logic for n_action_steps > 1. When the action_queue is depleted, populate it by
         # querying the policy.
         if len(self._queues[ACTION]) == 0:
-            actions = self._get_action_chunk(batch, noise)
+            actions = self._get_action_chunk(batch, noise, num_steps)
 
             # `self.predict_action_chunk` returns a (batch_size, n_action_steps, action_dim) tensor, but the queue
             # effectively has shape (n_action_steps, batch_size, *), hence the transpose.
@@ -531,6 +543,11 @@ class SmolVLAPolicy(PreTrainedPolicy):
 
         tasks = [task if task.endswith("\n") else f"{task}\n" for task in tasks]
 
+        use_cache = self.config.cache_language and not self.training
+        cache_key = (tuple(tasks), device)
+        if use_cache and self._language_cache is not None and self._language_cache[0] == cache_key:
+            return self._language_cache[1]
+
         tokenized_prompt = self.language_tokenizer.__call__(
             tasks,
             padding=self.config.pad_language_to,
@@ -541,6 +558,8 @@ class SmolVLAPolicy(PreTrainedPolicy):
         lang_tokens = tokenized_prompt["input_ids"].to(device=device)
         lang_masks = tokenized_prompt["attention_mask"].to(device=device, dtype=torch.bool)
 
+        if use_cache:
+            self._language_cache = (cache_key, (lang_tokens, lang_masks))
         return lang_tokens, lang_masks
 
     def _pi_aloha_decode_state(self, state):
@@ -634,6 +653,13 @@ class VLAFlowMatching(nn.Module):
     def __init__(self, config):
         super().__init__()
         self.config = config
+        # Language tokens of the last inference with their embeddings, see `embed_language`
+        self.language_embedding_cache: tuple[Tensor, Tensor] | None = None
+        # Inputs of the prefix of the last inference with its padding mask and key value cache, see
+        # `compute_prefix_cache`
+        self.prefix_cache: tuple[list[Tensor], Tensor, dict] | None = None
+        # The caches depend on the weights, they are cleared when weights are loaded
+        self.register_load_state_dict_post_hook(lambda module, incompatible_keys: module.clear_caches())
 
         self.vlm_with_expert = SmolVLMWithExpertModel(
             model_id=self.config.vlm_model_name,
@@ -689,6 +715,30 @@ class VLAFlowMatching(nn.Module):
         time = time_beta * 0.999 + 0.001
         return time.to(dtype=torch.float32, device=device)
 
+    def clear_caches(self):
+        """Clears the language embeddings and prefix key value cache kept from the last inference."""
+        self.language_embedding_cache = None
+        self.prefix_cache = None
+
+    def embed_language(self, lang_tokens: Tensor) -> Tensor:
+        """Embed and normalize the language tokens. At inference, the embeddings are reused while the same
+        tokens are passed, which is the case while the task doesn't change (see
+        `SmolVLAPolicy.prepare_language`).
+        """
+        use_cache = self.config.cache_language and not self.training and not torch.is_grad_enabled()
+        if use_cache and self.language_embedding_cache is not None:
+            cached_tokens, cached_emb = self.language_embedding_cache
+            if cached_tokens is lang_tokens:
+                return cached_emb
+
+        lang_emb = self.vlm_with_expert.embed_language_tokens(lang_tokens)
+        # Normalize language embeddings
+        lang_emb_dim = lang_emb.shape[-1]
+        lang_emb = lang_emb * math.sqrt(lang_emb_dim)
+
+        self.language_embedding_cache = (lang_tokens, lang_emb) if use_cache else None
+        return lang_emb
+
     def embed_prefix(
         self, images, img_masks, lang_tokens, lang_masks, state: torch.Tensor = None
     ) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
@@ -745,10 +795,7 @@ class VLAFlowMatching(nn.Module):
                 embs.append(image_end_token)
                 pad_masks.append(image_end_mask)
                 att_masks += [0] * (image_end_mask.shape[1])
-        lang_emb = self.vlm_with_expert.embed_language_tokens(lang_tokens)
-        # Normalize language embeddings
-        lang_emb_dim = lang_emb.shape[-1]
-        lang_emb = lang_emb * math.sqrt(lang_emb_dim)
+        lang_emb = self.embed_language(lang_tokens)
 
         embs.append(lang_emb)
         pad_masks.append(lang_masks)
@@ -864,35 +911,32 @@ class VLAFlowMatching(nn.Module):
         losses = F.mse_loss(u_t, v_t, reduction="none")
         return losses
 
-    def sample_actions(self, images, img_masks, lang_tokens, lang_masks, state, noise=None) -> Tensor:
-        """Do a full inference forward and compute the action (batch_size x num_steps x num_motors)"""
+    def sample_actions(
+        self, images, img_masks, lang_tokens, lang_masks, state, noise=None, num_steps: int | None = None
+    ) -> Tensor:
+        """Do a full inference forward and compute the action (batch_size x num_steps x num_motors)
+
+        `num_steps` overrides the number of denoising steps of the config, to trade accuracy for latency.
+        """
         bsize = state.shape[0]
         device = state.device
+        num_steps = self.config.num_steps if num_steps is None else num_steps
 
         if noise is None:
             actions_shape = (bsize, self.config.chunk_size, self.config.max_action_dim)
             noise = self.sample_noise(actions_shape, device)
 
-        prefix_embs, prefix_pad_masks, prefix_att_masks = self.embed_prefix(
-            images, img_masks, lang_tokens, lang_masks, state=state
+        prefix_pad_masks, past_key_values = self.compute_prefix_cache(
+            images, img_masks, lang_tokens, lang_masks, state
         )
-        prefix_att_2d_masks = make_att_2d_masks(prefix_pad_masks, prefix_att_masks)
-        prefix_position_ids = torch.cumsum(prefix_pad_masks, dim=1) - 1
-        # Compute image and language key value cache
-        _, past_key_values = self.vlm_with_expert.forward(
-            attention_mask=prefix_att_2d_masks,
-            position_ids=prefix_position_ids,
-            past_key_values=None,
-            inputs_embeds=[prefix_embs, None],
-            use_cache=self.config.use_cache,
-            fill_kv_cache=True,
-        )
-        dt = -1.0 / self.config.num_steps
+
+        dt = -1.0 / num_steps
         dt = torch.tensor(dt, dtype=torch.float32, device=device)
 
         x_t = noise
         time = torch.tensor(1.0, dtype=torch.float32, device=device)
-        while time >= -dt / 2:
+        # Same steps as `while time >= -dt / 2`, without synchronizing with the device at each step
+        for _ in range(num_steps):
             expanded_time = time.expand(bsize)
             v_t = self.denoise_step(
                 prefix_pad_masks,
@@ -900,11 +944,50 @@ class VLAFlowMatching(nn.Module):
                 x_t,
                 expanded_time,
             )
+
             # Euler step
             x_t += dt * v_t
             time += dt
         return x_t
 
+    def compute_prefix_cache(self, images, img_masks, lang_tokens, lang_masks, state) -> tuple[Tensor, dict]:
+        """Compute the key value cache of the prefix (images, language and state) and its padding mask.
+
+        At inference, the cache of the last call is reused when the inputs of the prefix are unchanged (e.g.
+        when the observation is sent again) if `config.reuse_prefix_cache` is True.
+        """
+        inputs = [*images, *img_masks, lang_tokens, lang_masks, state]
+        use_cache = self.config.reuse_prefix_cache and not self.training and not torch.is_grad_enabled()
+        if use_cache and self.prefix_cache is not None:
+            cached_inputs, prefix_pad_masks, past_key_values = self.prefix_cache
+            if len(cached_inputs) == len(inputs) and all(
+                cached.shape == tensor.shape and torch.equal(cached, tensor)
+                for cached, tensor in zip(cached_inputs, inputs, strict=True)
+            ):
+                return prefix_pad_masks, past_key_values
+
+        prefix_embs, prefix_pad_masks, prefix_att_masks = self.embed_prefix(
+            images, img_masks, lang_tokens, lang_masks, state=state
+        )
+        prefix_att_2d_masks = make_att_2d_masks(prefix_pad_masks, prefix_att_masks)
+        prefix_position_ids = torch.cumsum(prefix_pad_masks, dim=1) - 1
+
+        # Compute image and language key value cache
+        _, past_key_values = self.vlm_with_expert.forward(
+            attention_mask=prefix_att_2d_masks,
+            position_ids=prefix_position_ids,
+            past_key_values=None,
+            inputs_embeds=[prefix_embs, None],
+            use_cache=self.config.use_cache,
+            fill_kv_cache=True,
+        )
+
+        # The inputs are copied, as they could be modified in place by the caller
+        self.prefix_cache = (
+            ([tensor.clone() for tensor in inputs], prefix_pad_masks, past_key_values) if use_cache else None
+        )
+        return prefix_pad_masks, past_key_values
+
     def denoise_step(
         self,
         prefix_pad_masks,
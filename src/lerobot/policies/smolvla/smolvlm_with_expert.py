@@ -25,6 +25,30 @@ from transformers import (
 )
 
 
+def append_to_kv_cache(
+    layer_cache: dict[str, torch.Tensor], key_states: torch.Tensor, value_states: torch.Tensor
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """Returns the prefix keys and values of `layer_cache` followed by `key_states` and `value_states`.
+
+    Without gradients, they are written in buffers kept in `layer_cache` and allocated once for a given length,
+    so that the denoising steps reuse the same memory instead of concatenating the prefix cache again.
+    """
+    if torch.is_grad_enabled():
+        key_states = torch.cat([layer_cache["key_states"], key_states], dim=1)
+        value_states = torch.cat([layer_cache["value_states"], value_states], dim=1)
+        return key_states, value_states
+
+    prefix_len = layer_cache["key_states"].shape[1]
+    key_buffer = layer_cache.get("key_buffer")
+    if key_buffer is None or key_buffer.shape[1] != prefix_len + key_states.shape[1]:
+        layer_cache["key_buffer"] = torch.cat([layer_cache["key_states"], key_states], dim=1)
+        layer_cache["value_buffer"] = torch.cat([layer_cache["value_states"], value_states], dim=1)
+    else:
+        key_buffer[:, prefix_len:] = key_states
+        layer_cache["value_buffer"][:, prefix_len:] = value_states
+    return layer_cache["key_buffer"], layer_cache["value_buffer"]
+
+
 def apply_rope(x, positions, max_wavelength=10_000):
     """
     Applies RoPE positions [B, L] to x [B, L, H, D].
@@ -257,12 +281,9 @@ class SmolVLMWithExpertModel(nn.Module):
                     "value_states": value_states,
                 }
             else:
-                # TODO here, some optimization can be done - similar to a `StaticCache` we can declare the `max_len` before.
-                # so we create an empty cache, with just one cuda malloc, and if (in autoregressive case) we reach
-                # the max len, then we (for instance) double the cache size. This implementation already exists
-                # in `transformers`. (molbap)
-                key_states = torch.cat([past_key_values[layer_idx]["key_states"], key_states], dim=1)
-                value_states = torch.cat([past_key_values[layer_idx]["value_states"], value_states], dim=1)
+                key_states, value_states = append_to_kv_cache(
+                    past_key_values[layer_idx], key_states, value_states
+                )
 
         attention_interface = self.get_attention_interface()
 
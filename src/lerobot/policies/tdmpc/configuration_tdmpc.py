@@ -68,6 +68,8 @@ class TDMPCConfig(PreTrainedConfig):
         use_mpc: Whether to use model predictive control. The alternative is to just sample the policy model
             (π) for each step.
         cem_iterations: Number of iterations for the MPPI/CEM loop in MPC.
+        planning_time_budget: If set, maximum time in seconds to spend planning for one observation. The CEM
+            loop stops early (after at least one iteration) when another iteration would exceed it.
         max_std: Maximum standard deviation for actions sampled from the gaussian PDF in CEM.
         min_std: Minimum standard deviation for noise applied to actions sampled from the policy model (π).
             Doubles up as the minimum standard deviation for actions sampled from the gaussian PDF in CEM.
@@ -134,6 +136,7 @@ class TDMPCConfig(PreTrainedConfig):
     # Inference.
     use_mpc: bool = True
     cem_iterations: int = 6
+    planning_time_budget: float | None = None
     max_std: float = 2.0
     min_std: float = 0.05
     n_gaussian_samples: int = 512
@@ -167,6 +170,10 @@ class TDMPCConfig(PreTrainedConfig):
             raise ValueError(
                 f"The number of gaussian samples for CEM should be non-zero. Got `{self.n_gaussian_samples=}`"
             )
+        if self.planning_time_budget is not None and self.planning_time_budget <= 0:
+            raise ValueError(
+                f"`planning_time_budget` must be positive when set. Got `{self.planning_time_budget=}`"
+            )
         if self.normalization_mapping["ACTION"] is not NormalizationMode.MIN_MAX:
             raise ValueError(
                 "TD-MPC assumes the action space dimensions to all be in [-1, 1]. Therefore it is strongly "
@@ -23,6 +23,7 @@ The comments in this code may sometimes refer to these references:
 
 # ruff: noqa: N806
 
+import time
 from collections import deque
 from collections.abc import Callable
 from copy import deepcopy
@@ -173,55 +174,61 @@ class TDMPCPolicy(PreTrainedPolicy):
         Returns:
             (horizon, batch, action_dim,) tensor for the planned trajectory of actions.
         """
+        start_time = time.perf_counter()
         device = get_device_from_parameters(self)
 
         batch_size = z.shape[0]
-
-        # Sample Nπ trajectories from the policy.
-        pi_actions = torch.empty(
-            self.config.horizon,
-            self.config.n_pi_samples,
-            batch_size,
-            self.config.action_feature.shape[0],
-            device=device,
-        )
+        action_dim = self.config.action_feature.shape[0]
+        n_gaussian_samples = self.config.n_gaussian_samples
+
+        n_samples = n_gaussian_samples + self.config.n_pi_samples
+        # Buffers of the action trajectories evaluated every CEM iteration, of their returns over the horizon
+        # and of their final latent states: the gaussian samples, which are resampled in place every
+        # iteration, followed by the Nπ trajectories sampled from the policy, which are only rolled out once.
+        actions = torch.empty(self.config.horizon, n_samples, batch_size, action_dim, device=device)
+        returns = torch.empty(n_samples, batch_size, device=device)
+        final_z = torch.empty(n_samples, batch_size, z.shape[-1], device=device)
+        gaussian_actions = actions[:, :n_gaussian_samples]
         if self.config.n_pi_samples > 0:
-            _z = einops.repeat(z, "b d -> n b d", n=self.config.n_pi_samples)
+            pi_z = einops.repeat(z, "b d -> n b d", n=self.config.n_pi_samples)
+            _z = pi_z
             for t in range(self.config.horizon):
                 # Note: Adding a small amount of noise here doesn't hurt during inference and may even be
                 # helpful for CEM.
-                pi_actions[t] = self.model.pi(_z, self.config.min_std)
-                _z = self.model.latent_dynamics(_z, pi_actions[t])
+                actions[t, n_gaussian_samples:] = self.model.pi(_z, self.config.min_std)
+                _z = self.model.latent_dynamics(_z, actions[t, n_gaussian_samples:])
+            returns[n_gaussian_samples:], final_z[n_gaussian_samples:] = self._estimate_rollout_return(
+                pi_z, actions[:, n_gaussian_samples:]
+            )
 
-        # In the CEM loop we will need this for a call to estimate_value with the gaussian sampled
-        # trajectories.
-        z = einops.repeat(z, "b d -> n b d", n=self.config.n_gaussian_samples + self.config.n_pi_samples)
+        # In the CEM loop we will need this to roll out the gaussian sampled trajectories.
+        z = einops.repeat(z, "b d -> n b d", n=n_gaussian_samples)
 
         # Model Predictive Path Integral (MPPI) with the cross-entropy method (CEM) as the optimization
         # algorithm.
         # The initial mean and standard deviation for the cross-entropy method (CEM).
-        mean = torch.zeros(
-            self.config.horizon, batch_size, self.config.action_feature.shape[0], device=device
-        )
-        # Maybe warm start CEM with the mean from the previous step.
-        if self._prev_mean is not None:
-            mean[:-1] = self._prev_mean[1:]
+        mean = torch.zeros(self.config.horizon, batch_size, action_dim, device=device)
+        # Maybe warm start CEM with the mean from the previous plan, shifted by the number of actions of that
+        # plan which were executed since.
+        shift = self.config.n_action_steps
+        if (
+            self._prev_mean is not None
+            and self._prev_mean.shape == mean.shape
+            and shift < self.config.horizon
+        ):
+            mean[:-shift] = self._prev_mean[shift:]
         std = self.config.max_std * torch.ones_like(mean)
 
-        for _ in range(self.config.cem_iterations):
+        cem_start_time = time.perf_counter()
+        for i in range(self.config.cem_iterations):
             # Randomly sample action trajectories for the gaussian distribution.
-            std_normal_noise = torch.randn(
-                self.config.horizon,
-                self.config.n_gaussian_samples,
-                batch_size,
-                self.config.action_feature.shape[0],
-                device=std.device,
-            )
-            gaussian_actions = torch.clamp(mean.unsqueeze(1) + std.unsqueeze(1) * std_normal_noise, -1, 1)
+            gaussian_actions.normal_().mul_(std.unsqueeze(1)).add_(mean.unsqueeze(1)).clamp_(-1, 1)
 
             # Compute elite actions.
-            actions = torch.cat([gaussian_actions, pi_actions], dim=1)
-            value = self.estimate_value(z, actions).nan_to_num_(0)
+            returns[:n_gaussian_samples], final_z[:n_gaussian_samples] = self._estimate_rollout_return(
+                z, gaussian_actions
+            )
+            value = (returns + self._estimate_terminal_value(final_z, self.config.horizon)).nan_to_num_(0)
             elite_idxs = torch.topk(value, self.config.n_elites, dim=0).indices  # (n_elites, batch)
             elite_value = value.take_along_dim(elite_idxs, dim=0)  # (n_elites, batch)
             # (horizon, n_elites, batch, action_dim)
@@ -249,6 +256,15 @@ class TDMPCPolicy(PreTrainedPolicy):
             )
             std = _std.clamp_(self.config.min_std, self.config.max_std)
 
+            # Stop early if running another iteration would exceed the planning time budget.
+            if self.config.planning_time_budget is not None and i + 1 < self.config.cem_iterations:
+                if device.type == "cuda":
+                    torch.cuda.synchronize(device)
+                now = time.perf_counter()
+                iteration_time = (now - cem_start_time) / (i + 1)
+                if now - start_time + iteration_time > self.config.planning_time_budget:
+                    break
+
         # Keep track of the mean for warm-starting subsequent steps.
         self._prev_mean = mean
 
@@ -268,24 +284,38 @@ class TDMPCPolicy(PreTrainedPolicy):
         Returns:
             (batch,) tensor of values.
         """
-        # Initialize return and running discount factor.
-        G, running_discount = 0, 1
-        # Iterate over the actions in the trajectory to simulate the trajectory using the latent dynamics
-        # model. Keep track of return.
-        for t in range(actions.shape[0]):
-            # We will compute the reward in a moment. First compute the uncertainty regularizer from eqn 4
-            # of the FOWM paper.
-            if self.config.uncertainty_regularizer_coeff > 0:
-                regularization = -(
-                    self.config.uncertainty_regularizer_coeff * self.model.Qs(z, actions[t]).std(0)
-                )
-            else:
-                regularization = 0
-            # Estimate the next state (latent) and reward.
-            z, reward = self.model.latent_dynamics_and_reward(z, actions[t])
-            # Update the return and running discount.
-            G += running_discount * (reward + regularization)
-            running_discount *= self.config.discount
+        G, z = self._estimate_rollout_return(z, actions)
+        return G + self._estimate_terminal_value(z, actions.shape[0])
+
+    def _estimate_rollout_return(self, z: Tensor, actions: Tensor) -> tuple[Tensor, Tensor]:
+        """Estimates the (regularized) return of the steps of a trajectory, without its terminal value.
+
+        Only the latent dynamics are rolled out step by step. The rewards and the Q ensemble are then
+        evaluated for all the steps of the trajectory at once.
+
+        Returns:
+            A tuple containing:
+                - (batch,) tensor of returns.
+                - (batch, latent_dim) tensor of final latent states.
+        """
+        horizon = actions.shape[0]
+        # Simulate the trajectory using the latent dynamics model.
+        zs = z.new_empty(horizon + 1, *z.shape)
+        zs[0] = z
+        for t in range(horizon):
+            zs[t + 1] = self.model.latent_dynamics(zs[t], actions[t])
+        discounts = self.config.discount ** torch.arange(horizon, device=z.device, dtype=z.dtype)
+        discounts = discounts.view(-1, *([1] * (z.ndim - 1)))
+        G = (discounts * self.model.reward(zs[:-1], actions)).sum(0)
+        # Uncertainty regularizer from eqn 4 of the FOWM paper.
+        if self.config.uncertainty_regularizer_coeff > 0:
+            regularization = self.model.Qs(zs[:-1], actions).std(0)  # (horizon, batch)
+            G -= self.config.uncertainty_regularizer_coeff * (discounts * regularization).sum(0)
+        return G, zs[-1]
+
+    def _estimate_terminal_value(self, z: Tensor, horizon: int) -> Tensor:
+        """Estimates the discounted (regularized) value of the final latent states of trajectories."""
+        running_discount = self.config.discount**horizon
         # Add the estimated value of the final state (using the minimum for a conservative estimate).
         # Do so by predicting the next action, then taking a minimum over the ensemble of state-action value
         # estimators.
@@ -295,14 +325,14 @@ class TDMPCPolicy(PreTrainedPolicy):
         terminal_values = self.model.Qs(z, next_action)  # (ensemble, batch)
         # Randomly choose 2 of the Qs for terminal value estimation (as in App C. of the FOWM paper).
         if self.config.q_ensemble_size > 2:
-            G += (
+            G = (
                 running_discount
                 * torch.min(terminal_values[torch.randint(0, self.config.q_ensemble_size, size=(2,))], dim=0)[
                     0
                 ]
             )
         else:
-            G += running_discount * torch.min(terminal_values, dim=0)[0]
+            G = running_discount * torch.min(terminal_values, dim=0)[0]
         # Finally, also regularize the terminal value.
         if self.config.uncertainty_regularizer_coeff > 0:
             G -= running_discount * self.config.uncertainty_regularizer_coeff * terminal_values.std(0)
@@ -624,6 +654,18 @@ class TDMPCTOLD(nn.Module):
         x = torch.cat([z, a], dim=-1)
         return self._dynamics(x), self._reward(x).squeeze(-1)
 
+    def reward(self, z: Tensor, a: Tensor) -> Tensor:
+        """Predict the reward given a current latent and action.
+
+        Args:
+            z: (*, latent_dim) tensor for the current state's latent representation.
+            a: (*, action_dim) tensor for the action to be applied.
+        Returns:
+            (*,) tensor for the estimated reward.
+        """
+        x = torch.cat([z, a], dim=-1)
+        return self._reward(x).squeeze(-1)
+
     def latent_dynamics(self, z: Tensor, a: Tensor) -> Tensor:
         """Predict the next state's latent representation given a current latent and action.
 
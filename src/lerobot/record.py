@@ -149,6 +149,16 @@ class DatasetRecordConfig:
     # Number of episodes to record before batch encoding videos
     # Set to 1 for immediate encoding (default behavior), or higher for batched encoding
     video_encoding_batch_size: int = 1
+    # Number of processes encoding the videos of the different cameras and episodes in parallel. Set to 0 to
+    # encode in the main process. By default, one process per video to encode, up to the number of CPUs.
+    num_video_encoding_workers: int | None = None
+    # Encode the camera frames into videos while recording, in one background process per camera, instead of
+    # saving them as PNG images and encoding them after each episode. Saving an episode then only finalizes
+    # the videos. Ignores `video_encoding_batch_size`.
+    streaming_encoding: bool = False
+    # Save the episodes in a background thread, so that the next episode can be recorded right away. Episodes
+    # are journaled on disk until they are saved, and saved on `--resume` if the recording was interrupted.
+    async_episode_saving: bool = False
 
     def __post_init__(self):
         if self.single_task is None:
@@ -303,6 +313,7 @@ def record(cfg: RecordConfig) -> LeRobotDataset:
             cfg.dataset.repo_id,
             root=cfg.dataset.root,
             batch_encoding_size=cfg.dataset.video_encoding_batch_size,
+            video_encoding_workers=cfg.dataset.num_video_encoding_workers,
         )
 
         if hasattr(robot, "cameras") and len(robot.cameras) > 0:
@@ -310,7 +321,10 @@ def record(cfg: RecordConfig) -> LeRobotDataset:
                 num_processes=cfg.dataset.num_image_writer_processes,
                 num_threads=cfg.dataset.num_image_writer_threads_per_camera * len(robot.cameras),
             )
+        if cfg.dataset.streaming_encoding:
+            dataset.start_video_encoders()
         sanity_check_dataset_robot_compatibility(dataset, robot, cfg.dataset.fps, dataset_features)
+        dataset.save_journaled_episodes()
     else:
         # Create empty dataset or load existing saved episodes
         sanity_check_dataset_name(cfg.dataset.repo_id, cfg.policy)
@@ -324,8 +338,13 @@ def record(cfg: RecordConfig) -> LeRobotDataset:
             image_writer_processes=cfg.dataset.num_image_writer_processes,
             image_writer_threads=cfg.dataset.num_image_writer_threads_per_camera * len(robot.cameras),
             batch_encoding_size=cfg.dataset.video_encoding_batch_size,
+            video_encoding_workers=cfg.dataset.num_video_encoding_workers,
+            streaming_encoding=cfg.dataset.streaming_encoding,
         )
 
+    if cfg.dataset.async_episode_saving:
+        dataset.start_async_saving()
+
     # Load pretrained policy
     policy = None if cfg.policy is None else make_policy(cfg.policy, ds_meta=dataset.meta)
 
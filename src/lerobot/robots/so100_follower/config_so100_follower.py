@@ -40,6 +40,10 @@ class SO100FollowerConfig(RobotConfig):
     # Set to `True` for backward compatibility with previous policies/dataset
     use_degrees: bool = False
 
+    # Registers read along with "Present_Position" in `get_observation`, in the same bus transaction (e.g.
+    # ["Present_Velocity", "Present_Current"]). Their last values are kept in `SO100Follower.present_motor_data`.
+    observed_motor_data: list[str] = field(default_factory=list)
+
 
 @RobotConfig.register_subclass("so100_follower_end_effector")
 @dataclass
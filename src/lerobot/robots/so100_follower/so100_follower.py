@@ -59,6 +59,8 @@ class SO100Follower(Robot):
             calibration=self.calibration,
         )
         self.cameras = make_cameras_from_configs(config.cameras)
+        # Last values of the registers listed in `config.observed_motor_data`, per register and motor
+        self.present_motor_data: dict[str, dict[str, float]] = {}
 
     @property
     def _motors_ft(self) -> dict[str, type]:
@@ -167,13 +169,21 @@ class SO100Follower(Robot):
             self.bus.setup_motor(motor)
             print(f"'{motor}' motor id set to {self.bus.motors[motor].id}")
 
+    def _read_present_position(self) -> dict[str, float]:
+        if not self.config.observed_motor_data:
+            return self.bus.sync_read("Present_Position")
+
+        data_names = ["Present_Position", *self.config.observed_motor_data]
+        self.present_motor_data = self.bus.sync_read_multiple(data_names)
+        return self.present_motor_data["Present_Position"]
+
     def get_observation(self) -> dict[str, Any]:
         if not self.is_connected:
             raise DeviceNotConnectedError(f"{self} is not connected.")
 
         # Read arm position
         start = time.perf_counter()
-        obs_dict = self.bus.sync_read("Present_Position")
+        obs_dict = self._read_present_position()
         obs_dict = {f"{motor}.pos": val for motor, val in obs_dict.items()}
         dt_ms = (time.perf_counter() - start) * 1e3
         logger.debug(f"{self} read state: {dt_ms:.1f}ms")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Decode all the videos of a LeRobotDataset once into a store of uint8 memory-mapped arrays, so that training
+runs can serve camera frames without decoding videos (`--dataset.use_frame_cache=true` in `train.py`).
+
+The cache is written in the `frame_cache` directory at the root of the dataset. It is invalidated whenever
+`meta/info.json` or any of the video files changes, in which case it needs to be rebuilt.
+
+Usage:
+
+```bash
+python -m lerobot.scripts.build_frame_cache \
+    --repo-id lerobot/pusht \
+    --resize 96 96
+```
+"""
+
+import argparse
+import logging
+from pathlib import Path
+
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.utils.utils import init_logging
+
+
+def build_frame_cache(
+    repo_id: str,
+    root: Path | None = None,
+    episodes: list[int] | None = None,
+    resize: tuple[int, int] | None = None,
+) -> None:
+    dataset = LeRobotDataset(repo_id, root=root, episodes=episodes)
+    if len(dataset.meta.video_keys) == 0:
+        logging.warning(f"{repo_id} has no video keys, there is nothing to cache.")
+        return
+
+    dataset.build_frame_cache(resize=resize)
+    logging.info(f"Frame cache written to {dataset.root / 'frame_cache'}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--repo-id",
+        type=str,
+        required=True,
+        help="Name of hugging face repository containing a LeRobotDataset dataset (e.g. `lerobot/pusht`).",
+    )
+    parser.add_argument(
+        "--root",
+        type=Path,
+        default=None,
+        help="Root directory for the dataset stored locally (e.g. `--root data`). By default, the dataset will be loaded from hugging face cache folder, or downloaded from the hub if available.",
+    )
+    parser.add_argument(
+        "--episodes",
+        type=int,
+        nargs="*",
+        default=None,
+        help="Episode indices to cache. By default, all the episodes are cached.",
+    )
+    parser.add_argument(
+        "--resize",
+        type=int,
+        nargs=2,
+        default=None,
+        metavar=("HEIGHT", "WIDTH"),
+        help="Resolution to which frames are downscaled before being stored. By default, frames keep the resolution of the videos.",
+    )
+
+    args = parser.parse_args()
+    init_logging()
+    build_frame_cache(
+        repo_id=args.repo_id,
+        root=args.root,
+        episodes=args.episodes,
+        resize=tuple(args.resize) if args.resize is not None else None,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -66,8 +66,8 @@ from lerobot.robots import so100_follower  # noqa: F401
 from lerobot.scripts.rl.gym_manipulator import make_robot_env
 from lerobot.teleoperators import gamepad, so101_leader  # noqa: F401
 from lerobot.transport import services_pb2, services_pb2_grpc
+from lerobot.transport.parameter_sync import ParameterSyncDecoder, is_full_parameters_update
 from lerobot.transport.utils import (
-    bytes_to_state_dict,
     grpc_channel_options,
     python_object_to_bytes,
     receive_bytes_in_chunks,
@@ -75,12 +75,11 @@ from lerobot.transport.utils import (
     transitions_to_bytes,
 )
 from lerobot.utils.process import ProcessSignalHandler
-from lerobot.utils.queue import get_last_item_from_queue
+from lerobot.utils.queue import get_all_items_from_queue
 from lerobot.utils.random_utils import set_seed
 from lerobot.utils.robot_utils import busy_wait
 from lerobot.utils.transition import (
     Transition,
-    move_state_dict_to_device,
     move_transition_to_device,
 )
 from lerobot.utils.utils import (
@@ -239,7 +238,7 @@ def act_with_policy(
     online_env = make_robot_env(cfg=cfg.env)
 
     set_seed(cfg.seed)
-    device = get_safe_torch_device(cfg.policy.device, log=True)
+    get_safe_torch_device(cfg.policy.device, log=True)
 
     torch.backends.cudnn.benchmark = True
     torch.backends.cuda.matmul.allow_tf32 = True
@@ -267,6 +266,8 @@ def act_with_policy(
     episode_total_steps = 0
 
     policy_timer = TimerManager("Policy inference", log=False)
+    # Holds the version of the parameters received from the learner
+    sync_decoder = ParameterSyncDecoder()
 
     for interaction_step in range(cfg.policy.online_steps):
         start_time = time.perf_counter()
@@ -317,7 +318,9 @@ def act_with_policy(
         if done or truncated:
             logging.info(f"[ACTOR] Global step {interaction_step}: Episode reward: {sum_reward_episode}")
 
-            update_policy_parameters(policy=policy, parameters_queue=parameters_queue, device=device)
+            update_policy_parameters(
+                policy=policy, parameters_queue=parameters_queue, sync_decoder=sync_decoder
+            )
 
             if len(list_transition_to_send_to_learner) > 0:
                 push_transitions_to_transport_queue(
@@ -611,33 +614,26 @@ def interactions_stream(
 #################################################
 
 
-def update_policy_parameters(policy: SACPolicy, parameters_queue: Queue, device):
-    bytes_state_dict = get_last_item_from_queue(parameters_queue, block=False)
-    if bytes_state_dict is not None:
-        logging.info("[ACTOR] Load new parameters from Learner.")
-        state_dicts = bytes_to_state_dict(bytes_state_dict)
-
-        # TODO: check encoder parameter synchronization possible issues:
-        # 1. When shared_encoder=True, we're loading stale encoder params from actor's state_dict
-        #    instead of the updated encoder params from critic (which is optimized separately)
-        # 2. When freeze_vision_encoder=True, we waste bandwidth sending/loading frozen params
-        # 3. Need to handle encoder params correctly for both actor and discrete_critic
-        # Potential fixes:
-        # - Send critic's encoder state when shared_encoder=True
-        # - Skip encoder params entirely when freeze_vision_encoder=True
-        # - Ensure discrete_critic gets correct encoder state (currently uses encoder_critic)
-
-        # Load actor state dict
-        actor_state_dict = move_state_dict_to_device(state_dicts["policy"], device=device)
-        policy.actor.load_state_dict(actor_state_dict)
-
-        # Load discrete critic if present
-        if hasattr(policy, "discrete_critic") and "discrete_critic" in state_dicts:
-            discrete_critic_state_dict = move_state_dict_to_device(
-                state_dicts["discrete_critic"], device=device
-            )
-            policy.discrete_critic.load_state_dict(discrete_critic_state_dict)
-            logging.info("[ACTOR] Loaded discrete critic parameters from Learner.")
+def update_policy_parameters(policy: SACPolicy, parameters_queue: Queue, sync_decoder: ParameterSyncDecoder):
+    """Applies the parameters updates received from the learner since the last call, in order. Updates which
+    precede the last full snapshot are skipped."""
+    buffers = get_all_items_from_queue(parameters_queue)
+    if not buffers:
+        return
+
+    last_full = 0
+    for i, buffer in enumerate(buffers):
+        if is_full_parameters_update(buffer):
+            last_full = i
+    modules = {"policy": policy.actor}
+    if hasattr(policy, "discrete_critic") and policy.discrete_critic is not None:
+        modules["discrete_critic"] = policy.discrete_critic
+
+    # NOTE: frozen parameters (e.g. with freeze_vision_encoder=True) never change on the learner, so they are only
+    # sent with the full snapshots when `parameter_sync_mode` is not "full"
+    for buffer in buffers[last_full:]:
+        if sync_decoder.apply(buffer, modules):
+            logging.info(f"[ACTOR] Load new parameters from Learner (version {sync_decoder.version}).")
 
 
 #################################################
@@ -517,10 +517,13 @@ class AddCurrentToObservation(gym.ObservationWrapper):
         Returns:
             The modified observation with current values.
         """
-        present_current_dict = self.env.unwrapped.robot.bus.sync_read("Present_Current")
-        present_current_observation = np.array(
-            [present_current_dict[name] for name in self.env.unwrapped.robot.bus.motors]
-        )
+        robot = self.env.unwrapped.robot
+        # Robots reading the current along with the position (see `SO100FollowerConfig.observed_motor_data`)
+        # save a bus transaction
+        present_current_dict = getattr(robot, "present_motor_data", {}).get("Present_Current")
+        if present_current_dict is None:
+            present_current_dict = robot.bus.sync_read("Present_Current")
+        present_current_observation = np.array([present_current_dict[name] for name in robot.bus.motors])
         observation["agent_pos"] = np.concatenate(
             [observation["agent_pos"], present_current_observation], axis=-1
         )
@@ -1874,6 +1877,12 @@ def make_robot_env(cfg: EnvConfig) -> gym.Env:
 
     if cfg.robot is None:
         raise ValueError("RobotConfig (cfg.robot) must be provided for gym_manipulator environment.")
+
+    # Read the motor currents in the same bus transaction as the positions
+    observed_motor_data = getattr(cfg.robot, "observed_motor_data", None)
+    if cfg.wrapper and cfg.wrapper.add_current_to_observation and observed_motor_data is not None:
+        if "Present_Current" not in observed_motor_data:
+            observed_motor_data.append("Present_Current")
     robot = make_robot_from_config(cfg.robot)
     teleop_device = make_teleoperator_from_config(cfg.teleop)
     teleop_device.connect()
@@ -80,9 +80,8 @@ from lerobot.transport.utils import (
     MAX_MESSAGE_SIZE,
     bytes_to_python_object,
     bytes_to_transitions,
-    state_to_bytes,
 )
-from lerobot.utils.buffer import ReplayBuffer, concatenate_batch_transitions
+from lerobot.utils.buffer import REPLAY_BUFFER_HEADER, ReplayBuffer, concatenate_batch_transitions
 from lerobot.utils.process import ProcessSignalHandler
 from lerobot.utils.random_utils import set_seed
 from lerobot.utils.train_utils import (
@@ -91,7 +90,7 @@ from lerobot.utils.train_utils import (
     save_checkpoint,
     update_last_checkpoint,
 )
-from lerobot.utils.transition import move_state_dict_to_device, move_transition_to_device
+from lerobot.utils.transition import move_transition_to_device
 from lerobot.utils.utils import (
     format_big_number,
     get_safe_torch_device,
@@ -400,6 +399,7 @@ def add_actor_information_and_train(
         for _ in range(utd_ratio - 1):
             # Sample from the iterators
             batch = next(online_iterator)
+            online_batch_size = len(batch["action"])
 
             if dataset_repo_id is not None:
                 batch_offline = next(offline_iterator)
@@ -441,6 +441,13 @@ def add_actor_information_and_train(
                 parameters=policy.critic_ensemble.parameters(), max_norm=clip_grad_norm_value
             )
             optimizers["critic"].step()
+            update_replay_priorities(
+                batch=batch,
+                td_error=critic_output["td_error"],
+                replay_buffer=replay_buffer,
+                offline_replay_buffer=offline_replay_buffer,
+                online_batch_size=online_batch_size,
+            )
 
             # Discrete critic optimization (if available)
             if policy.config.num_discrete_actions is not None:
@@ -458,6 +465,7 @@ def add_actor_information_and_train(
 
         # Sample for the last update in the UTD ratio
         batch = next(online_iterator)
+        online_batch_size = len(batch["action"])
 
         if dataset_repo_id is not None:
             batch_offline = next(offline_iterator)
@@ -486,6 +494,7 @@ def add_actor_information_and_train(
             "done": done,
             "observation_feature": observation_features,
             "next_observation_feature": next_observation_features,
+            "complementary_info": batch["complementary_info"],
         }
 
         critic_output = policy.forward(forward_batch, model="critic")
@@ -497,6 +506,13 @@ def add_actor_information_and_train(
             parameters=policy.critic_ensemble.parameters(), max_norm=clip_grad_norm_value
         ).item()
         optimizers["critic"].step()
+        update_replay_priorities(
+            batch=batch,
+            td_error=critic_output["td_error"],
+            replay_buffer=replay_buffer,
+            offline_replay_buffer=offline_replay_buffer,
+            online_batch_size=online_batch_size,
+        )
 
         # Initialize training info dictionary
         training_infos = {
@@ -652,6 +668,9 @@ def start_learner(
         transition_queue=transition_queue,
         interaction_message_queue=interaction_message_queue,
         queue_get_timeout=cfg.policy.actor_learner_config.queue_get_timeout,
+        parameter_sync_mode=cfg.policy.actor_learner_config.parameter_sync_mode,
+        parameter_sync_dtype=cfg.policy.actor_learner_config.parameter_sync_dtype,
+        full_parameter_sync_frequency=cfg.policy.actor_learner_config.full_parameter_sync_frequency,
     )
 
     server = grpc.server(
@@ -741,6 +760,14 @@ def save_training_checkpoint(
     # Update the "last" symlink
     update_last_checkpoint(checkpoint_dir)
 
+    # Disk backed buffers only need to write the slots changed since the last checkpoint
+    if replay_buffer.storage_dir is not None:
+        replay_buffer.flush()
+        if offline_replay_buffer is not None:
+            offline_replay_buffer.flush()
+        logging.info("Resume training")
+        return
+
     # TODO : temporary save replay buffer here, remove later when on the robot
     # We want to control this with the keyboard inputs
     dataset_dir = os.path.join(cfg.output_dir, "dataset")
@@ -954,13 +981,20 @@ def initialize_replay_buffer(
     Returns:
         ReplayBuffer: Initialized replay buffer
     """
-    if not cfg.resume:
+    storage_dir = get_replay_buffer_storage_dir(cfg, "replay_buffer")
+    if not cfg.resume or storage_dir is not None:
+        # A disk backed buffer reattaches to the content it had at the last checkpoint
         return ReplayBuffer(
             capacity=cfg.policy.online_buffer_capacity,
             device=device,
             state_keys=cfg.policy.input_features.keys(),
             storage_device=storage_device,
             optimize_memory=True,
+            store_images_as_uint8=cfg.policy.store_images_as_uint8,
+            storage_dir=storage_dir,
+            prioritized=cfg.policy.prioritized_replay,
+            priority_alpha=cfg.policy.priority_alpha,
+            priority_beta=cfg.policy.priority_beta,
         )
 
     logging.info("Resume training load the online dataset")
@@ -980,6 +1014,10 @@ def initialize_replay_buffer(
         device=device,
         state_keys=cfg.policy.input_features.keys(),
         optimize_memory=True,
+        store_images_as_uint8=cfg.policy.store_images_as_uint8,
+        prioritized=cfg.policy.prioritized_replay,
+        priority_alpha=cfg.policy.priority_alpha,
+        priority_beta=cfg.policy.priority_beta,
     )
 
 
@@ -999,6 +1037,22 @@ def initialize_offline_replay_buffer(
     Returns:
         ReplayBuffer: Initialized offline replay buffer
     """
+    storage_dir = get_replay_buffer_storage_dir(cfg, "replay_buffer_offline")
+    if cfg.resume and storage_dir is not None:
+        logging.info("Reattach to the offline replay buffer")
+        return ReplayBuffer(
+            capacity=cfg.policy.offline_buffer_capacity,
+            device=device,
+            state_keys=cfg.policy.input_features.keys(),
+            storage_device=storage_device,
+            optimize_memory=True,
+            store_images_as_uint8=cfg.policy.store_images_as_uint8,
+            storage_dir=storage_dir,
+            prioritized=cfg.policy.prioritized_replay,
+            priority_alpha=cfg.policy.priority_alpha,
+            priority_beta=cfg.policy.priority_beta,
+        )
+
     if not cfg.resume:
         logging.info("make_dataset offline buffer")
         offline_dataset = make_dataset(cfg)
@@ -1017,11 +1071,69 @@ def initialize_offline_replay_buffer(
         state_keys=cfg.policy.input_features.keys(),
         storage_device=storage_device,
         optimize_memory=True,
+        store_images_as_uint8=cfg.policy.store_images_as_uint8,
+        storage_dir=storage_dir,
+        prioritized=cfg.policy.prioritized_replay,
+        priority_alpha=cfg.policy.priority_alpha,
+        priority_beta=cfg.policy.priority_beta,
         capacity=cfg.policy.offline_buffer_capacity,
     )
     return offline_replay_buffer
 
 
+def update_replay_priorities(
+    batch: dict,
+    td_error: torch.Tensor,
+    replay_buffer: ReplayBuffer,
+    offline_replay_buffer: ReplayBuffer | None,
+    online_batch_size: int,
+) -> None:
+    """
+    Update the priorities of the sampled transitions from the critic TD error, for prioritized replay buffers.
+
+    Args:
+        batch: Sampled batch, with the transitions of the online buffer first, followed by the offline ones
+        td_error: TD error of each transition of the batch
+        replay_buffer: Online replay buffer
+        offline_replay_buffer: Optional offline replay buffer
+        online_batch_size: Number of transitions sampled from the online buffer
+    """
+    if not replay_buffer.prioritized:
+        return
+
+    replay_indices = batch["complementary_info"]["replay_indices"]
+    replay_buffer.update_priorities(replay_indices[:online_batch_size], td_error[:online_batch_size])
+    if offline_replay_buffer is not None and len(replay_indices) > online_batch_size:
+        offline_replay_buffer.update_priorities(
+            replay_indices[online_batch_size:], td_error[online_batch_size:]
+        )
+
+
+def get_replay_buffer_storage_dir(cfg: TrainRLServerPipelineConfig, name: str) -> Path | None:
+    """
+    Get the directory of a disk backed replay buffer, if `disk_backed_buffers` is enabled.
+
+    When starting a new training, the content left by a previous run is removed. When resuming, the directory
+    is only returned if a buffer was flushed in it, otherwise the buffer is rebuilt from its saved dataset.
+
+    Args:
+        cfg (TrainRLServerPipelineConfig): Training configuration
+        name (str): Name of the buffer directory in the output directory
+
+    Returns:
+        Path | None: The storage directory, or None if the buffer isn't disk backed
+    """
+    if not cfg.policy.disk_backed_buffers:
+        return None
+
+    storage_dir = Path(cfg.output_dir) / name
+    if not cfg.resume:
+        shutil.rmtree(storage_dir, ignore_errors=True)
+    elif not (storage_dir / REPLAY_BUFFER_HEADER).is_file():
+        return None
+    return storage_dir
+
+
 #################################################
 # Utilities/Helpers functions #
 #################################################
@@ -1109,18 +1221,22 @@ def check_nan_in_transition(
 def push_actor_policy_to_queue(parameters_queue: Queue, policy: nn.Module):
     logging.debug("[LEARNER] Pushing actor policy to the queue")
 
-    # Create a dictionary to hold all the state dicts
-    state_dicts = {"policy": move_state_dict_to_device(policy.actor.state_dict(), device="cpu")}
+    # Create a dictionary to hold all the state dicts. The tensors are copied, as they are streamed to the actor
+    # by the learner service while the policy keeps training.
+    state_dicts = {"policy": clone_state_dict_to_cpu(policy.actor.state_dict())}
 
     # Add discrete critic if it exists
     if hasattr(policy, "discrete_critic") and policy.discrete_critic is not None:
-        state_dicts["discrete_critic"] = move_state_dict_to_device(
-            policy.discrete_critic.state_dict(), device="cpu"
-        )
+        state_dicts["discrete_critic"] = clone_state_dict_to_cpu(policy.discrete_critic.state_dict())
         logging.debug("[LEARNER] Including discrete critic in state dict push")
 
-    state_bytes = state_to_bytes(state_dicts)
-    parameters_queue.put(state_bytes)
+    # The learner service streams the tensors as a tensor frame (see `send_tensors_in_chunks`), without
+    # serializing them in memory first, and only sends the changes if `parameter_sync_mode` says so
+    parameters_queue.put(state_dicts)
+
+
+def clone_state_dict_to_cpu(state_dict: dict[str, torch.Tensor]) -> dict[str, torch.Tensor]:
+    return {key: tensor.detach().to("cpu", copy=True) for key, tensor in state_dict.items()}
 
 
 def process_interaction_message(
@@ -1160,6 +1276,7 @@ def process_transitions(
         transition_list = transition_queue.get()
         transition_list = bytes_to_transitions(buffer=transition_list)
 
+        valid_transitions = []
         for transition in transition_list:
             transition = move_transition_to_device(transition=transition, device=device)
 
@@ -1172,13 +1289,20 @@ def process_transitions(
                 logging.warning("[LEARNER] NaN detected in transition, skipping")
                 continue
 
-            replay_buffer.add(**transition)
+            valid_transitions.append(transition)
 
-            # Add to offline buffer if it's an intervention
-            if dataset_repo_id is not None and transition.get("complementary_info", {}).get(
-                "is_intervention"
-            ):
-                offline_replay_buffer.add(**transition)
+        # Each message is written to the buffers at once
+        replay_buffer.add_batch(valid_transitions)
+
+        # Add to offline buffer if it's an intervention
+        if dataset_repo_id is not None:
+            offline_replay_buffer.add_batch(
+                [
+                    transition
+                    for transition in valid_transitions
+                    if (transition.get("complementary_info") or {}).get("is_intervention")
+                ]
+            )
 
 
 def process_interaction_messages(
@@ -20,7 +20,12 @@ import time
 from multiprocessing import Event, Queue
 
 from lerobot.transport import services_pb2, services_pb2_grpc
-from lerobot.transport.utils import receive_bytes_in_chunks, send_bytes_in_chunks
+from lerobot.transport.parameter_sync import ParameterSyncEncoder
+from lerobot.transport.utils import (
+    receive_bytes_in_chunks,
+    send_bytes_in_chunks,
+    send_tensors_in_chunks,
+)
 from lerobot.utils.queue import get_last_item_from_queue
 
 MAX_WORKERS = 3  # Stream parameters, send transitions and interactions
@@ -42,6 +47,9 @@ class LearnerService(services_pb2_grpc.LearnerServiceServicer):
         transition_queue: Queue,
         interaction_message_queue: Queue,
         queue_get_timeout: float = 0.001,
+        parameter_sync_mode: str = "full",
+        parameter_sync_dtype: str | None = None,
+        full_parameter_sync_frequency: int = 20,
     ):
         self.shutdown_event = shutdown_event
         self.parameters_queue = parameters_queue
@@ -49,12 +57,19 @@ class LearnerService(services_pb2_grpc.LearnerServiceServicer):
         self.transition_queue = transition_queue
         self.interaction_message_queue = interaction_message_queue
         self.queue_get_timeout = queue_get_timeout
+        self.parameter_sync_mode = parameter_sync_mode
+        self.parameter_sync_dtype = parameter_sync_dtype
+        self.full_parameter_sync_frequency = full_parameter_sync_frequency
 
     def StreamParameters(self, request, context):  # noqa: N802
         # TODO: authorize the request
         logging.info("[LEARNER] Received request to stream parameters from the Actor")
 
         last_push_time = 0
+        # Each stream starts with a full snapshot, the following pushes are based on what was sent on it
+        sync_encoder = ParameterSyncEncoder(
+            self.parameter_sync_mode, self.parameter_sync_dtype, self.full_parameter_sync_frequency
+        )
 
         while not self.shutdown_event.is_set():
             time_since_last_push = time.time() - last_push_time
@@ -72,12 +87,27 @@ class LearnerService(services_pb2_grpc.LearnerServiceServicer):
             if buffer is None:
                 continue
 
-            yield from send_bytes_in_chunks(
-                buffer,
-                services_pb2.Parameters,
-                log_prefix="[LEARNER] Sending parameters",
-                silent=True,
-            )
+            if isinstance(buffer, dict):
+                # State dicts are streamed straight from their tensors
+                tensors, meta = sync_encoder.encode(buffer)
+                logging.debug(
+                    f"[LEARNER] Parameters version {meta['version']} (full: {meta['full']}): "
+                    f"sending {len(tensors)} tensors"
+                )
+                yield from send_tensors_in_chunks(
+                    tensors,
+                    services_pb2.Parameters,
+                    meta,
+                    log_prefix="[LEARNER] Sending parameters",
+                    silent=True,
+                )
+            else:
+                yield from send_bytes_in_chunks(
+                    buffer,
+                    services_pb2.Parameters,
+                    log_prefix="[LEARNER] Sending parameters",
+                    silent=True,
+                )
 
             last_push_time = time.time()
             logging.info("[LEARNER] Parameters sent")
@@ -19,9 +19,11 @@ import torch
 
 from lerobot.robots.config import RobotConfig
 from lerobot.scripts.server.constants import (
+    DEFAULT_BATCH_WINDOW_S,
     DEFAULT_FPS,
     DEFAULT_INFERENCE_LATENCY,
     DEFAULT_OBS_QUEUE_TIMEOUT,
+    SUPPORTED_IMAGE_ENCODINGS,
 )
 
 # Aggregate function registry for CLI usage
@@ -63,6 +65,21 @@ class PolicyServerConfig:
         default=DEFAULT_OBS_QUEUE_TIMEOUT, metadata={"help": "Timeout for observation queue in seconds"}
     )
 
+    # Multi-client configuration
+    max_clients: int = field(
+        default=1,
+        metadata={
+            "help": "Maximum number of robot clients served at once. Above 1, the clients share the policy and "
+            "their observations are run through it in batches"
+        },
+    )
+    batch_window_s: float = field(
+        default=DEFAULT_BATCH_WINDOW_S,
+        metadata={
+            "help": "Time to wait for the observations of other clients before running a batch, in seconds"
+        },
+    )
+
     def __post_init__(self):
         """Validate configuration after initialization."""
         if self.port < 1 or self.port > 65535:
@@ -77,6 +94,12 @@ class PolicyServerConfig:
         if self.obs_queue_timeout < 0:
             raise ValueError(f"obs_queue_timeout must be non-negative, got {self.obs_queue_timeout}")
 
+        if self.max_clients < 1:
+            raise ValueError(f"max_clients must be positive, got {self.max_clients}")
+
+        if self.batch_window_s < 0:
+            raise ValueError(f"batch_window_s must be non-negative, got {self.batch_window_s}")
+
     @classmethod
     def from_dict(cls, config_dict: dict) -> "PolicyServerConfig":
         """Create a PolicyServerConfig from a dictionary."""
@@ -95,6 +118,8 @@ class PolicyServerConfig:
             "fps": self.fps,
             "environment_dt": self.environment_dt,
             "inference_latency": self.inference_latency,
+            "max_clients": self.max_clients,
+            "batch_window_s": self.batch_window_s,
         }
 
 
@@ -122,6 +147,10 @@ class RobotClientConfig:
 
     # Network configuration
     server_address: str = field(default="localhost:8080", metadata={"help": "Server address to connect to"})
+    session_id: str = field(
+        default="",
+        metadata={"help": "ID identifying the client on a server shared by several robots (random if empty)"},
+    )
 
     # Device configuration
     policy_device: str = field(default="cpu", metadata={"help": "Device for policy inference"})
@@ -141,6 +170,14 @@ class RobotClientConfig:
         default=False, metadata={"help": "Visualize the action queue size"}
     )
 
+    # Serialization configuration
+    image_encoding: str | None = field(
+        default=None,
+        metadata={
+            "help": "Compression of the camera frames sent to the server ('jpeg', 'png' or None for raw)"
+        },
+    )
+
     # Verification configuration
     verify_robot_cameras: bool = field(
         default=True, metadata={"help": "Verify that the robot cameras match the policy cameras"}
@@ -174,6 +211,11 @@ class RobotClientConfig:
         if self.actions_per_chunk <= 0:
             raise ValueError(f"actions_per_chunk must be positive, got {self.actions_per_chunk}")
 
+        if self.image_encoding not in SUPPORTED_IMAGE_ENCODINGS:
+            raise ValueError(
+                f"image_encoding must be one of {SUPPORTED_IMAGE_ENCODINGS}, got {self.image_encoding}"
+            )
+
         self.aggregate_fn = get_aggregate_function(self.aggregate_fn_name)
 
     @classmethod
@@ -185,6 +227,7 @@ class RobotClientConfig:
         """Convert the configuration to a dictionary."""
         return {
             "server_address": self.server_address,
+            "session_id": self.session_id,
             "policy_type": self.policy_type,
             "pretrained_name_or_path": self.pretrained_name_or_path,
             "policy_device": self.policy_device,
@@ -194,4 +237,5 @@ class RobotClientConfig:
             "task": self.task,
             "debug_visualize_queue_size": self.debug_visualize_queue_size,
             "aggregate_fn_name": self.aggregate_fn_name,
+            "image_encoding": self.image_encoding,
         }
@@ -22,8 +22,24 @@ DEFAULT_INFERENCE_LATENCY = 1 / DEFAULT_FPS
 """Server side: Timeout for observation queue in seconds"""
 DEFAULT_OBS_QUEUE_TIMEOUT = 2
 
+"""Server side: Time to wait for the observations of other clients before running a batch, in seconds"""
+DEFAULT_BATCH_WINDOW_S = 0.005
+
 # All action chunking policies
 SUPPORTED_POLICIES = ["act", "smolvla", "diffusion", "pi0", "tdmpc", "vqbet"]
 
+# Policies whose `predict_action_chunk` only depends on the observations passed, and can therefore run the
+# observations of several clients as a single batch
+BATCHABLE_POLICIES = ["act", "smolvla"]
+
+# Key of the gRPC metadata identifying the session of a robot client
+SESSION_ID_METADATA_KEY = "session_id"
+
+# Serializations of observations and actions: "tensors" frames (see `lerobot.transport.utils.tensors_to_bytes`)
+# or "pickle", for compatibility with older clients
+SUPPORTED_WIRE_FORMATS = ["tensors", "pickle"]
+
+SUPPORTED_IMAGE_ENCODINGS = [None, "jpeg", "png"]
+
 # TODO: Add all other robots
 SUPPORTED_ROBOTS = ["so100_follower", "so101_follower"]
@@ -16,12 +16,14 @@ import io
 import logging
 import logging.handlers
 import os
+import pickle  # nosec
 import time
 from dataclasses import dataclass
 from pathlib import Path
 from threading import Event
 from typing import Any
 
+import numpy as np
 import torch
 
 from lerobot.configs.types import PolicyFeature
@@ -32,7 +34,7 @@ from lerobot.datasets.utils import build_dataset_frame, hw_to_dataset_features
 from lerobot.policies import ACTConfig, DiffusionConfig, PI0Config, SmolVLAConfig, VQBeTConfig  # noqa: F401
 from lerobot.robots.robot import Robot
 from lerobot.transport import async_inference_pb2
-from lerobot.transport.utils import bytes_buffer_size
+from lerobot.transport.utils import bytes_buffer_size, bytes_to_tensors, is_tensor_frame, tensors_to_bytes
 from lerobot.utils.utils import init_logging
 
 Action = torch.Tensor
@@ -113,6 +115,20 @@ def raw_observation_to_observation(
     return observation
 
 
+def batch_observations(observations: list[Observation]) -> Observation:
+    """Concatenate observations prepared by `raw_observation_to_observation` (with a batch dimension of 1) into a
+    single batch. Non-tensor values, such as tasks, are gathered in lists."""
+    if len(observations) == 1:
+        return observations[0]
+
+    return {
+        key: torch.cat([obs[key] for obs in observations])
+        if isinstance(value, torch.Tensor)
+        else [obs[key] for obs in observations]
+        for key, value in observations[0].items()
+    }
+
+
 def prepare_image(image: torch.Tensor) -> torch.Tensor:
     """Minimal preprocessing to turn int8 images to float32 in [0, 1], and create a memory-contiguous tensor"""
     image = image.type(torch.float32) / 255
@@ -278,6 +294,68 @@ class RemotePolicyConfig:
     lerobot_features: dict[str, PolicyFeature]
     actions_per_chunk: int
     device: str = "cpu"
+    # Serialization of the observations and actions, see `SUPPORTED_WIRE_FORMATS`
+    wire_format: str = "tensors"
+    # Compression of the camera frames of the observations ("jpeg", "png" or None to send them raw)
+    image_encoding: str | None = None
+
+
+def timed_observation_to_bytes(obs: TimedObservation, image_encoding: str | None = None) -> bytes:
+    """Serializes a timed observation as a tensor frame (see `tensors_to_bytes`). Arrays, such as camera
+    frames, are sent as raw buffers, and the other values of the observation (joint positions, task) in the
+    header of the frame."""
+    tensors, values = {}, {}
+    for key, value in obs.get_observation().items():
+        if isinstance(value, np.ndarray | torch.Tensor):
+            tensors[key] = value
+        elif isinstance(value, np.generic):
+            values[key] = value.item()
+        else:
+            values[key] = value
+
+    meta = {"timestamp": obs.timestamp, "timestep": obs.timestep, "must_go": obs.must_go, "values": values}
+    return tensors_to_bytes(tensors, meta, image_encoding=image_encoding)
+
+
+def bytes_to_timed_observation(buffer: bytes) -> TimedObservation:
+    """Deserializes a timed observation sent by `timed_observation_to_bytes`, or pickled by older clients."""
+    if not is_tensor_frame(buffer):
+        return pickle.loads(buffer)  # nosec
+
+    tensors, meta = bytes_to_tensors(buffer)
+    return TimedObservation(
+        timestamp=meta["timestamp"],
+        timestep=meta["timestep"],
+        observation={**meta["values"], **tensors},
+        must_go=meta["must_go"],
+    )
+
+
+def timed_actions_to_bytes(timed_actions: list[TimedAction], wire_format: str = "tensors") -> bytes:
+    """Serializes an action chunk, stacking its actions in a single tensor frame."""
+    if wire_format == "pickle":
+        return pickle.dumps(timed_actions)  # nosec
+
+    actions = [timed_action.get_action() for timed_action in timed_actions]
+    meta = {
+        "timestamps": [timed_action.get_timestamp() for timed_action in timed_actions],
+        "timesteps": [timed_action.get_timestep() for timed_action in timed_actions],
+    }
+    return tensors_to_bytes({"actions": torch.stack(actions) if actions else torch.empty(0)}, meta)
+
+
+def bytes_to_timed_actions(buffer: bytes) -> list[TimedAction]:
+    """Deserializes an action chunk sent by `timed_actions_to_bytes`, in either wire format."""
+    if not is_tensor_frame(buffer):
+        return pickle.loads(buffer)  # nosec
+
+    tensors, meta = bytes_to_tensors(buffer)
+    # Copies the (small) actions, as tensors can't share the read-only memory of the buffer
+    actions = torch.tensor(tensors["actions"])
+    return [
+        TimedAction(timestamp=timestamp, timestep=timestep, action=action)
+        for timestamp, timestep, action in zip(meta["timestamps"], meta["timesteps"], actions, strict=True)
+    ]
 
 
 def _compare_observation_states(obs1_state: torch.Tensor, obs2_state: torch.Tensor, atol: float) -> bool:
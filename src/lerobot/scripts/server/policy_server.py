@@ -22,14 +22,24 @@ python src/lerobot/scripts/server/policy_server.py \
      --inference_latency=0.033 \
      --obs_queue_timeout=1
 ```
+
+Serving a fleet of robots with a single policy, batching their observations:
+```shell
+python src/lerobot/scripts/server/policy_server.py \
+     --host=127.0.0.1 \
+     --port=8080 \
+     --max_clients=4 \
+     --batch_window_s=0.005
+```
 """
 
+import contextlib
 import logging
 import pickle  # nosec
 import threading
 import time
 from concurrent import futures
-from dataclasses import asdict
+from dataclasses import asdict, dataclass, field
 from pprint import pformat
 from queue import Empty, Queue
 
@@ -39,17 +49,26 @@ import torch
 
 from lerobot.policies.factory import get_policy_class
 from lerobot.scripts.server.configs import PolicyServerConfig
-from lerobot.scripts.server.constants import SUPPORTED_POLICIES
+from lerobot.scripts.server.constants import (
+    BATCHABLE_POLICIES,
+    SESSION_ID_METADATA_KEY,
+    SUPPORTED_IMAGE_ENCODINGS,
+    SUPPORTED_POLICIES,
+    SUPPORTED_WIRE_FORMATS,
+)
 from lerobot.scripts.server.helpers import (
     FPSTracker,
     Observation,
     RemotePolicyConfig,
     TimedAction,
     TimedObservation,
+    batch_observations,
+    bytes_to_timed_observation,
     get_logger,
     observations_similar,
     raw_observation_to_observation,
     receive_bytes_in_chunks,
+    timed_actions_to_bytes,
 )
 from lerobot.transport import (
     async_inference_pb2,  # type: ignore
@@ -81,6 +100,8 @@ class PolicyServer(async_inference_pb2_grpc.AsyncInferenceServicer):
         self.lerobot_features = None
         self.actions_per_chunk = None
         self.policy = None
+        # Negotiated with the client in SendPolicyInstructions. Observations are decoded in either format.
+        self.wire_format = "tensors"
 
     @property
     def running(self):
@@ -114,40 +135,15 @@ class PolicyServer(async_inference_pb2_grpc.AsyncInferenceServicer):
             self.logger.warning("Server is not running. Ignoring policy instructions.")
             return async_inference_pb2.Empty()
 
-        client_id = context.peer()
-
-        policy_specs = pickle.loads(request.data)  # nosec
-
-        if not isinstance(policy_specs, RemotePolicyConfig):
-            raise TypeError(f"Policy specs must be a RemotePolicyConfig. Got {type(policy_specs)}")
-
-        if policy_specs.policy_type not in SUPPORTED_POLICIES:
-            raise ValueError(
-                f"Policy type {policy_specs.policy_type} not supported. "
-                f"Supported policies: {SUPPORTED_POLICIES}"
-            )
-
-        self.logger.info(
-            f"Receiving policy instructions from {client_id} | "
-            f"Policy type: {policy_specs.policy_type} | "
-            f"Pretrained name or path: {policy_specs.pretrained_name_or_path} | "
-            f"Actions per chunk: {policy_specs.actions_per_chunk} | "
-            f"Device: {policy_specs.device}"
-        )
+        policy_specs, wire_format = self._parse_policy_specs(request, context)
 
         self.device = policy_specs.device
         self.policy_type = policy_specs.policy_type  # act, pi0, etc.
         self.lerobot_features = policy_specs.lerobot_features
         self.actions_per_chunk = policy_specs.actions_per_chunk
+        self.wire_format = wire_format
 
-        policy_class = get_policy_class(self.policy_type)
-
-        start = time.perf_counter()
-        self.policy = policy_class.from_pretrained(policy_specs.pretrained_name_or_path)
-        self.policy.to(self.device)
-        end = time.perf_counter()
-
-        self.logger.info(f"Time taken to put policy on {self.device}: {end - start:.4f} seconds")
+        self._load_policy(policy_specs.pretrained_name_or_path)
 
         return async_inference_pb2.Empty()
 
@@ -156,34 +152,8 @@ class PolicyServer(async_inference_pb2_grpc.AsyncInferenceServicer):
         client_id = context.peer()
         self.logger.debug(f"Receiving observations from {client_id}")
 
-        receive_time = time.time()  # comparing timestamps so need time.time()
-        start_deserialize = time.perf_counter()
-        received_bytes = receive_bytes_in_chunks(
-            request_iterator, self._running_event, self.logger
-        )  # blocking call while looping over request_iterator
-        timed_observation = pickle.loads(received_bytes)  # nosec
-        deserialize_time = time.perf_counter() - start_deserialize
-
-        self.logger.debug(f"Received observation #{timed_observation.get_timestep()}")
-
+        timed_observation = self._receive_observation(request_iterator, self.fps_tracker)
         obs_timestep = timed_observation.get_timestep()
-        obs_timestamp = timed_observation.get_timestamp()
-
-        # Calculate FPS metrics
-        fps_metrics = self.fps_tracker.calculate_fps_metrics(obs_timestamp)
-
-        self.logger.info(
-            f"Received observation #{obs_timestep} | "
-            f"Avg FPS: {fps_metrics['avg_fps']:.2f} | "  # fps at which observations are received from client
-            f"Target: {fps_metrics['target_fps']:.2f} | "
-            f"One-way latency: {(receive_time - obs_timestamp) * 1000:.2f}ms"
-        )
-
-        self.logger.debug(
-            f"Server timestamp: {receive_time:.6f} | "
-            f"Client timestamp: {obs_timestamp:.6f} | "
-            f"Deserialization time: {deserialize_time:.6f}s"
-        )
 
         if not self._enqueue_observation(
             timed_observation  # wrapping a RawObservation
@@ -214,7 +184,7 @@ class PolicyServer(async_inference_pb2_grpc.AsyncInferenceServicer):
             inference_time = time.perf_counter() - start_time
 
             start_time = time.perf_counter()
-            actions_bytes = pickle.dumps(action_chunk)  # nosec
+            actions_bytes = timed_actions_to_bytes(action_chunk, self.wire_format)
             serialize_time = time.perf_counter() - start_time
 
             # Create and return the action chunk
@@ -246,6 +216,90 @@ class PolicyServer(async_inference_pb2_grpc.AsyncInferenceServicer):
 
             return async_inference_pb2.Empty()
 
+    def _parse_policy_specs(self, request, context) -> tuple[RemotePolicyConfig, str]:
+        """Validate the policy instructions sent by a client, and return them with the negotiated wire format"""
+        client_id = context.peer()
+
+        policy_specs = pickle.loads(request.data)  # nosec
+
+        if not isinstance(policy_specs, RemotePolicyConfig):
+            raise TypeError(f"Policy specs must be a RemotePolicyConfig. Got {type(policy_specs)}")
+
+        if policy_specs.policy_type not in SUPPORTED_POLICIES:
+            raise ValueError(
+                f"Policy type {policy_specs.policy_type} not supported. "
+                f"Supported policies: {SUPPORTED_POLICIES}"
+            )
+
+        # Clients predating the negotiation of the wire format only understand pickled actions. Their specs
+        # are unpickled without the new fields, which would otherwise fall back to the defaults of the class.
+        wire_format = vars(policy_specs).get("wire_format", "pickle")
+        if wire_format not in SUPPORTED_WIRE_FORMATS:
+            raise ValueError(
+                f"Wire format {wire_format} not supported. Supported wire formats: {SUPPORTED_WIRE_FORMATS}"
+            )
+        image_encoding = vars(policy_specs).get("image_encoding")
+        if image_encoding not in SUPPORTED_IMAGE_ENCODINGS:
+            raise ValueError(
+                f"Image encoding {image_encoding} not supported. "
+                f"Supported image encodings: {SUPPORTED_IMAGE_ENCODINGS}"
+            )
+
+        self.logger.info(
+            f"Receiving policy instructions from {client_id} | "
+            f"Policy type: {policy_specs.policy_type} | "
+            f"Pretrained name or path: {policy_specs.pretrained_name_or_path} | "
+            f"Actions per chunk: {policy_specs.actions_per_chunk} | "
+            f"Device: {policy_specs.device} | "
+            f"Wire format: {wire_format} | "
+            f"Image encoding: {image_encoding}"
+        )
+
+        return policy_specs, wire_format
+
+    def _load_policy(self, pretrained_name_or_path: str) -> None:
+        policy_class = get_policy_class(self.policy_type)
+
+        start = time.perf_counter()
+        self.policy = policy_class.from_pretrained(pretrained_name_or_path)
+        self.policy.to(self.device)
+        end = time.perf_counter()
+
+        self.logger.info(f"Time taken to put policy on {self.device}: {end - start:.4f} seconds")
+
+    def _receive_observation(self, request_iterator, fps_tracker: FPSTracker) -> TimedObservation:
+        """Receive an observation streamed by a client, logging its one-way latency"""
+        receive_time = time.time()  # comparing timestamps so need time.time()
+        start_deserialize = time.perf_counter()
+        received_bytes = receive_bytes_in_chunks(
+            request_iterator, self._running_event, self.logger
+        )  # blocking call while looping over request_iterator
+        timed_observation = bytes_to_timed_observation(received_bytes)
+        deserialize_time = time.perf_counter() - start_deserialize
+
+        self.logger.debug(f"Received observation #{timed_observation.get_timestep()}")
+
+        obs_timestep = timed_observation.get_timestep()
+        obs_timestamp = timed_observation.get_timestamp()
+
+        # Calculate FPS metrics
+        fps_metrics = fps_tracker.calculate_fps_metrics(obs_timestamp)
+
+        self.logger.info(
+            f"Received observation #{obs_timestep} | "
+            f"Avg FPS: {fps_metrics['avg_fps']:.2f} | "  # fps at which observations are received from client
+            f"Target: {fps_metrics['target_fps']:.2f} | "
+            f"One-way latency: {(receive_time - obs_timestamp) * 1000:.2f}ms"
+        )
+
+        self.logger.debug(
+            f"Server timestamp: {receive_time:.6f} | "
+            f"Client timestamp: {obs_timestamp:.6f} | "
+            f"Deserialization time: {deserialize_time:.6f}s"
+        )
+
+        return timed_observation
+
     def _obs_sanity_checks(self, obs: TimedObservation, previous_obs: TimedObservation) -> bool:
         """Check if the observation is valid to be processed by the policy"""
         with self._predicted_timesteps_lock:
@@ -374,6 +428,267 @@ class PolicyServer(async_inference_pb2_grpc.AsyncInferenceServicer):
         self.logger.info("Server stopping...")
 
 
+def get_session_id(context) -> str:
+    """Session ID sent by a client in the metadata of its calls, or its address for clients which don't send one"""
+    for key, value in context.invocation_metadata():
+        if key == SESSION_ID_METADATA_KEY:
+            return value
+    return context.peer()
+
+
+@dataclass
+class ClientSession:
+    """State of a robot client connected to a `BatchedPolicyServer`"""
+
+    session_id: str
+    fps_tracker: FPSTracker
+    observation_queue: Queue = field(default_factory=lambda: Queue(maxsize=1))
+    predicted_timesteps: set[int] = field(default_factory=set)
+    last_processed_obs: TimedObservation | None = None
+    last_active: float = field(default_factory=time.perf_counter)
+    # Set by SendPolicyInstructions
+    lerobot_features: dict[str, dict] | None = None
+    actions_per_chunk: int | None = None
+    wire_format: str = "tensors"
+
+
+class BatchedPolicyServer(PolicyServer):
+    """
+    Policy server shared by up to `config.max_clients` robot clients, each identified by the session ID it sends
+    in the metadata of its calls. All the clients must use the same policy.
+
+    The latest observation of each client is handed to a scheduler thread, which waits up to
+    `config.batch_window_s` for the observations of the other clients, runs them through the policy as a single
+    batch and scatters the action chunks back to the clients.
+    """
+
+    prefix = "batched_policy_server"
+
+    def __init__(self, config: PolicyServerConfig):
+        super().__init__(config)
+        self.sessions: dict[str, ClientSession] = {}
+        self._sessions_lock = threading.Lock()
+        # (policy_type, pretrained_name_or_path, device) of the loaded policy
+        self._policy_specs = None
+        self._policy_lock = threading.Lock()
+
+        self._requests = Queue()
+        self._stop_event = threading.Event()
+        self._scheduler_thread = threading.Thread(target=self._scheduler_loop, daemon=True)
+        self._scheduler_thread.start()
+
+    def _get_session(self, context) -> ClientSession | None:
+        session_id = get_session_id(context)
+        with self._sessions_lock:
+            session = self.sessions.get(session_id)
+        if session is None:
+            self.logger.warning(f"Unknown session {session_id}, the client must call Ready first")
+        else:
+            session.last_active = time.perf_counter()
+        return session
+
+    def Ready(self, request, context):  # noqa: N802
+        session_id = get_session_id(context)
+        with self._sessions_lock:
+            if session_id not in self.sessions and len(self.sessions) >= self.config.max_clients:
+                # Robots restarting with a new session ID would otherwise be locked out by their old session
+                stale_id = min(self.sessions, key=lambda sid: self.sessions[sid].last_active)
+                self.logger.warning(f"Maximum number of clients reached, dropping the session {stale_id}")
+                del self.sessions[stale_id]
+            self.sessions[session_id] = ClientSession(session_id, FPSTracker(target_fps=self.config.fps))
+            num_sessions = len(self.sessions)
+
+        self.logger.info(
+            f"Client {context.peer()} connected and ready (session {session_id}, {num_sessions} active)"
+        )
+        self._running_event.set()
+
+        return async_inference_pb2.Empty()
+
+    def SendPolicyInstructions(self, request, context):  # noqa: N802
+        """Receive policy instructions from a robot client, loading the policy for the first one"""
+        session = self._get_session(context)
+        if session is None:
+            return async_inference_pb2.Empty()
+
+        policy_specs, wire_format = self._parse_policy_specs(request, context)
+        specs = (policy_specs.policy_type, policy_specs.pretrained_name_or_path, policy_specs.device)
+
+        with self._policy_lock:
+            if specs != self._policy_specs:
+                with self._sessions_lock:
+                    others_configured = any(
+                        other.actions_per_chunk is not None
+                        for other in self.sessions.values()
+                        if other is not session
+                    )
+                if others_configured:
+                    raise ValueError(
+                        f"The server already serves the policy {self._policy_specs} to other clients, "
+                        f"it can't switch to {specs}."
+                    )
+
+                self.policy_type, _, self.device = specs
+                self._load_policy(policy_specs.pretrained_name_or_path)
+                self._policy_specs = specs
+
+        session.lerobot_features = policy_specs.lerobot_features
+        session.actions_per_chunk = policy_specs.actions_per_chunk
+        session.wire_format = wire_format
+
+        return async_inference_pb2.Empty()
+
+    def SendObservations(self, request_iterator, context):  # noqa: N802
+        """Receive observations from a robot client"""
+        session = self._get_session(context)
+        if session is None:
+            return async_inference_pb2.Empty()
+
+        timed_observation = self._receive_observation(request_iterator, session.fps_tracker)
+        if not self._enqueue_session_observation(session, timed_observation):
+            self.logger.info(
+                f"Observation #{timed_observation.get_timestep()} of session {session.session_id} "
+                "has been filtered out"
+            )
+
+        return async_inference_pb2.Empty()
+
+    def GetActions(self, request, context):  # noqa: N802
+        """Returns an action chunk to a robot client, predicted in a batch with the observations of other clients"""
+        session = self._get_session(context)
+        if session is None:
+            return async_inference_pb2.Empty()
+
+        try:
+            getactions_starts = time.perf_counter()
+            obs = session.observation_queue.get(timeout=self.config.obs_queue_timeout)
+
+            with self._predicted_timesteps_lock:
+                session.predicted_timesteps.add(obs.get_timestep())
+
+            future = futures.Future()
+            self._requests.put((session, obs, future))
+            action_chunk = future.result()
+
+            actions = async_inference_pb2.Actions(
+                data=timed_actions_to_bytes(action_chunk, session.wire_format)
+            )
+
+            self.logger.info(
+                f"Action chunk #{obs.get_timestep()} of session {session.session_id} generated | "
+                f"Total time: {(time.perf_counter() - getactions_starts) * 1000:.2f}ms"
+            )
+
+            time.sleep(
+                max(0, self.config.inference_latency - max(0, time.perf_counter() - getactions_starts))
+            )  # sleep controls inference latency
+
+            return actions
+
+        except Empty:  # no observation added to queue in obs_queue_timeout
+            return async_inference_pb2.Empty()
+
+        except Exception as e:
+            self.logger.error(f"Error in GetActions for session {session.session_id}: {e}")
+
+            return async_inference_pb2.Empty()
+
+    def _enqueue_session_observation(self, session: ClientSession, obs: TimedObservation) -> bool:
+        """Enqueue the observation of a client if it must go through processing, like `_enqueue_observation`"""
+        if not (obs.must_go or session.last_processed_obs is None):
+            with self._predicted_timesteps_lock:
+                already_predicted = obs.get_timestep() in session.predicted_timesteps
+            if already_predicted or observations_similar(
+                obs, session.last_processed_obs, lerobot_features=session.lerobot_features
+            ):
+                return False
+
+        # Only the latest observation of each client is run through the policy
+        with contextlib.suppress(Empty):
+            session.observation_queue.get_nowait()
+        session.observation_queue.put(obs)
+        return True
+
+    def _scheduler_loop(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                requests = [self._requests.get(timeout=0.1)]
+            except Empty:
+                continue
+
+            # Each client has at most one pending observation, so there is no need to wait for more than that
+            with self._sessions_lock:
+                max_batch_size = len(self.sessions)
+            deadline = time.perf_counter() + self.config.batch_window_s
+            while len(requests) < max_batch_size:
+                try:
+                    requests.append(self._requests.get(timeout=max(0, deadline - time.perf_counter())))
+                except Empty:
+                    break
+
+            self._run_batch(requests)
+
+        # Fail the requests which arrived after the last batch
+        while not self._requests.empty():
+            _, _, future = self._requests.get_nowait()
+            future.set_exception(RuntimeError("The server is stopping"))
+
+    def _run_batch(self, requests: list[tuple[ClientSession, TimedObservation, futures.Future]]) -> None:
+        """Run the observations of several clients through the policy, in as few batches as possible"""
+        groups = {}
+        for session, obs, future in requests:
+            try:
+                observation = raw_observation_to_observation(
+                    obs.get_observation(), session.lerobot_features, self.policy_image_features, self.device
+                )
+            except Exception as e:
+                future.set_exception(e)
+                continue
+
+            session.last_processed_obs = obs
+            if self.policy_type in BATCHABLE_POLICIES:
+                # Only observations with the same shapes can be stacked
+                group_key = tuple(
+                    (k, tuple(v.shape)) for k, v in observation.items() if isinstance(v, torch.Tensor)
+                )
+            else:
+                group_key = len(groups)
+            groups.setdefault(group_key, []).append((session, obs, observation, future))
+
+        for group in groups.values():
+            try:
+                start_time = time.perf_counter()
+                chunks = self.policy.predict_action_chunk(batch_observations([item[2] for item in group]))
+                if chunks.ndim != 3:
+                    chunks = chunks.unsqueeze(
+                        0
+                    )  # adding batch dimension, now shape is (B, chunk_size, action_dim)
+                chunks = chunks.cpu()
+                self.logger.debug(
+                    f"Batch of {len(group)} observations | "
+                    f"Inference time: {1000 * (time.perf_counter() - start_time):.2f}ms"
+                )
+            except Exception as e:
+                for *_, future in group:
+                    future.set_exception(e)
+                continue
+
+            for (session, obs, _, future), chunk in zip(group, chunks, strict=True):
+                future.set_result(
+                    self._time_action_chunk(
+                        obs.get_timestamp(), list(chunk[: session.actions_per_chunk]), obs.get_timestep()
+                    )
+                )
+
+    def stop(self):
+        """Stop the server and its scheduler"""
+        self._stop_event.set()
+        self._scheduler_thread.join()
+        with self._sessions_lock:
+            self.sessions = {}
+        super().stop()
+
+
 @draccus.wrap()
 def serve(cfg: PolicyServerConfig):
     """Start the PolicyServer with the given configuration.
@@ -384,10 +699,10 @@ def serve(cfg: PolicyServerConfig):
     logging.info(pformat(asdict(cfg)))
 
     # Create the server instance first
-    policy_server = PolicyServer(cfg)
+    policy_server = BatchedPolicyServer(cfg) if cfg.max_clients > 1 else PolicyServer(cfg)
 
     # Setup and start gRPC server
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4 * cfg.max_clients))
     async_inference_pb2_grpc.add_AsyncInferenceServicer_to_server(policy_server, server)
     server.add_insecure_port(f"{cfg.host}:{cfg.port}")
 
@@ -36,6 +36,7 @@ import logging
 import pickle  # nosec
 import threading
 import time
+import uuid
 from collections.abc import Callable
 from dataclasses import asdict
 from pprint import pformat
@@ -58,7 +59,7 @@ from lerobot.robots import (  # noqa: F401
     so101_follower,
 )
 from lerobot.scripts.server.configs import RobotClientConfig
-from lerobot.scripts.server.constants import SUPPORTED_ROBOTS
+from lerobot.scripts.server.constants import SESSION_ID_METADATA_KEY, SUPPORTED_ROBOTS
 from lerobot.scripts.server.helpers import (
     Action,
     FPSTracker,
@@ -67,9 +68,11 @@ from lerobot.scripts.server.helpers import (
     RemotePolicyConfig,
     TimedAction,
     TimedObservation,
+    bytes_to_timed_actions,
     get_logger,
     map_robot_keys_to_lerobot_features,
     send_bytes_in_chunks,
+    timed_observation_to_bytes,
     validate_robot_cameras_for_policy,
     visualize_action_queue_size,
 )
@@ -114,11 +117,15 @@ class RobotClient:
             lerobot_features,
             config.actions_per_chunk,
             config.policy_device,
+            image_encoding=config.image_encoding,
         )
         self.channel = grpc.insecure_channel(
             self.server_address, grpc_channel_options(initial_backoff=f"{config.environment_dt:.4f}s")
         )
         self.stub = async_inference_pb2_grpc.AsyncInferenceStub(self.channel)
+        # Sent with every call, for servers shared by several robots to tell their clients apart
+        self.session_id = config.session_id or uuid.uuid4().hex
+        self.call_metadata = ((SESSION_ID_METADATA_KEY, self.session_id),)
         self.logger.info(f"Initializing client to connect to server at {self.server_address}")
 
         self._running_event = threading.Event()
@@ -153,7 +160,7 @@ class RobotClient:
         try:
             # client-server handshake
             start_time = time.perf_counter()
-            self.stub.Ready(async_inference_pb2.Empty())
+            self.stub.Ready(async_inference_pb2.Empty(), metadata=self.call_metadata)
             end_time = time.perf_counter()
             self.logger.debug(f"Connected to policy server in {end_time - start_time:.4f}s")
 
@@ -168,7 +175,7 @@ class RobotClient:
                 f"Device: {self.policy_config.device}"
             )
 
-            self.stub.SendPolicyInstructions(policy_setup)
+            self.stub.SendPolicyInstructions(policy_setup, metadata=self.call_metadata)
 
             self._running_event.set()
 
@@ -201,7 +208,7 @@ class RobotClient:
             raise ValueError("Input observation needs to be a TimedObservation!")
 
         start_time = time.perf_counter()
-        observation_bytes = pickle.dumps(obs)
+        observation_bytes = timed_observation_to_bytes(obs, self.policy_config.image_encoding)
         serialize_time = time.perf_counter() - start_time
         self.logger.debug(f"Observation serialization time: {serialize_time:.6f}s")
 
@@ -212,7 +219,7 @@ class RobotClient:
                 log_prefix="[CLIENT] Observation",
                 silent=True,
             )
-            _ = self.stub.SendObservations(observation_iterator)
+            _ = self.stub.SendObservations(observation_iterator, metadata=self.call_metadata)
             obs_timestep = obs.get_timestep()
             self.logger.info(f"Sent observation #{obs_timestep} | ")
 
@@ -283,7 +290,7 @@ class RobotClient:
         while self.running:
             try:
                 # Use StreamActions to get a stream of actions from the server
-                actions_chunk = self.stub.GetActions(async_inference_pb2.Empty())
+                actions_chunk = self.stub.GetActions(async_inference_pb2.Empty(), metadata=self.call_metadata)
                 if len(actions_chunk.data) == 0:
                     continue  # received `Empty` from server, wait for next call
 
@@ -291,7 +298,7 @@ class RobotClient:
 
                 # Deserialize bytes back into list[TimedAction]
                 deserialize_start = time.perf_counter()
-                timed_actions = pickle.loads(actions_chunk.data)  # nosec
+                timed_actions = bytes_to_timed_actions(actions_chunk.data)
                 deserialize_time = time.perf_counter() - deserialize_start
 
                 self.action_chunk_size = max(self.action_chunk_size, len(timed_actions))
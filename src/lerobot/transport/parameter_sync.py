@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Versioned synchronization of the policy parameters from the learner to the actor.
+
+Each parameters stream (`LearnerService.StreamParameters`) owns a `ParameterSyncEncoder`, which keeps a copy of
+the parameters the actor holds, and sends each new version of the state dicts as a tensor frame containing:
+- every tensor, for a full snapshot (the first version of a stream, and every `full_sync_frequency` versions);
+- otherwise, only the tensors which changed since the previous version (frozen weights are never resent),
+  either as values or as int8 quantized deltas.
+
+The actor applies the updates in place with a `ParameterSyncDecoder`, which checks that each update is based on
+the version it holds and otherwise ignores the updates until the next full snapshot.
+
+Sync modes:
+- "full": full snapshots only.
+- "changed": changed tensors, as values.
+- "int8_delta": changed floating point tensors, as deltas quantized to int8 with a scale per tensor. The encoder
+  tracks the values reconstructed by the actor, so that the quantization errors are corrected by the next
+  deltas instead of accumulating.
+"""
+
+import logging
+
+import torch
+from torch import nn
+
+from lerobot.transport.utils import (
+    bytes_to_state_dict,
+    bytes_to_tensors,
+    bytes_to_torch_tensors,
+    is_tensor_frame,
+)
+
+PARAMETER_SYNC_MODES = ["full", "changed", "int8_delta"]
+PARAMETER_SYNC_DTYPES = {"float16": torch.float16, "bfloat16": torch.bfloat16}
+# Separator of the module and parameter names in the keys of the tensors sent
+KEY_SEPARATOR = "/"
+
+
+def flatten_state_dicts(state_dicts: dict[str, dict[str, torch.Tensor]]) -> dict[str, torch.Tensor]:
+    return {
+        f"{name}{KEY_SEPARATOR}{key}": tensor
+        for name, state_dict in state_dicts.items()
+        for key, tensor in state_dict.items()
+    }
+
+
+def is_full_parameters_update(buffer: bytes | bytearray) -> bool:
+    """Whether an update replaces all the parameters, so that the updates received before it can be skipped."""
+    if not is_tensor_frame(buffer):
+        return True
+    _, meta = bytes_to_tensors(buffer)
+    return meta.get("full", True)
+
+
+class ParameterSyncEncoder:
+    """
+    Encodes the successive versions of the state dicts pushed to an actor.
+
+    Args:
+        mode (str, optional): One of `PARAMETER_SYNC_MODES`. Defaults to "full".
+        dtype (str | None, optional): If set to "float16" or "bfloat16", floating point values are sent in this
+            precision. Defaults to None.
+        full_sync_frequency (int, optional): A full snapshot is sent every `full_sync_frequency` versions, so that
+            an actor which missed an update resynchronizes. 0 disables them. Defaults to 20.
+    """
+
+    def __init__(self, mode: str = "full", dtype: str | None = None, full_sync_frequency: int = 20):
+        if mode not in PARAMETER_SYNC_MODES:
+            raise ValueError(f"Unknown parameter sync mode {mode}. Supported: {PARAMETER_SYNC_MODES}")
+        if dtype is not None and dtype not in PARAMETER_SYNC_DTYPES:
+            raise ValueError(
+                f"Unsupported parameter sync dtype {dtype}. Supported: {list(PARAMETER_SYNC_DTYPES)}"
+            )
+
+        self.mode = mode
+        self.dtype = PARAMETER_SYNC_DTYPES.get(dtype)
+        self.full_sync_frequency = full_sync_frequency
+        self.version = 0
+        # Parameters held by the actor after the last update, which can differ from the ones of the learner
+        # when they are sent in lower precision or quantized
+        self.reference: dict[str, torch.Tensor] | None = None
+        # Parameters of the learner at the last update, to detect the ones which changed
+        self._sources: dict[str, torch.Tensor] = {}
+
+    def _cast(self, tensor: torch.Tensor) -> torch.Tensor:
+        if self.dtype is not None and tensor.is_floating_point():
+            return tensor.to(self.dtype)
+        return tensor
+
+    def _needs_full_sync(self, flat: dict[str, torch.Tensor]) -> bool:
+        if self.mode == "full" or self.reference is None:
+            return True
+        if self.full_sync_frequency > 0 and self.version % self.full_sync_frequency == 0:
+            return True
+        return flat.keys() != self.reference.keys() or any(
+            tensor.shape != self.reference[key].shape for key, tensor in flat.items()
+        )
+
+    def encode(self, state_dicts: dict[str, dict[str, torch.Tensor]]) -> tuple[dict[str, torch.Tensor], dict]:
+        """Returns the tensors and metadata of the update to send, e.g. with `send_tensors_in_chunks`."""
+        flat = {key: tensor.detach().cpu() for key, tensor in flatten_state_dicts(state_dicts).items()}
+        full = self._needs_full_sync(flat)
+        self.version += 1
+
+        tensors, scales, reference = {}, {}, {} if full else self.reference
+        for key, tensor in flat.items():
+            if not full and torch.equal(tensor, self._sources[key]):
+                continue
+
+            if not full and self.mode == "int8_delta" and tensor.is_floating_point():
+                delta = tensor - reference[key]
+                scale = delta.abs().max().item() / 127
+                if scale == 0:
+                    # The actor already holds these parameters, which changed back to its values
+                    continue
+                quantized = torch.round(delta / scale).clamp(-127, 127).to(torch.int8)
+                tensors[key], scales[key] = quantized, scale
+                # Same computation as the actor's, to track its parameters exactly
+                reference[key] = reference[key] + quantized.to(tensor.dtype) * scale
+            else:
+                tensors[key] = self._cast(tensor)
+                reference[key] = tensors[key].to(tensor.dtype)
+
+        self.reference = reference
+        self._sources = flat
+        meta = {
+            "version": self.version,
+            "base_version": None if full else self.version - 1,
+            "full": full,
+            "scales": scales,
+        }
+        return tensors, meta
+
+
+class ParameterSyncDecoder:
+    """Applies the updates produced by a `ParameterSyncEncoder` to the modules of the actor, in place."""
+
+    def __init__(self):
+        self.version = None
+
+    @torch.no_grad()
+    def apply(self, buffer: bytes | bytearray, modules: dict[str, nn.Module]) -> bool:
+        """Applies an update to `modules` (keyed like the state dicts pushed by the learner). Full state dicts
+        serialized with `state_to_bytes` are also accepted. Returns whether the update was applied."""
+        tensors, meta = bytes_to_torch_tensors(buffer) if is_tensor_frame(buffer) else ({}, {})
+        if "version" not in meta:
+            state_dicts = bytes_to_state_dict(buffer)
+            for name, module in modules.items():
+                if name in state_dicts:
+                    module.load_state_dict(state_dicts[name])
+            self.version = None
+            return True
+
+        if not meta["full"] and meta["base_version"] != self.version:
+            logging.warning(
+                f"Parameters update {meta['version']} is based on version {meta['base_version']}, but the actor "
+                f"holds version {self.version}. Waiting for the next full snapshot."
+            )
+            return False
+
+        targets = flatten_state_dicts({name: module.state_dict() for name, module in modules.items()})
+        if unexpected_keys := tensors.keys() - targets.keys():
+            raise ValueError(
+                f"The parameters update doesn't match the actor's modules: {sorted(unexpected_keys)}"
+            )
+
+        for key, tensor in tensors.items():
+            # The tensors of a state dict share the memory of the module's parameters and buffers
+            target = targets[key]
+            if key in meta["scales"]:
+                target.add_(tensor.to(target.device, target.dtype) * meta["scales"][key])
+            else:
+                target.copy_(tensor)
+
+        self.version = meta["version"]
+        return True
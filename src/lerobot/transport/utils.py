@@ -19,9 +19,12 @@ import io
 import json
 import logging
 import pickle  # nosec B403: Safe usage for internal serialization only
+import struct
 from multiprocessing import Event, Queue
 from typing import Any
 
+import cv2
+import numpy as np
 import torch
 
 from lerobot.transport import services_pb2
@@ -30,6 +33,16 @@ from lerobot.utils.transition import Transition
 CHUNK_SIZE = 2 * 1024 * 1024  # 2 MB
 MAX_MESSAGE_SIZE = 4 * 1024 * 1024  # 4 MB
 
+# Tensor frames: TENSOR_FRAME_MAGIC, the size of the json header (uint32, little endian), the header, and the
+# raw buffers of the tensors, each aligned on TENSOR_FRAME_ALIGNMENT bytes from the start of the frame.
+TENSOR_FRAME_MAGIC = b"LRTF"
+TENSOR_FRAME_ALIGNMENT = 64
+IMAGE_ENCODINGS = {"jpeg": ".jpg", "png": ".png"}
+JPEG_QUALITY = 90
+_TORCH_ONLY_DTYPES = {torch.bfloat16: torch.int16}
+# Placeholder of a tensor in the json tree of a nested structure (see `nested_tensors_to_bytes`)
+_TENSOR_REF = "__tensor__"
+
 
 def bytes_buffer_size(buffer: io.BytesIO) -> int:
     buffer.seek(0, io.SEEK_END)
@@ -68,6 +81,8 @@ def send_bytes_in_chunks(buffer: bytes, message_class: Any, log_prefix: str = ""
 
 def receive_bytes_in_chunks(iterator, queue: Queue, shutdown_event: Event, log_prefix: str = ""):  # type: ignore
     bytes_buffer = io.BytesIO()
+    # Tensor frames announce their size in their header, so they are assembled in a preallocated buffer
+    frame, frame_position = None, 0
     step = 0
 
     logging.info(f"{log_prefix} Starting receiver")
@@ -80,21 +95,44 @@ def receive_bytes_in_chunks(iterator, queue: Queue, shutdown_event: Event, log_p
         if item.transfer_state == services_pb2.TransferState.TRANSFER_BEGIN:
             bytes_buffer.seek(0)
             bytes_buffer.truncate(0)
-            bytes_buffer.write(item.data)
+            frame, frame_position = None, 0
+            frame_size = _tensor_frame_size(item.data)
+            if frame_size is not None and frame_size >= len(item.data):
+                frame = bytearray(frame_size)
+                frame[: len(item.data)] = item.data
+                frame_position = len(item.data)
+            else:
+                bytes_buffer.write(item.data)
             logging.debug(f"{log_prefix} Received data at step 0")
             step = 0
         elif item.transfer_state == services_pb2.TransferState.TRANSFER_MIDDLE:
-            bytes_buffer.write(item.data)
+            if frame is not None:
+                frame[frame_position : frame_position + len(item.data)] = item.data
+                frame_position += len(item.data)
+            else:
+                bytes_buffer.write(item.data)
             step += 1
             logging.debug(f"{log_prefix} Received data at step {step}")
         elif item.transfer_state == services_pb2.TransferState.TRANSFER_END:
-            bytes_buffer.write(item.data)
-            logging.debug(f"{log_prefix} Received data at step end size {bytes_buffer_size(bytes_buffer)}")
-
-            queue.put(bytes_buffer.getvalue())
+            if frame is not None:
+                frame[frame_position : frame_position + len(item.data)] = item.data
+                frame_position += len(item.data)
+                if frame_position != len(frame):
+                    raise ValueError(
+                        f"Received {frame_position} bytes for a tensor frame of {len(frame)} bytes"
+                    )
+                logging.debug(f"{log_prefix} Received data at step end size {frame_position}")
+                queue.put(frame)
+            else:
+                bytes_buffer.write(item.data)
+                logging.debug(
+                    f"{log_prefix} Received data at step end size {bytes_buffer_size(bytes_buffer)}"
+                )
+                queue.put(bytes_buffer.getvalue())
 
             bytes_buffer.seek(0)
             bytes_buffer.truncate(0)
+            frame, frame_position = None, 0
             step = 0
 
             logging.debug(f"{log_prefix} Queue updated")
@@ -104,15 +142,15 @@ def receive_bytes_in_chunks(iterator, queue: Queue, shutdown_event: Event, log_p
 
 
 def state_to_bytes(state_dict: dict[str, torch.Tensor]) -> bytes:
-    """Convert model state dict to flat array for transmission"""
-    buffer = io.BytesIO()
-
-    torch.save(state_dict, buffer)
-
-    return buffer.getvalue()
+    """Convert a (nested) model state dict to a tensor frame for transmission"""
+    return nested_tensors_to_bytes(state_dict)
 
 
 def bytes_to_state_dict(buffer: bytes) -> dict[str, torch.Tensor]:
+    if is_tensor_frame(buffer):
+        return bytes_to_nested_tensors(buffer)
+
+    # State dicts saved with `torch.save` by older versions
     buffer = io.BytesIO(buffer)
     buffer.seek(0)
     return torch.load(buffer, weights_only=True)
@@ -131,6 +169,10 @@ def bytes_to_python_object(buffer: bytes) -> Any:
 
 
 def bytes_to_transitions(buffer: bytes) -> list[Transition]:
+    if is_tensor_frame(buffer):
+        return bytes_to_nested_tensors(buffer)
+
+    # Transitions saved with `torch.save` by older versions
     buffer = io.BytesIO(buffer)
     buffer.seek(0)
     transitions = torch.load(buffer, weights_only=True)
@@ -138,9 +180,259 @@ def bytes_to_transitions(buffer: bytes) -> list[Transition]:
 
 
 def transitions_to_bytes(transitions: list[Transition]) -> bytes:
-    buffer = io.BytesIO()
-    torch.save(transitions, buffer)
-    return buffer.getvalue()
+    return nested_tensors_to_bytes(transitions)
+
+
+def is_tensor_frame(buffer: bytes | memoryview) -> bool:
+    return bytes(buffer[: len(TENSOR_FRAME_MAGIC)]) == TENSOR_FRAME_MAGIC
+
+
+def _encode_image(image: np.ndarray, image_encoding: str) -> np.ndarray:
+    if image.shape[-1] == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+    params = [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY] if image_encoding == "jpeg" else []
+    success, encoded = cv2.imencode(IMAGE_ENCODINGS[image_encoding], image, params)
+    if not success:
+        raise ValueError(f"Failed to encode image of shape {image.shape} as {image_encoding}.")
+    return encoded
+
+
+def _decode_image(buffer: np.ndarray, shape: list[int]) -> np.ndarray:
+    image = cv2.imdecode(buffer, cv2.IMREAD_UNCHANGED)
+    if shape[-1] == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    return image.reshape(shape)
+
+
+def _is_image(array: np.ndarray) -> bool:
+    """Whether an array is an (H, W, C) uint8 image which can be compressed."""
+    return array.dtype == np.uint8 and array.ndim == 3 and array.shape[-1] in (1, 3)
+
+
+def _tensor_to_array(tensor: np.ndarray | torch.Tensor, spec: dict) -> np.ndarray:
+    if isinstance(tensor, torch.Tensor):
+        tensor = tensor.detach().cpu()
+        if tensor.dtype in _TORCH_ONLY_DTYPES:
+            # Dtypes unknown to numpy (e.g. bfloat16) are sent as integers of the same size
+            spec["torch_dtype"] = str(tensor.dtype).removeprefix("torch.")
+            tensor = tensor.view(_TORCH_ONLY_DTYPES[tensor.dtype])
+        tensor = tensor.numpy()
+    return np.asarray(tensor, order="C")
+
+
+def _plan_tensor_frame(
+    tensors: dict[str, np.ndarray | torch.Tensor], meta: dict | None, image_encoding: str | None
+) -> tuple[bytes, list[dict], list[np.ndarray], int]:
+    """Lays out a tensor frame. Returns its header (up to the start of the data), the specs and contiguous arrays
+    of the tensors, and the size of the frame."""
+    if image_encoding is not None and image_encoding not in IMAGE_ENCODINGS:
+        raise ValueError(f"Unsupported image encoding {image_encoding}. Supported: {list(IMAGE_ENCODINGS)}")
+
+    specs, arrays = [], []
+    for key, tensor in tensors.items():
+        spec = {"key": key, "encoding": None}
+        array = _tensor_to_array(tensor, spec)
+        spec.update(dtype=array.dtype.str, shape=list(array.shape))
+        if image_encoding is not None and _is_image(array):
+            array = _encode_image(array, image_encoding)
+            spec["encoding"] = image_encoding
+        spec["nbytes"] = array.nbytes
+        specs.append(spec)
+        arrays.append(array)
+
+    # Offsets are relative to the start of the data, which is aligned right after the header
+    offset = 0
+    for spec in specs:
+        offset += -offset % TENSOR_FRAME_ALIGNMENT
+        spec["offset"] = offset
+        offset += spec["nbytes"]
+    header_bytes = json.dumps({"meta": meta or {}, "tensors": specs}).encode()
+    header = TENSOR_FRAME_MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes
+    header += bytes(-len(header) % TENSOR_FRAME_ALIGNMENT)
+    return header, specs, arrays, len(header) + offset
+
+
+def tensors_to_bytes(
+    tensors: dict[str, np.ndarray | torch.Tensor],
+    meta: dict | None = None,
+    image_encoding: str | None = None,
+) -> bytes:
+    """Serializes arrays into a tensor frame: a json header describing their keys, dtypes and shapes, followed
+    by their raw buffers, which `bytes_to_tensors` reads back without copying them.
+
+    Args:
+        tensors: Arrays or tensors to serialize.
+        meta: Additional json serializable data, stored in the header.
+        image_encoding: If set to "jpeg" or "png", (H, W, C) uint8 arrays are compressed in this format instead
+            of being stored raw.
+    """
+    header, specs, arrays, frame_size = _plan_tensor_frame(tensors, meta, image_encoding)
+
+    frame = bytearray(frame_size)
+    frame[: len(header)] = header
+    data = np.frombuffer(frame, dtype=np.uint8, offset=len(header))
+    for spec, array in zip(specs, arrays, strict=True):
+        data[spec["offset"] : spec["offset"] + spec["nbytes"]] = array.reshape(-1).view(np.uint8)
+    return bytes(frame)
+
+
+def _read_tensor_frame_header(buffer: bytes | bytearray | memoryview) -> tuple[dict, int] | None:
+    """Returns the header of a tensor frame and the offset of its data, or None if the header is incomplete."""
+    header_start = len(TENSOR_FRAME_MAGIC) + 4
+    if len(buffer) < header_start:
+        return None
+    (header_size,) = struct.unpack("<I", bytes(buffer[len(TENSOR_FRAME_MAGIC) : header_start]))
+    header_end = header_start + header_size
+    if len(buffer) < header_end:
+        return None
+    header = json.loads(bytes(buffer[header_start:header_end]))
+    return header, header_end + -header_end % TENSOR_FRAME_ALIGNMENT
+
+
+def _tensor_frame_size(buffer: bytes | bytearray | memoryview) -> int | None:
+    """Size of the tensor frame starting in `buffer`, or None if its header isn't entirely in `buffer`."""
+    if not is_tensor_frame(buffer) or (header := _read_tensor_frame_header(buffer)) is None:
+        return None
+    header, data_start = header
+    return data_start + max((spec["offset"] + spec["nbytes"] for spec in header["tensors"]), default=0)
+
+
+def _read_tensor_frame(buffer: bytes | bytearray | memoryview) -> tuple[list[tuple[dict, np.ndarray]], dict]:
+    if not is_tensor_frame(buffer):
+        raise ValueError("The buffer is not a tensor frame.")
+    header, data_start = _read_tensor_frame_header(buffer)
+
+    arrays = []
+    for spec in header["tensors"]:
+        offset = data_start + spec["offset"]
+        if spec["encoding"] is None:
+            dtype = np.dtype(spec["dtype"])
+            array = np.frombuffer(buffer, dtype=dtype, count=spec["nbytes"] // dtype.itemsize, offset=offset)
+            array = array.reshape(spec["shape"])
+        else:
+            encoded = np.frombuffer(buffer, dtype=np.uint8, count=spec["nbytes"], offset=offset)
+            array = _decode_image(encoded, spec["shape"])
+        arrays.append((spec, array))
+    return arrays, header["meta"]
+
+
+def bytes_to_tensors(buffer: bytes | bytearray | memoryview) -> tuple[dict[str, np.ndarray], dict]:
+    """Deserializes a tensor frame written by `tensors_to_bytes` into numpy arrays and its metadata. Raw arrays
+    are views on `buffer` (read-only if `buffer` is), only compressed images are decoded into new arrays.
+    """
+    arrays, meta = _read_tensor_frame(buffer)
+    return {spec["key"]: array for spec, array in arrays}, meta
+
+
+def bytes_to_torch_tensors(buffer: bytes | bytearray | memoryview) -> tuple[dict[str, torch.Tensor], dict]:
+    """Like `bytes_to_tensors`, but returns torch tensors. They share the memory of `buffer` if it is writable
+    (e.g. a bytearray), and are copied out of it otherwise."""
+    arrays, meta = _read_tensor_frame(buffer)
+    tensors = {}
+    for spec, array in arrays:
+        tensor = torch.from_numpy(array if array.flags.writeable else array.copy())
+        if "torch_dtype" in spec:
+            tensor = tensor.view(getattr(torch, spec["torch_dtype"]))
+        tensors[spec["key"]] = tensor
+    return tensors, meta
+
+
+def send_tensors_in_chunks(
+    tensors: dict[str, np.ndarray | torch.Tensor],
+    message_class: Any,
+    meta: dict | None = None,
+    log_prefix: str = "",
+    silent: bool = True,
+    chunk_size: int = CHUNK_SIZE,
+):
+    """Streams tensors as a tensor frame, like `send_bytes_in_chunks(tensors_to_bytes(tensors, meta), ...)`
+    but without serializing the whole frame in memory first: the data of each message is sliced from the
+    header and the raw buffers of the tensors."""
+    header, specs, arrays, frame_size = _plan_tensor_frame(tensors, meta, image_encoding=None)
+
+    # Contiguous pieces of the frame, with the zero padding aligning the tensors in between
+    pieces, position = [memoryview(header)], len(header)
+    for spec, array in zip(specs, arrays, strict=True):
+        start = len(header) + spec["offset"]
+        if start > position:
+            pieces.append(memoryview(bytes(start - position)))
+        pieces.append(memoryview(array.reshape(-1).view(np.uint8)))
+        position = start + spec["nbytes"]
+
+    logging_method = logging.info if not silent else logging.debug
+    logging_method(f"{log_prefix} Buffer size {frame_size / 1024 / 1024} MB with")
+
+    sent_bytes, chunk, chunk_bytes = 0, [], 0
+    for piece in pieces:
+        while len(piece) > 0:
+            size = min(chunk_size - chunk_bytes, len(piece))
+            chunk.append(piece[:size])
+            chunk_bytes += size
+            piece = piece[size:]
+            if chunk_bytes < chunk_size and sent_bytes + chunk_bytes < frame_size:
+                continue
+
+            if sent_bytes + chunk_bytes >= frame_size:
+                transfer_state = services_pb2.TransferState.TRANSFER_END
+            elif sent_bytes == 0:
+                transfer_state = services_pb2.TransferState.TRANSFER_BEGIN
+            else:
+                transfer_state = services_pb2.TransferState.TRANSFER_MIDDLE
+
+            yield message_class(transfer_state=transfer_state, data=b"".join(chunk))
+            sent_bytes += chunk_bytes
+            chunk, chunk_bytes = [], 0
+            logging_method(f"{log_prefix} Sent {sent_bytes}/{frame_size} bytes with state {transfer_state}")
+
+    logging_method(f"{log_prefix} Published {sent_bytes / 1024 / 1024} MB")
+
+
+def _pack_tensors(obj: Any, tensors: dict[str, torch.Tensor]) -> Any:
+    """Replaces the tensors of a nested structure of dicts and lists by references to `tensors`, leaving a json
+    serializable tree."""
+    if isinstance(obj, torch.Tensor | np.ndarray):
+        key = str(len(tensors))
+        tensors[key] = obj
+        return {_TENSOR_REF: key}
+    if isinstance(obj, dict):
+        return {key: _pack_tensors(value, tensors) for key, value in obj.items()}
+    if isinstance(obj, list | tuple):
+        return [_pack_tensors(value, tensors) for value in obj]
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return obj
+
+
+def _unpack_tensors(tree: Any, tensors: dict[str, torch.Tensor]) -> Any:
+    if isinstance(tree, dict):
+        if _TENSOR_REF in tree:
+            return tensors[tree[_TENSOR_REF]]
+        return {key: _unpack_tensors(value, tensors) for key, value in tree.items()}
+    if isinstance(tree, list):
+        return [_unpack_tensors(value, tensors) for value in tree]
+    return tree
+
+
+def nested_tensors_to_bytes(obj: Any) -> bytes:
+    """Serializes a nested structure of dicts and lists of tensors and json serializable values (such as a
+    state dict or a list of transitions) as a tensor frame."""
+    tensors = {}
+    tree = _pack_tensors(obj, tensors)
+    return tensors_to_bytes(tensors, meta={"tree": tree})
+
+
+def bytes_to_nested_tensors(buffer: bytes | bytearray | memoryview) -> Any:
+    tensors, meta = bytes_to_torch_tensors(buffer)
+    return _unpack_tensors(meta["tree"], tensors)
+
+
+def send_nested_tensors_in_chunks(obj: Any, message_class: Any, log_prefix: str = "", silent: bool = True):
+    """Streams a nested structure of tensors, to be deserialized with `bytes_to_nested_tensors`."""
+    tensors = {}
+    tree = _pack_tensors(obj, tensors)
+    yield from send_tensors_in_chunks(
+        tensors, message_class, {"tree": tree}, log_prefix=log_prefix, silent=silent
+    )
 
 
 def grpc_channel_options(
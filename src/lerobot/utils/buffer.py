@@ -15,10 +15,14 @@
 # limitations under the License.
 
 import functools
-from collections.abc import Callable, Sequence
+import json
+import os
+from collections.abc import Callable, Iterator, Sequence
 from contextlib import suppress
+from pathlib import Path
 from typing import TypedDict
 
+import numpy as np
 import torch
 import torch.nn.functional as F  # noqa: N812
 from tqdm import tqdm
@@ -26,6 +30,11 @@ from tqdm import tqdm
 from lerobot.datasets.lerobot_dataset import LeRobotDataset
 from lerobot.utils.transition import Transition
 
+# Header of a disk backed replay buffer, recording its layout and its position and size at the last flush
+REPLAY_BUFFER_HEADER = "replay_buffer.json"
+# Added to the TD errors so that every transition keeps a chance to be sampled
+PRIORITY_EPS = 1e-6
+
 
 class BatchTransition(TypedDict):
     state: dict[str, torch.Tensor]
@@ -76,6 +85,48 @@ def random_shift(images: torch.Tensor, pad: int = 4):
     return random_crop_vectorized(images=images, output_size=(h, w))
 
 
+class SumTree:
+    """
+    Binary tree stored in an array, in which each node holds the sum of its two children. The leaves can be
+    sampled proportionally to their values by batched prefix-sum queries, and updated in batches, with a number
+    of vectorized operations proportional to the depth of the tree.
+
+    Args:
+        capacity (int): Number of leaves.
+    """
+
+    def __init__(self, capacity: int):
+        self.depth = max(capacity - 1, 0).bit_length()
+        self.num_leaves = 1 << self.depth
+        # Node i has children 2i and 2i+1, the root is node 1 and the leaves start at `num_leaves`
+        self.tree = torch.zeros(2 * self.num_leaves, dtype=torch.float64)
+
+    @property
+    def total(self) -> float:
+        return self.tree[1].item()
+
+    def __getitem__(self, indices: torch.Tensor) -> torch.Tensor:
+        return self.tree[indices + self.num_leaves]
+
+    def update(self, indices: torch.Tensor, values: torch.Tensor):
+        nodes = indices + self.num_leaves
+        self.tree[nodes] = values.to(self.tree.dtype)
+        for _ in range(self.depth):
+            nodes = torch.unique(nodes // 2)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def find(self, prefix_sums: torch.Tensor) -> torch.Tensor:
+        """Returns the index of the leaf in which each prefix sum (in [0, total)) falls."""
+        prefix_sums = prefix_sums.to(self.tree.dtype).clone()
+        nodes = torch.ones(len(prefix_sums), dtype=torch.long)
+        for _ in range(self.depth):
+            left_sums = self.tree[2 * nodes]
+            go_right = prefix_sums >= left_sums
+            prefix_sums -= left_sums * go_right
+            nodes = 2 * nodes + go_right
+        return nodes - self.num_leaves
+
+
 class ReplayBuffer:
     def __init__(
         self,
@@ -86,6 +137,11 @@ class ReplayBuffer:
         use_drq: bool = True,
         storage_device: str = "cpu",
         optimize_memory: bool = False,
+        store_images_as_uint8: bool = False,
+        storage_dir: str | Path | None = None,
+        prioritized: bool = False,
+        priority_alpha: float = 0.6,
+        priority_beta: float = 0.4,
     ):
         """
         Replay buffer for storing transitions.
@@ -103,9 +159,29 @@ class ReplayBuffer:
                 Using "cpu" can help save GPU memory.
             optimize_memory (bool): If True, optimizes memory by not storing duplicate next_states when
                 they can be derived from states. This is useful for large datasets where next_state[i] = state[i+1].
+                The next state of a transition is stored in the following slot, and reused as the state of the
+                next transition when it starts from it. Otherwise (e.g. at the end of an episode), the slot is
+                kept for the next state only, so that each episode costs one extra slot.
+            store_images_as_uint8 (bool): If True, the images (`observation.image*` keys), expected in [0, 1],
+                are stored as uint8 instead of float32, which divides their memory by 4. They are converted back
+                to float on `device` when sampling.
+            storage_dir (str | Path | None): If set, the storage tensors are memory-mapped files in this
+                directory, so that the buffer can be larger than the RAM. `flush` writes the slots changed since
+                the last flush and records the position and size of the buffer, and a buffer created again with
+                the same directory reattaches to its content as of the last flush.
+            prioritized (bool): If True, transitions are sampled with a probability proportional to their priority,
+                set from their TD error with `update_priorities`, as in prioritized experience replay. The
+                importance sampling weights of the transitions and their indices are returned in the
+                `complementary_info` of the batches, under "importance_weights" and "replay_indices".
+            priority_alpha (float): Exponent applied to the TD errors to get the priorities (0 is uniform).
+            priority_beta (float): Exponent of the importance sampling weights (1 fully corrects the bias).
         """
         if capacity <= 0:
             raise ValueError("Capacity must be greater than 0.")
+        if optimize_memory and capacity < 2:
+            raise ValueError("Capacity must be at least 2 when optimize_memory is True.")
+        if storage_dir is not None and torch.device(storage_device).type != "cpu":
+            raise ValueError(f"A disk backed replay buffer must be stored on cpu, got {storage_device}.")
 
         self.capacity = capacity
         self.device = device
@@ -114,10 +190,48 @@ class ReplayBuffer:
         self.size = 0
         self.initialized = False
         self.optimize_memory = optimize_memory
+        self.store_images_as_uint8 = store_images_as_uint8
+        # Number of transitions added since the buffer was created
+        self.num_adds = 0
+
+        self.prioritized = prioritized
+        self.priority_alpha = priority_alpha
+        self.priority_beta = priority_beta
+        if prioritized:
+            self.sum_tree = SumTree(capacity)
+            # New transitions get the highest priority seen so far, so that they are sampled at least once
+            self.max_priority = 1.0
+
+        self.storage_dir = Path(storage_dir) if storage_dir is not None else None
+        self._memmaps = []
+        self._written_slots = []
+        header = None
+        if self.storage_dir is not None:
+            self.storage_dir.mkdir(parents=True, exist_ok=True)
+            if (self.storage_dir / REPLAY_BUFFER_HEADER).is_file():
+                header = json.loads((self.storage_dir / REPLAY_BUFFER_HEADER).read_text())
+                self._check_header(header)
+            # Number of the add which last wrote each slot, or -1 while it is being written
+            self.write_indices = self._allocate("write_indices", (capacity,), torch.long, header is not None)
+            if header is None:
+                self.write_indices.zero_()
 
         # Track episode boundaries for memory optimization
         self.episode_ends = torch.zeros(capacity, dtype=torch.bool, device=storage_device)
 
+        if optimize_memory:
+            # Slot holding the next state of each transition
+            self.next_indices = self._allocate("next_indices", (capacity,), torch.long, header is not None)
+            # Slots holding a transition, as opposed to the ones only holding the next state of another one
+            self.valid = self._allocate("valid", (capacity,), torch.bool, header is not None)
+            if header is None:
+                self.next_indices.zero_()
+                self.valid.zero_()
+            # Whether the slot at `position` holds the next state of the last transition added
+            self.next_state_pending = False
+            # Number of slots written so far, up to the capacity
+            self.num_slots = 0
+
         # If no state_keys provided, default to an empty list
         self.state_keys = state_keys if state_keys is not None else []
 
@@ -128,6 +242,98 @@ class ReplayBuffer:
             self.image_augmentation_function = torch.compile(base_function)
         self.use_drq = use_drq
 
+        if header is not None:
+            self._reattach(header)
+
+    def _allocate(self, name: str, shape: tuple, dtype: torch.dtype, reattach: bool = False) -> torch.Tensor:
+        """Allocates a storage tensor, in a memory-mapped file of `storage_dir` for disk backed buffers."""
+        if self.storage_dir is None:
+            return torch.empty(shape, dtype=dtype, device=self.storage_device)
+
+        np_dtype = torch.empty(0, dtype=dtype).numpy().dtype
+        array = np.memmap(
+            self.storage_dir / f"{name}.bin", dtype=np_dtype, mode="r+" if reattach else "w+", shape=shape
+        )
+        self._memmaps.append(array)
+        return torch.from_numpy(array)
+
+    def _check_header(self, header: dict):
+        for name in ["capacity", "optimize_memory", "store_images_as_uint8"]:
+            if header[name] != getattr(self, name):
+                raise ValueError(
+                    f"The replay buffer in {self.storage_dir} was created with {name}={header[name]}, "
+                    f"got {getattr(self, name)}."
+                )
+
+    def _reattach(self, header: dict):
+        """Restores the buffer to its state at the last flush. The slots written after it either hold complete
+        transitions, which are kept as the most recent ones, or were being written (their write index is -1,
+        which `add_batch` sets on several slots at once)."""
+        self._allocate_storage(
+            state_shapes=header["state_shapes"],
+            action_shape=header["action_shape"],
+            complementary_info_shapes=header["complementary_info_shapes"],
+            reattach=True,
+        )
+        written_after = self.write_indices > header["num_adds"]
+        dirty = written_after | (self.write_indices < 0)
+        self.num_adds = max(header["num_adds"], int(self.write_indices.max()))
+        self.position = header["position"]
+        if self.optimize_memory:
+            # Next states are reused by the following transition, so the slots written since the last flush are
+            # dropped, along with the transitions whose next state they held
+            self.valid &= ~dirty & ~dirty[self.next_indices]
+            self.size = int(self.valid.sum())
+            self.num_slots = header["num_slots"]
+            self.next_state_pending = header["next_state_pending"] and not bool(dirty[self.position])
+        else:
+            # The slots written since the last flush follow `position`, only the last ones can be incomplete
+            num_written = int(written_after.sum())
+            self.position = (self.position + num_written) % self.capacity
+            self.size = min(header["size"] + num_written, self.capacity - int((self.write_indices < 0).sum()))
+        self.write_indices[dirty & ~written_after] = self.num_adds
+
+        if self.prioritized:
+            # Priorities aren't saved, every transition starts again with the same one
+            indices = torch.tensor(self._ordered_indices(), dtype=torch.long)
+            self.sum_tree.update(indices, torch.full((len(indices),), self.max_priority))
+
+    def flush(self):
+        """Writes the changes of a disk backed buffer to disk (only the pages of the slots written since the
+        last flush), then atomically records its position and size."""
+        if self.storage_dir is None:
+            raise ValueError("Only disk backed replay buffers (with a `storage_dir`) can be flushed.")
+        if not self.initialized:
+            return
+
+        for array in self._memmaps:
+            array.flush()
+
+        header = {
+            "capacity": self.capacity,
+            "optimize_memory": self.optimize_memory,
+            "store_images_as_uint8": self.store_images_as_uint8,
+            "state_shapes": {key: list(value.shape[1:]) for key, value in self.states.items()},
+            "action_shape": list(self.actions.shape[1:]),
+            "complementary_info_shapes": {
+                key: list(value.shape[1:]) for key, value in self.complementary_info.items()
+            }
+            if self.has_complementary_info
+            else None,
+            "position": self.position,
+            "size": self.size,
+            "num_adds": self.num_adds,
+            "num_slots": self.num_slots if self.optimize_memory else None,
+            "next_state_pending": self.next_state_pending if self.optimize_memory else None,
+        }
+        header_path = self.storage_dir / REPLAY_BUFFER_HEADER
+        tmp_path = header_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(header, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, header_path)
+
     def _initialize_storage(
         self,
         state: dict[str, torch.Tensor],
@@ -139,18 +345,47 @@ class ReplayBuffer:
         state_shapes = {key: val.squeeze(0).shape for key, val in state.items()}
         action_shape = action.squeeze(0).shape
 
+        complementary_info_shapes = None
+        if complementary_info is not None:
+            complementary_info_shapes = {}
+            for key, value in complementary_info.items():
+                if isinstance(value, torch.Tensor):
+                    complementary_info_shapes[key] = value.squeeze(0).shape
+                elif isinstance(value, (int, float)):
+                    # Handle scalar values similar to reward
+                    complementary_info_shapes[key] = ()
+                else:
+                    raise ValueError(f"Unsupported type {type(value)} for complementary_info[{key}]")
+
+        self._allocate_storage(state_shapes, action_shape, complementary_info_shapes)
+
+    def _allocate_storage(
+        self,
+        state_shapes: dict[str, Sequence[int]],
+        action_shape: Sequence[int],
+        complementary_info_shapes: dict[str, Sequence[int]] | None = None,
+        reattach: bool = False,
+    ):
         # Pre-allocate tensors for storage
         self.states = {
-            key: torch.empty((self.capacity, *shape), device=self.storage_device)
+            key: self._allocate(
+                f"states.{key}", (self.capacity, *shape), self._storage_dtype(key), reattach=reattach
+            )
             for key, shape in state_shapes.items()
         }
-        self.actions = torch.empty((self.capacity, *action_shape), device=self.storage_device)
-        self.rewards = torch.empty((self.capacity,), device=self.storage_device)
+        self.actions = self._allocate(
+            "actions", (self.capacity, *action_shape), torch.get_default_dtype(), reattach=reattach
+        )
+        self.rewards = self._allocate(
+            "rewards", (self.capacity,), torch.get_default_dtype(), reattach=reattach
+        )
 
         if not self.optimize_memory:
             # Standard approach: store states and next_states separately
             self.next_states = {
-                key: torch.empty((self.capacity, *shape), device=self.storage_device)
+                key: self._allocate(
+                    f"next_states.{key}", (self.capacity, *shape), self._storage_dtype(key), reattach=reattach
+                )
                 for key, shape in state_shapes.items()
             }
         else:
@@ -158,34 +393,124 @@ class ReplayBuffer:
             # Just create a reference to states for consistent API
             self.next_states = self.states  # Just a reference for API consistency
 
-        self.dones = torch.empty((self.capacity,), dtype=torch.bool, device=self.storage_device)
-        self.truncateds = torch.empty((self.capacity,), dtype=torch.bool, device=self.storage_device)
+        self.dones = self._allocate("dones", (self.capacity,), torch.bool, reattach=reattach)
+        self.truncateds = self._allocate("truncateds", (self.capacity,), torch.bool, reattach=reattach)
 
         # Initialize storage for complementary_info
-        self.has_complementary_info = complementary_info is not None
+        self.has_complementary_info = complementary_info_shapes is not None
         self.complementary_info_keys = []
         self.complementary_info = {}
 
         if self.has_complementary_info:
-            self.complementary_info_keys = list(complementary_info.keys())
+            self.complementary_info_keys = list(complementary_info_shapes.keys())
             # Pre-allocate tensors for each key in complementary_info
-            for key, value in complementary_info.items():
-                if isinstance(value, torch.Tensor):
-                    value_shape = value.squeeze(0).shape
-                    self.complementary_info[key] = torch.empty(
-                        (self.capacity, *value_shape), device=self.storage_device
-                    )
-                elif isinstance(value, (int, float)):
-                    # Handle scalar values similar to reward
-                    self.complementary_info[key] = torch.empty((self.capacity,), device=self.storage_device)
-                else:
-                    raise ValueError(f"Unsupported type {type(value)} for complementary_info[{key}]")
+            for key, shape in complementary_info_shapes.items():
+                self.complementary_info[key] = self._allocate(
+                    f"complementary_info.{key}",
+                    (self.capacity, *shape),
+                    torch.get_default_dtype(),
+                    reattach=reattach,
+                )
 
         self.initialized = True
 
     def __len__(self):
         return self.size
 
+    def _storage_dtype(self, key: str) -> torch.dtype:
+        if self.store_images_as_uint8 and key.startswith("observation.image"):
+            return torch.uint8
+        return torch.get_default_dtype()
+
+    def _to_storage(self, state: dict[str, torch.Tensor], batched: bool = False) -> dict[str, torch.Tensor]:
+        """Converts a state with a batch dimension of 1, or a batch of states if `batched`, to the dtype and
+        device of the storage."""
+        converted = {}
+        for key, storage in self.states.items():
+            value = state[key].to(self.storage_device)
+            if not batched:
+                value = value.squeeze(dim=0)
+            if storage.dtype == torch.uint8 and value.is_floating_point():
+                value = (value * 255).round_()
+            converted[key] = value.to(storage.dtype)
+        return converted
+
+    def _from_storage(self, key: str, value: torch.Tensor) -> torch.Tensor:
+        """Converts stored values, already moved to the target device, back to float."""
+        if value.dtype == torch.uint8:
+            return value.to(torch.get_default_dtype()) / 255
+        return value
+
+    def _set_valid(self, slot: int, valid: bool):
+        if bool(self.valid[slot]) != valid:
+            self.size += 1 if valid else -1
+            self.valid[slot] = valid
+
+    def _begin_write(self, slot: int):
+        if self.storage_dir is not None:
+            # Marks the slot as incomplete until the end of `add`, in case the learner crashes meanwhile
+            self.write_indices[slot] = -1
+            self._written_slots.append(slot)
+
+    def _write_states(self, slot: int, state: dict[str, torch.Tensor]):
+        self._begin_write(slot)
+        self._set_valid(slot, False)
+        for key, value in state.items():
+            self.states[key][slot].copy_(value)
+        self.num_slots = max(self.num_slots, slot + 1)
+
+    def _add_states_by_reference(
+        self, state: dict[str, torch.Tensor], next_state: dict[str, torch.Tensor] | None
+    ) -> int:
+        """Stores the state and next state of a transition with `optimize_memory`. Returns the slot of the
+        transition, whose next state is stored in the slot `next_indices[slot]`."""
+        converted_state = self._to_storage(state)
+        slot = self.position
+        if self.next_state_pending and not all(
+            torch.equal(self.states[key][slot], value) for key, value in converted_state.items()
+        ):
+            # The slot holds the next state of the previous transition, which this one doesn't start from
+            slot = (slot + 1) % self.capacity
+            self._write_states(slot, converted_state)
+        elif not self.next_state_pending:
+            self._write_states(slot, converted_state)
+
+        # The transition is valid once its next state is stored, as this can evict the one of the next slot
+        if next_state is None or next_state is state:
+            next_slot = slot
+        else:
+            next_slot = (slot + 1) % self.capacity
+            self._write_states(next_slot, self._to_storage(next_state))
+        self._begin_write(slot)
+        self.next_indices[slot] = next_slot
+        self._set_valid(slot, True)
+
+        self.next_state_pending = next_slot != slot
+        self.position = next_slot if self.next_state_pending else (slot + 1) % self.capacity
+        return slot
+
+    def _sample_indices(self, batch_size: int) -> torch.Tensor:
+        if not self.optimize_memory:
+            return torch.randint(low=0, high=self.size, size=(batch_size,), device=self.storage_device)
+
+        # Slots only holding next states are a small fraction, drawing the indices again is cheaper than
+        # listing the valid slots
+        idx = torch.randint(low=0, high=self.num_slots, size=(batch_size,))
+        invalid = ~self.valid[idx]
+        while invalid.any():
+            idx[invalid] = torch.randint(low=0, high=self.num_slots, size=(int(invalid.sum()),))
+            invalid = ~self.valid[idx]
+        return idx.to(self.storage_device)
+
+    def _ordered_indices(self) -> list[int]:
+        """Slots of the transitions, from the oldest to the most recent."""
+        if not self.optimize_memory:
+            return [(self.position - self.size + i) % self.capacity for i in range(self.size)]
+
+        end = self.position + 1 if self.next_state_pending else self.position
+        slots = [(end - self.num_slots + i) % self.capacity for i in range(self.num_slots)]
+        return [slot for slot in slots if self.valid[slot]]
+
     def add(
         self,
         state: dict[str, torch.Tensor],
@@ -202,17 +527,20 @@ class ReplayBuffer:
             self._initialize_storage(state=state, action=action, complementary_info=complementary_info)
 
         # Store the transition in pre-allocated tensors
-        for key in self.states:
-            self.states[key][self.position].copy_(state[key].squeeze(dim=0))
-
-            if not self.optimize_memory:
-                # Only store next_states if not optimizing memory
-                self.next_states[key][self.position].copy_(next_state[key].squeeze(dim=0))
+        if self.optimize_memory:
+            slot = self._add_states_by_reference(state, next_state)
+        else:
+            slot = self.position
+            self._begin_write(slot)
+            converted_state, converted_next_state = self._to_storage(state), self._to_storage(next_state)
+            for key in self.states:
+                self.states[key][slot].copy_(converted_state[key])
+                self.next_states[key][slot].copy_(converted_next_state[key])
 
-        self.actions[self.position].copy_(action.squeeze(dim=0))
-        self.rewards[self.position] = reward
-        self.dones[self.position] = done
-        self.truncateds[self.position] = truncated
+        self.actions[slot].copy_(action.squeeze(dim=0))
+        self.rewards[slot] = reward
+        self.dones[slot] = done
+        self.truncateds[slot] = truncated
 
         # Handle complementary_info if provided and storage is initialized
         if complementary_info is not None and self.has_complementary_info:
@@ -221,42 +549,280 @@ class ReplayBuffer:
                 if key in complementary_info:
                     value = complementary_info[key]
                     if isinstance(value, torch.Tensor):
-                        self.complementary_info[key][self.position].copy_(value.squeeze(dim=0))
+                        self.complementary_info[key][slot].copy_(value.squeeze(dim=0))
                     elif isinstance(value, (int, float)):
-                        self.complementary_info[key][self.position] = value
+                        self.complementary_info[key][slot] = value
+
+        if not self.optimize_memory:
+            self.position = (self.position + 1) % self.capacity
+            self.size = min(self.size + 1, self.capacity)
+
+        self.num_adds += 1
+        if self.storage_dir is not None:
+            self.write_indices[self._written_slots] = self.num_adds
+            self._written_slots = []
+
+        if self.prioritized:
+            slots, priorities = [slot], [self.max_priority]
+            # A slot only holding the next state of the transition is never sampled
+            if self.optimize_memory and (next_slot := int(self.next_indices[slot])) != slot:
+                slots.append(next_slot)
+                priorities.append(0.0)
+            self.sum_tree.update(torch.tensor(slots), torch.tensor(priorities))
+
+    def add_batch(self, transitions: list[Transition] | BatchTransition):
+        """Saves a batch of transitions, given as a list or stacked along a first dimension (see
+        `stack_transitions`), as if they were added one by one but with one indexed write per storage tensor.
+
+        With `optimize_memory`, a next state equal to the state is stored in the same slot, as when `add` is given
+        the same object for both.
+        """
+        if isinstance(transitions, list):
+            if not transitions:
+                return
+            transitions = stack_transitions(transitions)
+        num_transitions = len(transitions["action"])
+        if num_transitions == 0:
+            return
+
+        complementary_info = transitions.get("complementary_info")
+        if not self.initialized:
+            self._initialize_storage(
+                state={key: value[:1] for key, value in transitions["state"].items()},
+                action=transitions["action"][:1],
+                complementary_info={key: value[:1] for key, value in complementary_info.items()}
+                if complementary_info is not None
+                else None,
+            )
+
+        state = self._to_storage(transitions["state"], batched=True)
+        next_state = self._to_storage(transitions["next_state"], batched=True)
+        data = {
+            "action": transitions["action"],
+            "reward": transitions["reward"],
+            "done": transitions["done"],
+            "truncated": transitions["truncated"],
+            "complementary_info": {
+                key: value
+                for key, value in (complementary_info or {}).items()
+                if key in self.complementary_info
+            },
+        }
+
+        if self.optimize_memory:
+            # Whether the next state is stored in the slot of the state, and whether the state is the next state
+            # of the previous transition, which is then reused
+            self_referenced = _rows_equal(state, next_state)
+            continues = torch.zeros(num_transitions, dtype=torch.bool)
+            continues[1:] = ~self_referenced[:-1] & _rows_equal(
+                {key: value[1:] for key, value in state.items()},
+                {key: value[:-1] for key, value in next_state.items()},
+            )
+            continues[0] = self.next_state_pending and all(
+                torch.equal(self.states[key][self.position], value[0]) for key, value in state.items()
+            )
+            num_writes = (~continues).long() + (~self_referenced).long()
+            # A chunk must not overwrite the slot of the next state pending before it
+            max_writes = self.capacity - 1
+        else:
+            num_writes = torch.ones(num_transitions, dtype=torch.long)
+            max_writes = self.capacity
+
+        # Transitions are written in chunks in which no slot is written twice
+        cumulative_writes = torch.cumsum(num_writes, dim=0)
+        start = 0
+        while start < num_transitions:
+            offset = int(cumulative_writes[start - 1]) if start > 0 else 0
+            end = int(torch.searchsorted(cumulative_writes, offset + max_writes, right=True))
+            chunk = slice(start, max(end, start + 1))
+            if self.optimize_memory:
+                self._add_chunk_by_reference(
+                    {key: value[chunk] for key, value in state.items()},
+                    {key: value[chunk] for key, value in next_state.items()},
+                    continues[chunk],
+                    self_referenced[chunk],
+                    data,
+                    chunk,
+                )
+            else:
+                self._add_chunk(
+                    {key: value[chunk] for key, value in state.items()},
+                    {key: value[chunk] for key, value in next_state.items()},
+                    data,
+                    chunk,
+                )
+            start = chunk.stop
+
+    def _add_chunk(
+        self, state: dict[str, torch.Tensor], next_state: dict[str, torch.Tensor], data: dict, chunk: slice
+    ):
+        num_transitions = chunk.stop - chunk.start
+        slots = (self.position + torch.arange(num_transitions)) % self.capacity
+        self._begin_batch_write(slots)
+        storage_slots = slots.to(self.storage_device)
+        for key in self.states:
+            self.states[key][storage_slots] = state[key]
+            self.next_states[key][storage_slots] = next_state[key]
+        self._write_transition_data(slots, data, chunk)
+
+        self.position = (self.position + num_transitions) % self.capacity
+        self.size = min(self.size + num_transitions, self.capacity)
+        self._end_batch_write(slots, slots, num_transitions)
+
+    def _add_chunk_by_reference(
+        self,
+        state: dict[str, torch.Tensor],
+        next_state: dict[str, torch.Tensor],
+        continues: torch.Tensor,
+        self_referenced: torch.Tensor,
+        data: dict,
+        chunk: slice,
+    ):
+        """Batched version of `_add_states_by_reference`, for a chunk of transitions writing at most
+        `capacity - 1` slots."""
+        writes_state, writes_next_state = ~continues, ~self_referenced
+        num_writes = writes_state.long() + writes_next_state.long()
+        offsets = torch.cumsum(num_writes, dim=0) - num_writes
+        # Slots are written consecutively, after the pending next state if any. A transition which continues
+        # from the previous one starts from the slot written just before
+        first = self.position + int(self.next_state_pending)
+        slots = (first + offsets - continues.long()) % self.capacity
+        next_slots = torch.where(
+            writes_next_state, (first + offsets + writes_state.long()) % self.capacity, slots
+        )
+        state_slots, next_state_slots = slots[writes_state], next_slots[writes_next_state]
+        written = torch.cat([state_slots, next_state_slots])
 
-        self.position = (self.position + 1) % self.capacity
-        self.size = min(self.size + 1, self.capacity)
+        self._begin_batch_write(torch.cat([written, slots]))
+        # The transitions stored in the overwritten slots are evicted
+        self.size -= int(self.valid[written].sum())
+        self.valid[written] = False
+        for key in self.states:
+            self.states[key][state_slots.to(self.storage_device)] = state[key][writes_state]
+            self.states[key][next_state_slots.to(self.storage_device)] = next_state[key][writes_next_state]
+        self.next_indices[slots] = next_slots.to(self.next_indices.device)
+        self._write_transition_data(slots, data, chunk)
+        self.valid[slots] = True
+        self.size += len(slots)
+        if len(written) > 0:
+            self.num_slots = max(self.num_slots, int(written.max()) + 1)
+
+        self.next_state_pending = bool(writes_next_state[-1])
+        self.position = (
+            int(next_slots[-1]) if self.next_state_pending else (int(slots[-1]) + 1) % self.capacity
+        )
+        if self.prioritized:
+            # Slots only holding the next state of a transition are never sampled
+            self.sum_tree.update(next_state_slots, torch.zeros(len(next_state_slots)))
+        self._end_batch_write(torch.cat([written, slots]), slots, len(slots))
+
+    def _write_transition_data(self, slots: torch.Tensor, data: dict, chunk: slice):
+        storage_slots = slots.to(self.storage_device)
+        self.actions[storage_slots] = data["action"][chunk].to(self.storage_device)
+        for name, storage in [("reward", self.rewards), ("done", self.dones), ("truncated", self.truncateds)]:
+            storage[storage_slots] = data[name][chunk].to(self.storage_device, storage.dtype)
+        for key, value in data["complementary_info"].items():
+            storage = self.complementary_info[key]
+            storage[storage_slots] = value[chunk].to(self.storage_device, storage.dtype)
+
+    def _begin_batch_write(self, slots: torch.Tensor):
+        if self.storage_dir is not None:
+            # Marks the slots as incomplete until the end of the write, see `_begin_write`
+            self.write_indices[slots] = -1
+
+    def _end_batch_write(self, touched_slots: torch.Tensor, slots: torch.Tensor, num_transitions: int):
+        self.num_adds += num_transitions
+        if self.storage_dir is not None:
+            self.write_indices[touched_slots] = self.num_adds
+        if self.prioritized:
+            self.sum_tree.update(slots, torch.full((len(slots),), self.max_priority))
+
+    def update_priorities(self, indices: torch.Tensor, td_errors: torch.Tensor):
+        """Sets the priorities of sampled transitions (their "replay_indices") from their TD errors."""
+        if not self.prioritized:
+            raise ValueError("Priorities can only be updated when the replay buffer is prioritized.")
+        indices = indices.cpu().long()
+        priorities = (td_errors.detach().abs().cpu().double() + PRIORITY_EPS) ** self.priority_alpha
+        self.max_priority = max(self.max_priority, priorities.max().item())
+        if self.optimize_memory:
+            # The slot of a transition sampled before it was evicted can now hold a next state only
+            priorities *= self.valid[indices]
+        self.sum_tree.update(indices, priorities)
+
+    def _sample_prioritized_indices(self, batch_size: int) -> tuple[torch.Tensor, torch.Tensor]:
+        """Samples indices proportionally to the priorities (one per segment of equal priority mass, to reduce the
+        variance) and returns them with their normalized importance sampling weights."""
+        total = self.sum_tree.total
+        segments = torch.arange(batch_size, dtype=torch.float64) + torch.rand(batch_size, dtype=torch.float64)
+        prefix_sums = (segments * (total / batch_size)).clamp(max=total * (1 - 1e-12))
+        idx = self.sum_tree.find(prefix_sums)
+
+        probabilities = self.sum_tree[idx] / total
+        weights = (self.size * probabilities) ** -self.priority_beta
+        weights = (weights / weights.max()).to(torch.get_default_dtype())
+        return idx.to(self.storage_device), weights
 
     def sample(self, batch_size: int) -> BatchTransition:
         """Sample a random batch of transitions and collate them into batched tensors."""
+        idx, importance_weights = self._sample_batch_indices(batch_size)
+        raw_batch = {name: value.to(self.device) for name, value in self._gather(idx).items()}
+        return self._assemble_batch(raw_batch, idx, importance_weights)
+
+    def _sample_batch_indices(self, batch_size: int) -> tuple[torch.Tensor, torch.Tensor | None]:
         if not self.initialized:
             raise RuntimeError("Cannot sample from an empty buffer. Add transitions first.")
 
         batch_size = min(batch_size, self.size)
-        high = max(0, self.size - 1) if self.optimize_memory and self.size < self.capacity else self.size
 
         # Random indices for sampling - create on the same device as storage
-        idx = torch.randint(low=0, high=high, size=(batch_size,), device=self.storage_device)
+        if self.prioritized:
+            return self._sample_prioritized_indices(batch_size)
+        return self._sample_indices(batch_size), None
+
+    def _gather(
+        self, idx: torch.Tensor, out: dict[str, torch.Tensor] | None = None
+    ) -> dict[str, torch.Tensor]:
+        """Indexes the storage tensors, keeping their storage dtype, into the tensors of `out` if given (e.g.
+        pinned buffers). Returns a flat dict, with keys such as "state.observation.image" or "action"."""
+        # Memory-optimized approach - get next_state from the slot it is stored in
+        next_idx = self.next_indices[idx] if self.optimize_memory else idx
+        sources = {}
+        for key in self.states:
+            sources[f"state.{key}"] = (self.states[key], idx)
+            sources[f"next_state.{key}"] = (self.next_states[key], next_idx)
+        sources["action"] = (self.actions, idx)
+        sources["reward"] = (self.rewards, idx)
+        sources["done"] = (self.dones, idx)
+        sources["truncated"] = (self.truncateds, idx)
+        if self.has_complementary_info:
+            for key in self.complementary_info_keys:
+                sources[f"complementary_info.{key}"] = (self.complementary_info[key], idx)
+
+        if out is None:
+            return {name: storage[indices] for name, (storage, indices) in sources.items()}
+        return {
+            name: torch.index_select(storage, 0, indices, out=out[name])
+            for name, (storage, indices) in sources.items()
+        }
+
+    def _assemble_batch(
+        self,
+        raw_batch: dict[str, torch.Tensor],
+        idx: torch.Tensor,
+        importance_weights: torch.Tensor | None = None,
+    ) -> BatchTransition:
+        """Builds a batch from gathered tensors already moved to `device`: converts the stored images back to
+        float and applies the image augmentation."""
+        batch_size = len(raw_batch["action"])
 
         # Identify image keys that need augmentation
         image_keys = [k for k in self.states if k.startswith("observation.image")] if self.use_drq else []
 
         # Create batched state and next_state
-        batch_state = {}
-        batch_next_state = {}
-
-        # First pass: load all state tensors to target device
-        for key in self.states:
-            batch_state[key] = self.states[key][idx].to(self.device)
-
-            if not self.optimize_memory:
-                # Standard approach - load next_states directly
-                batch_next_state[key] = self.next_states[key][idx].to(self.device)
-            else:
-                # Memory-optimized approach - get next_state from the next index
-                next_idx = (idx + 1) % self.capacity
-                batch_next_state[key] = self.states[key][next_idx].to(self.device)
+        batch_state = {key: self._from_storage(key, raw_batch[f"state.{key}"]) for key in self.states}
+        batch_next_state = {
+            key: self._from_storage(key, raw_batch[f"next_state.{key}"]) for key in self.states
+        }
 
         # Apply image augmentation in a batched way if needed
         if self.use_drq and image_keys:
@@ -279,29 +845,55 @@ class ReplayBuffer:
                 # Next states start after the states at index (i*2+1)*batch_size and also take up batch_size slots
                 batch_next_state[key] = augmented_images[(i * 2 + 1) * batch_size : (i + 1) * 2 * batch_size]
 
-        # Sample other tensors
-        batch_actions = self.actions[idx].to(self.device)
-        batch_rewards = self.rewards[idx].to(self.device)
-        batch_dones = self.dones[idx].to(self.device).float()
-        batch_truncateds = self.truncateds[idx].to(self.device).float()
-
         # Sample complementary_info if available
         batch_complementary_info = None
         if self.has_complementary_info:
             batch_complementary_info = {}
             for key in self.complementary_info_keys:
-                batch_complementary_info[key] = self.complementary_info[key][idx].to(self.device)
+                batch_complementary_info[key] = raw_batch[f"complementary_info.{key}"]
+
+        if self.prioritized:
+            batch_complementary_info = batch_complementary_info or {}
+            batch_complementary_info["importance_weights"] = importance_weights.to(self.device)
+            batch_complementary_info["replay_indices"] = idx.to(self.device)
 
         return BatchTransition(
             state=batch_state,
-            action=batch_actions,
-            reward=batch_rewards,
+            action=raw_batch["action"],
+            reward=raw_batch["reward"],
             next_state=batch_next_state,
-            done=batch_dones,
-            truncated=batch_truncateds,
+            done=raw_batch["done"].float(),
+            truncated=raw_batch["truncated"].float(),
             complementary_info=batch_complementary_info,
         )
 
+    def _sample_on_stream(
+        self,
+        batch_size: int,
+        stream: torch.cuda.Stream,
+        pinned_buffers: dict[str, torch.Tensor] | None,
+    ) -> tuple[BatchTransition, torch.cuda.Event, dict[str, torch.Tensor] | None]:
+        """Samples a batch whose copy to the GPU and augmentation run on `stream`. Batches stored on cpu are
+        gathered into `pinned_buffers` (reallocated if their batch size differs), which can only be reused once
+        the returned event completed. Returns the batch, the event and the pinned buffers."""
+        idx, importance_weights = self._sample_batch_indices(batch_size)
+        if torch.device(self.storage_device).type == "cpu":
+            if pinned_buffers is None or len(pinned_buffers["action"]) != len(idx):
+                pinned_buffers = {
+                    name: torch.empty((len(idx), *value.shape[1:]), dtype=value.dtype, pin_memory=True)
+                    for name, value in self._gather(idx[:1]).items()
+                }
+            raw_batch = self._gather(idx, out=pinned_buffers)
+        else:
+            raw_batch = self._gather(idx)
+
+        with torch.cuda.stream(stream):
+            raw_batch = {name: value.to(self.device, non_blocking=True) for name, value in raw_batch.items()}
+            batch = self._assemble_batch(raw_batch, idx, importance_weights)
+            event = torch.cuda.Event()
+            event.record(stream)
+        return batch, event, pinned_buffers
+
     def get_iterator(
         self,
         batch_size: int,
@@ -337,6 +929,9 @@ class ReplayBuffer:
         background thread. The design is intentionally simple and avoids busy
         waiting / complex state management.
 
+        When sampling on a GPU, batches are gathered into reusable pinned buffers and moved to the GPU with
+        non-blocking copies on a side CUDA stream, where the image augmentation runs as well.
+
         Args:
             batch_size (int): Size of batches to sample.
             queue_size (int): Maximum number of prefetched batches to keep in
@@ -351,14 +946,34 @@ class ReplayBuffer:
         data_queue: queue.Queue = queue.Queue(maxsize=queue_size)
         shutdown_event = threading.Event()
 
+        # On GPU, batches are gathered into pinned buffers, then copied and augmented on a side stream, so that
+        # sampling the next batches overlaps the optimization on the current one. Two sets of pinned buffers are
+        # used in turn, so that a batch is gathered while the copy of the previous one is in flight.
+        use_cuda_stream = torch.device(self.device).type == "cuda" and torch.cuda.is_available()
+        stream = torch.cuda.Stream(device=self.device) if use_cuda_stream else None
+        pinned_buffers = [None, None]
+        copy_events = [None, None]
+
         def producer() -> None:
             """Continuously put sampled batches into the queue until shutdown."""
+            batch, event, slot = None, None, 0
             while not shutdown_event.is_set():
                 try:
-                    batch = self.sample(batch_size)
+                    if batch is None and use_cuda_stream:
+                        # The pinned buffers can be reused once their previous copy is done
+                        if copy_events[slot] is not None:
+                            copy_events[slot].synchronize()
+                        batch, event, pinned_buffers[slot] = self._sample_on_stream(
+                            batch_size, stream, pinned_buffers[slot]
+                        )
+                        copy_events[slot] = event
+                        slot = 1 - slot
+                    elif batch is None:
+                        batch = self.sample(batch_size)
                     # The timeout ensures the thread unblocks if the queue is full
                     # and the shutdown event gets set meanwhile.
-                    data_queue.put(batch, block=True, timeout=0.5)
+                    data_queue.put((batch, event), block=True, timeout=0.5)
+                    batch = None
                 except queue.Full:
                     # Queue is full – loop again (will re-check shutdown_event)
                     continue
@@ -372,7 +987,15 @@ class ReplayBuffer:
         try:
             while not shutdown_event.is_set():
                 try:
-                    yield data_queue.get(block=True)
+                    batch, event = data_queue.get(block=True)
+                    if event is not None:
+                        # The batch can be used once its copy and augmentation are done, and its memory must not
+                        # be reused by the side stream while the current stream still uses it
+                        current_stream = torch.cuda.current_stream(self.device)
+                        current_stream.wait_event(event)
+                        for tensor in _iter_tensors(batch):
+                            tensor.record_stream(current_stream)
+                    yield batch
                 except Exception:
                     # If the producer already set the shutdown flag we exit.
                     if shutdown_event.is_set():
@@ -421,6 +1044,11 @@ class ReplayBuffer:
         use_drq: bool = True,
         storage_device: str = "cpu",
         optimize_memory: bool = False,
+        store_images_as_uint8: bool = False,
+        storage_dir: str | Path | None = None,
+        prioritized: bool = False,
+        priority_alpha: float = 0.6,
+        priority_beta: float = 0.4,
     ) -> "ReplayBuffer":
         """
         Convert a LeRobotDataset into a ReplayBuffer.
@@ -436,6 +1064,11 @@ class ReplayBuffer:
             use_drq (bool): Whether to use DrQ image augmentation when sampling.
             storage_device (str): Device for storing tensor data. Using "cpu" saves GPU memory.
             optimize_memory (bool): If True, reduces memory usage by not duplicating state data.
+            store_images_as_uint8 (bool): If True, stores the images as uint8 instead of float32.
+            storage_dir (str | Path | None): If set, directory of the memory-mapped storage of the buffer.
+            prioritized (bool): If True, uses prioritized sampling, see `ReplayBuffer`.
+            priority_alpha (float): Exponent applied to the TD errors to get the priorities.
+            priority_beta (float): Exponent of the importance sampling weights.
 
         Returns:
             ReplayBuffer: The replay buffer with dataset transitions.
@@ -457,51 +1090,17 @@ class ReplayBuffer:
             use_drq=use_drq,
             storage_device=storage_device,
             optimize_memory=optimize_memory,
+            store_images_as_uint8=store_images_as_uint8,
+            storage_dir=storage_dir,
+            prioritized=prioritized,
+            priority_alpha=priority_alpha,
+            priority_beta=priority_beta,
         )
 
-        # Convert dataset to transitions
-        list_transition = cls._lerobotdataset_to_transitions(dataset=lerobot_dataset, state_keys=state_keys)
-
-        # Initialize the buffer with the first transition to set up storage tensors
-        if list_transition:
-            first_transition = list_transition[0]
-            first_state = {k: v.to(device) for k, v in first_transition["state"].items()}
-            first_action = first_transition["action"].to(device)
-
-            # Get complementary info if available
-            first_complementary_info = None
-            if (
-                "complementary_info" in first_transition
-                and first_transition["complementary_info"] is not None
-            ):
-                first_complementary_info = {
-                    k: v.to(device) for k, v in first_transition["complementary_info"].items()
-                }
-
-            replay_buffer._initialize_storage(
-                state=first_state, action=first_action, complementary_info=first_complementary_info
-            )
-
-        # Fill the buffer with all transitions
-        for data in list_transition:
-            for k, v in data.items():
-                if isinstance(v, dict):
-                    for key, tensor in v.items():
-                        v[key] = tensor.to(storage_device)
-                elif isinstance(v, torch.Tensor):
-                    data[k] = v.to(storage_device)
-
-            action = data["action"]
-
-            replay_buffer.add(
-                state=data["state"],
-                action=action,
-                reward=data["reward"],
-                next_state=data["next_state"],
-                done=data["done"],
-                truncated=False,  # NOTE: Truncation are not supported yet in lerobot dataset
-                complementary_info=data.get("complementary_info", None),
-            )
+        for batch in cls._lerobotdataset_to_batches(dataset=lerobot_dataset, state_keys=state_keys):
+            # NOTE: Truncation are not supported yet in lerobot dataset
+            batch["truncated"] = torch.zeros_like(batch["done"])
+            replay_buffer.add_batch(batch)
 
         return replay_buffer
 
@@ -538,7 +1137,7 @@ class ReplayBuffer:
 
         # Add state keys
         for key in self.states:
-            sample_val = self.states[key][0]
+            sample_val = self._from_storage(key, self.states[key][0])
             f_info = guess_feature_info(t=sample_val, name=key)
             features[key] = f_info
 
@@ -569,14 +1168,12 @@ class ReplayBuffer:
         lerobot_dataset.episode_buffer = lerobot_dataset.create_episode_buffer(episode_index=episode_index)
 
         frame_idx_in_episode = 0
-        for idx in range(self.size):
-            actual_idx = (self.position - self.size + idx) % self.capacity
-
+        for actual_idx in self._ordered_indices():
             frame_dict = {}
 
             # Fill the data for state keys
             for key in self.states:
-                frame_dict[key] = self.states[key][actual_idx].cpu()
+                frame_dict[key] = self._from_storage(key, self.states[key][actual_idx].cpu())
 
             # Fill action, reward, done
             frame_dict["action"] = self.actions[actual_idx].cpu()
@@ -620,12 +1217,13 @@ class ReplayBuffer:
         return lerobot_dataset
 
     @staticmethod
-    def _lerobotdataset_to_transitions(
+    def _lerobotdataset_to_batches(
         dataset: LeRobotDataset,
         state_keys: Sequence[str] | None = None,
-    ) -> list[Transition]:
+        batch_size: int = 1024,
+    ) -> Iterator[BatchTransition]:
         """
-        Convert a LeRobotDataset into a list of RL (s, a, r, s', done) transitions.
+        Convert a LeRobotDataset into batches of RL (s, a, r, s', done) transitions, reading each frame once.
 
         Args:
             dataset (LeRobotDataset):
@@ -645,102 +1243,96 @@ class ReplayBuffer:
                 ["observation.state", "observation.environment_state"].
                 If None, you must handle or define default keys.
 
-        Returns:
-            transitions (List[Transition]):
-                A list of Transition dictionaries with the same length as `dataset`.
+            batch_size (int): Number of frames per batch.
+
+        Yields:
+            BatchTransition: The transitions of `batch_size` consecutive frames of the dataset (or less for the
+                last batch), with `truncated` equal to `done`.
         """
         if state_keys is None:
             raise ValueError("State keys must be provided when converting LeRobotDataset to Transitions.")
 
-        transitions = []
         num_frames = len(dataset)
+        if num_frames == 0:
+            return
 
         # Check if the dataset has "next.done" key
-        sample = dataset[0]
-        has_done_key = "next.done" in sample
+        next_sample = dataset[0]
+        has_done_key = "next.done" in next_sample
 
         # Check for complementary_info keys
-        complementary_info_keys = [key for key in sample if key.startswith("complementary_info.")]
-        has_complementary_info = len(complementary_info_keys) > 0
+        complementary_info_keys = [key for key in next_sample if key.startswith("complementary_info.")]
 
         # If not, we need to infer it from episode boundaries
         if not has_done_key:
             print("'next.done' key not found in dataset. Inferring from episode boundaries...")
 
-        for i in tqdm(range(num_frames)):
-            current_sample = dataset[i]
-
-            # ----- 1) Current state -----
-            current_state: dict[str, torch.Tensor] = {}
-            for key in state_keys:
-                val = current_sample[key]
-                current_state[key] = val.unsqueeze(0)  # Add batch dimension
+        with tqdm(total=num_frames) as progress_bar:
+            for start in range(0, num_frames, batch_size):
+                end = min(start + batch_size, num_frames)
+                samples = [next_sample] + [dataset[i] for i in range(start + 1, end)]
+                # The first frame of the next batch, for the next state of the last transition
+                next_sample = dataset[end] if end < num_frames else None
+                following_samples = samples[1:] + [next_sample]
+
+                same_episode = torch.tensor(
+                    [
+                        following is not None and bool(following["episode_index"] == sample["episode_index"])
+                        for sample, following in zip(samples, following_samples, strict=True)
+                    ]
+                )
+                # Without "next.done", the last frame of each episode is done
+                if has_done_key:
+                    done = torch.stack([sample["next.done"] for sample in samples]).flatten().bool()
+                else:
+                    done = ~same_episode
+
+                # The next state is the state of the next frame if it's in the same episode and the transition
+                # isn't done, the current state otherwise
+                next_state_samples = [
+                    following if use_following else sample
+                    for sample, following, use_following in zip(
+                        samples, following_samples, (same_episode & ~done).tolist(), strict=True
+                    )
+                ]
+
+                yield BatchTransition(
+                    state={key: torch.stack([sample[key] for sample in samples]) for key in state_keys},
+                    action=torch.stack([sample["action"] for sample in samples]),
+                    reward=torch.stack([sample["next.reward"] for sample in samples]).flatten().float(),
+                    next_state={
+                        key: torch.stack([sample[key] for sample in next_state_samples]) for key in state_keys
+                    },
+                    done=done,
+                    # TODO: (azouitine) Handle truncation (using the same value as done for now)
+                    truncated=done.clone(),
+                    complementary_info={
+                        key.removeprefix("complementary_info."): torch.stack(
+                            [torch.as_tensor(sample[key]) for sample in samples]
+                        )
+                        for key in complementary_info_keys
+                    }
+                    or None,
+                )
+                progress_bar.update(end - start)
 
-            # ----- 2) Action -----
-            action = current_sample["action"].unsqueeze(0)  # Add batch dimension
 
-            # ----- 3) Reward and done -----
-            reward = float(current_sample["next.reward"].item())  # ensure float
+def _rows_equal(left: dict[str, torch.Tensor], right: dict[str, torch.Tensor]) -> torch.Tensor:
+    """Whether the states of two batches are equal, for each element of the batches."""
+    equal = None
+    for key, value in left.items():
+        equal_key = (value == right[key]).flatten(start_dim=1).all(dim=1)
+        equal = equal_key if equal is None else equal & equal_key
+    return equal.cpu()
 
-            # Determine done flag - use next.done if available, otherwise infer from episode boundaries
-            if has_done_key:
-                done = bool(current_sample["next.done"].item())  # ensure bool
-            else:
-                # If this is the last frame or if next frame is in a different episode, mark as done
-                done = False
-                if i == num_frames - 1:
-                    done = True
-                elif i < num_frames - 1:
-                    next_sample = dataset[i + 1]
-                    if next_sample["episode_index"] != current_sample["episode_index"]:
-                        done = True
-
-            # TODO: (azouitine) Handle truncation (using the same value as done for now)
-            truncated = done
-
-            # ----- 4) Next state -----
-            # If not done and the next sample is in the same episode, we pull the next sample's state.
-            # Otherwise (done=True or next sample crosses to a new episode), next_state = current_state.
-            next_state = current_state  # default
-            if not done and (i < num_frames - 1):
-                next_sample = dataset[i + 1]
-                if next_sample["episode_index"] == current_sample["episode_index"]:
-                    # Build next_state from the same keys
-                    next_state_data: dict[str, torch.Tensor] = {}
-                    for key in state_keys:
-                        val = next_sample[key]
-                        next_state_data[key] = val.unsqueeze(0)  # Add batch dimension
-                    next_state = next_state_data
-
-            # ----- 5) Complementary info (if available) -----
-            complementary_info = None
-            if has_complementary_info:
-                complementary_info = {}
-                for key in complementary_info_keys:
-                    # Strip the "complementary_info." prefix to get the actual key
-                    clean_key = key[len("complementary_info.") :]
-                    val = current_sample[key]
-                    # Handle tensor and non-tensor values differently
-                    if isinstance(val, torch.Tensor):
-                        complementary_info[clean_key] = val.unsqueeze(0)  # Add batch dimension
-                    else:
-                        # TODO: (azouitine) Check if it's necessary to convert to tensor
-                        # For non-tensor values, use directly
-                        complementary_info[clean_key] = val
-
-            # ----- Construct the Transition -----
-            transition = Transition(
-                state=current_state,
-                action=action,
-                reward=reward,
-                next_state=next_state,
-                done=done,
-                truncated=truncated,
-                complementary_info=complementary_info,
-            )
-            transitions.append(transition)
 
-        return transitions
+def _iter_tensors(obj):
+    """Yields the tensors of a (nested) batch."""
+    if isinstance(obj, torch.Tensor):
+        yield obj
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            yield from _iter_tensors(value)
 
 
 # Utility function to guess shapes/dtypes from a tensor
@@ -766,6 +1358,34 @@ def guess_feature_info(t, name: str):
         }
 
 
+def stack_transitions(transitions: list[Transition]) -> BatchTransition:
+    """
+    Stacks transitions, whose tensors have a batch dimension of 1, into a BatchTransition.
+
+    Only the keys of `complementary_info` common to all the transitions are kept.
+    """
+    complementary_infos = [transition.get("complementary_info") or {} for transition in transitions]
+    complementary_info_keys = [
+        key for key in complementary_infos[0] if all(key in info for info in complementary_infos[1:])
+    ]
+    complementary_info = {
+        key: torch.stack([torch.as_tensor(info[key]).squeeze(dim=0) for info in complementary_infos])
+        for key in complementary_info_keys
+    }
+    return BatchTransition(
+        state={key: torch.cat([t["state"][key] for t in transitions]) for key in transitions[0]["state"]},
+        action=torch.cat([t["action"] for t in transitions]),
+        reward=torch.tensor([float(t["reward"]) for t in transitions]),
+        next_state={
+            key: torch.cat([t["next_state"][key] for t in transitions])
+            for key in transitions[0]["next_state"]
+        },
+        done=torch.tensor([bool(t["done"]) for t in transitions]),
+        truncated=torch.tensor([bool(t["truncated"]) for t in transitions]),
+        complementary_info=complementary_info or None,
+    )
+
+
 def concatenate_batch_transitions(
     left_batch_transitions: BatchTransition, right_batch_transition: BatchTransition
 ) -> BatchTransition:
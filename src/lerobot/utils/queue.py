@@ -50,3 +50,24 @@ def get_last_item_from_queue(queue: Queue, block=True, timeout: float = 0.1) ->
             item = queue.get_nowait()
 
     return item
+
+
+def get_all_items_from_queue(queue: Queue) -> list[Any]:
+    """Drains the queue without blocking and returns its items in order, for consumers which can't skip any of
+    them (unlike `get_last_item_from_queue`)."""
+    items = []
+    if platform.system() == "Darwin":
+        # On Mac, avoid using `qsize` (see `get_last_item_from_queue`)
+        try:
+            while True:
+                items.append(queue.get_nowait())
+        except Empty:
+            pass
+
+        return items
+
+    while queue.qsize() > 0:
+        with suppress(Empty):
+            items.append(queue.get_nowait())
+
+    return items
@@ -24,11 +24,15 @@ from lerobot.scripts.server.helpers import (
     FPSTracker,
     TimedAction,
     TimedObservation,
+    bytes_to_timed_actions,
+    bytes_to_timed_observation,
     observations_similar,
     prepare_image,
     prepare_raw_observation,
     raw_observation_to_observation,
     resize_robot_observation_image,
+    timed_actions_to_bytes,
+    timed_observation_to_bytes,
 )
 
 # ---------------------------------------------------------------------
@@ -164,6 +168,54 @@ def test_timed_data_deserialization_data_getters():
     torch.testing.assert_close(to_out.get_observation()["observation.state"], obs_dict["observation.state"])
 
 
+def test_timed_observation_tensor_wire_format():
+    """Raw robot observations survive a round-trip through the tensor wire format."""
+    obs_dict = {
+        "shoulder_pan.pos": 0.5,
+        "elbow_flex.pos": np.float32(-1.25),
+        "laptop": np.random.randint(0, 256, (48, 64, 3), dtype=np.uint8),
+        "task": "Pick up the cube",
+    }
+    to_in = TimedObservation(timestamp=time.time(), observation=obs_dict, timestep=7, must_go=True)
+
+    to_out = bytes_to_timed_observation(timed_observation_to_bytes(to_in))
+
+    assert to_out.get_timestamp() == to_in.get_timestamp()
+    assert to_out.get_timestep() == 7
+    assert to_out.must_go is True
+    observation = to_out.get_observation()
+    assert observation.keys() == obs_dict.keys()
+    assert observation["shoulder_pan.pos"] == 0.5
+    assert observation["elbow_flex.pos"] == -1.25
+    assert observation["task"] == "Pick up the cube"
+    np.testing.assert_array_equal(observation["laptop"], obs_dict["laptop"])
+
+    # Compressed camera frames keep their shape
+    to_out = bytes_to_timed_observation(timed_observation_to_bytes(to_in, image_encoding="jpeg"))
+    assert to_out.get_observation()["laptop"].shape == (48, 64, 3)
+
+    # Observations pickled by older clients are still accepted
+    to_out = bytes_to_timed_observation(pickle.dumps(to_in))  # nosec
+    assert to_out.get_timestep() == 7
+
+
+def test_timed_actions_wire_formats():
+    """Action chunks survive a round-trip in both wire formats."""
+    ts = time.time()
+    timed_actions = [TimedAction(timestamp=ts + i, action=torch.randn(6), timestep=3 + i) for i in range(4)]
+
+    for wire_format in ["tensors", "pickle"]:
+        decoded = bytes_to_timed_actions(timed_actions_to_bytes(timed_actions, wire_format))
+
+        assert len(decoded) == len(timed_actions)
+        for ta_out, ta_in in zip(decoded, timed_actions, strict=True):
+            assert ta_out.get_timestamp() == ta_in.get_timestamp()
+            assert ta_out.get_timestep() == ta_in.get_timestep()
+            torch.testing.assert_close(ta_out.get_action(), ta_in.get_action())
+
+    assert bytes_to_timed_actions(timed_actions_to_bytes([])) == []
+
+
 # ---------------------------------------------------------------------
 # observations_similar()
 # ---------------------------------------------------------------------
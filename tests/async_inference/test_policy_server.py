@@ -213,3 +213,91 @@ def test_predict_action_chunk(monkeypatch, policy_server):
     for i, ta in enumerate(timed_actions):
         expected_ts = obs.get_timestamp() + i * policy_server.config.environment_dt
         assert abs(ta.get_timestamp() - expected_ts) < 1e-6
+
+
+class MockContext:
+    """A minimal mock for a gRPC servicer context, carrying the session ID of a client."""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+
+    def peer(self) -> str:
+        return f"ipv4:127.0.0.1:{self.session_id}"
+
+    def invocation_metadata(self):
+        return (("session_id", self.session_id),)
+
+
+@require_package("grpc")
+def test_batched_policy_server(monkeypatch):
+    """Observations of several clients are run through the policy as one batch, and each client gets its chunk."""
+    import threading
+
+    from lerobot.scripts.server.configs import PolicyServerConfig
+    from lerobot.scripts.server.helpers import bytes_to_timed_actions
+    from lerobot.scripts.server.policy_server import BatchedPolicyServer
+    from lerobot.transport import async_inference_pb2
+
+    server = BatchedPolicyServer(
+        PolicyServerConfig(
+            host="localhost", port=9999, max_clients=2, batch_window_s=1.0, inference_latency=0
+        )
+    )
+    policy = MockPolicy()
+    batch_sizes = []
+
+    def predict_action_chunk(observation):
+        batch_sizes.append(len(observation["observation.state"]))
+        # Each action chunk is filled with the first joint of its observation
+        return observation["observation.state"][:, :1, None].expand(-1, 20, 6)
+
+    monkeypatch.setattr(policy, "predict_action_chunk", predict_action_chunk)
+    server.policy, server.policy_type, server.device = policy, "act", "cpu"
+
+    contexts = [MockContext("robot_a"), MockContext("robot_b")]
+    for i, context in enumerate(contexts):
+        server.Ready(async_inference_pb2.Empty(), context)
+        session = server.sessions[context.session_id]
+        session.lerobot_features = {
+            "observation.state": {
+                "dtype": "float32",
+                "shape": [6],
+                "names": [f"joint{j}" for j in range(1, 7)],
+            }
+        }
+        session.actions_per_chunk = 10 + i
+        assert server._enqueue_session_observation(session, _make_obs(torch.full((6,), float(i)), timestep=i))
+
+    results = {}
+
+    def get_actions(context):
+        results[context.session_id] = server.GetActions(async_inference_pb2.Empty(), context)
+
+    threads = [threading.Thread(target=get_actions, args=(context,)) for context in contexts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    server.stop()
+
+    # Both clients were served by a single batch, without waiting for the whole batch window
+    assert batch_sizes == [2]
+    for i, context in enumerate(contexts):
+        timed_actions = bytes_to_timed_actions(results[context.session_id].data)
+        assert len(timed_actions) == 10 + i
+        assert timed_actions[0].get_timestep() == i
+        assert torch.all(timed_actions[0].get_action() == i)
+
+
+@require_package("grpc")
+def test_batched_policy_server_max_clients():
+    """The least recently active session is dropped when too many clients connect."""
+    from lerobot.scripts.server.configs import PolicyServerConfig
+    from lerobot.scripts.server.policy_server import BatchedPolicyServer
+    from lerobot.transport import async_inference_pb2
+
+    server = BatchedPolicyServer(PolicyServerConfig(host="localhost", port=9999, max_clients=2))
+    for session_id in ["robot_a", "robot_b", "robot_a", "robot_c"]:
+        server.Ready(async_inference_pb2.Empty(), MockContext(session_id))
+    assert set(server.sessions) == {"robot_a", "robot_c"}
+    server.stop()
@@ -30,6 +30,7 @@ from safetensors.torch import load_file
 import lerobot
 from lerobot.configs.default import DatasetConfig
 from lerobot.configs.train import TrainPipelineConfig
+from lerobot.datasets import lerobot_dataset
 from lerobot.datasets.factory import make_dataset
 from lerobot.datasets.image_writer import image_array_to_pil_image
 from lerobot.datasets.lerobot_dataset import (
@@ -43,7 +44,7 @@ from lerobot.datasets.utils import (
 )
 from lerobot.envs.factory import make_env_config
 from lerobot.policies.factory import make_policy_config
-from tests.fixtures.constants import DUMMY_CHW, DUMMY_HWC, DUMMY_REPO_ID
+from tests.fixtures.constants import DEFAULT_FPS, DUMMY_CHW, DUMMY_HWC, DUMMY_REPO_ID
 from tests.utils import require_x86_64_kernel
 
 
@@ -99,6 +100,66 @@ def test_dataset_initialization(tmp_path, lerobot_dataset_factory):
     assert dataset.num_frames == len(dataset)
 
 
+def test_getitems_decodes_each_video_once(tmp_path, lerobot_dataset_factory, monkeypatch):
+    decode_calls = []
+
+    def mock_decode_video_frames(video_path, timestamps, tolerance_s, backend=None, decoder_cache=None):
+        decode_calls.append((str(video_path), list(timestamps)))
+        return torch.stack([torch.full(DUMMY_CHW, ts) for ts in timestamps])
+
+    monkeypatch.setattr("lerobot.datasets.lerobot_dataset.decode_video_frames", mock_decode_video_frames)
+    dataset = lerobot_dataset_factory(
+        root=tmp_path / "test",
+        total_episodes=2,
+        total_frames=20,
+        delta_timestamps={"laptop": [-1 / DEFAULT_FPS, 0.0]},
+        video_backend="torchcodec",
+    )
+    indices = [0, 1, 2, 3, 12, 13]
+
+    expected = [dataset[idx] for idx in indices]
+    decode_calls.clear()
+    batch = dataset.__getitems__(indices)
+
+    # One decoding call per (episode, camera)
+    assert len(decode_calls) == 2 * len(dataset.meta.video_keys)
+    assert len(batch) == len(expected)
+    for item, expected_item in zip(batch, expected, strict=True):
+        assert item.keys() == expected_item.keys()
+        for key, val in expected_item.items():
+            if isinstance(val, torch.Tensor):
+                assert torch.equal(item[key], val), key
+            else:
+                assert item[key] == val, key
+
+
+def test_delta_timestamps_query(tmp_path, info_factory, lerobot_dataset_factory):
+    deltas = [-2, -1, 0, 1]
+    dataset = lerobot_dataset_factory(
+        root=tmp_path / "test",
+        info=info_factory(total_episodes=2, total_frames=20, total_tasks=1, use_videos=False),
+        delta_timestamps={"action": [d / DEFAULT_FPS for d in deltas], "index": [0.0, 1 / DEFAULT_FPS]},
+    )
+    ep_from = dataset.episode_data_index["from"].tolist()
+    ep_to = dataset.episode_data_index["to"].tolist()
+
+    batch = dataset.__getitems__(list(range(len(dataset))))
+    for idx, item in enumerate(batch):
+        ep_idx = dataset.hf_dataset[idx]["episode_index"].item()
+        start, end = ep_from[ep_idx], ep_to[ep_idx]
+        query = [min(max(idx + d, start), end - 1) for d in deltas]
+        expected_action = torch.stack(dataset.hf_dataset.select(query)["action"])
+        expected_pad = torch.BoolTensor([not start <= idx + d < end for d in deltas])
+
+        assert item["action"].dtype == expected_action.dtype
+        assert torch.equal(item["action"], expected_action)
+        assert torch.equal(item["action_is_pad"], expected_pad)
+        assert item["index"].tolist() == [idx, min(idx + 1, end - 1)]
+        assert torch.equal(item["index_is_pad"], torch.BoolTensor([False, idx + 1 >= end]))
+        for key in ["action", "action_is_pad", "index", "index_is_pad"]:
+            assert torch.equal(dataset[idx][key], item[key])
+
+
 def test_add_frame_missing_feature(tmp_path, empty_lerobot_dataset_factory):
     features = {"state": {"dtype": "float32", "shape": (1,), "names": None}}
     dataset = empty_lerobot_dataset_factory(root=tmp_path / "test", features=features)
@@ -306,6 +367,50 @@ def test_add_frame_image_pil(image_dataset):
     assert dataset[0]["image"].shape == torch.Size(DUMMY_CHW)
 
 
+@pytest.mark.parametrize("num_workers", [0, 2])
+def test_batch_encode_videos_failure_isolation(tmp_path, empty_lerobot_dataset_factory, num_workers):
+    camera_ft = {"dtype": "video", "shape": (32, 48, 3), "names": ["height", "width", "channels"]}
+    features = {"cam_1": camera_ft, "cam_2": camera_ft}
+    dataset = empty_lerobot_dataset_factory(root=tmp_path / "test", features=features, batch_encoding_size=3)
+    for _ in range(2):
+        for _ in range(3):
+            frame = {key: np.random.randint(0, 256, (32, 48, 3), dtype=np.uint8) for key in features}
+            dataset.add_frame(frame, task="Dummy task")
+        dataset.save_episode()
+    assert len(list(dataset.root.rglob("*.mp4"))) == 0
+
+    # corrupt the images of one of the videos to encode
+    corrupted_img_dir = dataset._get_image_file_path(episode_index=1, image_key="cam_2", frame_index=0).parent
+    for img_path in corrupted_img_dir.iterdir():
+        img_path.write_bytes(b"")
+
+    with pytest.raises(RuntimeError, match="Failed to encode 1/4 videos"):
+        dataset.batch_encode_videos(0, 2, num_workers=num_workers, num_threads_per_encoder=1)
+
+    assert len(list(dataset.root.rglob("*.mp4"))) == 3
+    assert not (dataset.root / dataset.meta.get_video_file_path(1, "cam_2")).exists()
+    assert corrupted_img_dir.is_dir()
+    assert dataset.meta.info["features"]["cam_1"]["info"]["video.width"] == 48
+
+
+def test_encode_episode_videos_in_threads(tmp_path, empty_lerobot_dataset_factory, monkeypatch):
+    camera_ft = {"dtype": "video", "shape": (32, 48, 3), "names": ["height", "width", "channels"]}
+    features = {"cam_1": camera_ft, "cam_2": camera_ft}
+    dataset = empty_lerobot_dataset_factory(root=tmp_path / "test", features=features)
+
+    def no_process_pool(*args, **kwargs):
+        raise AssertionError("The videos of a single episode must not be encoded in a process pool")
+
+    # The recording process must not be forked for every episode
+    monkeypatch.setattr(lerobot_dataset, "ProcessPoolExecutor", no_process_pool)
+    for _ in range(3):
+        frame = {key: np.random.randint(0, 256, (32, 48, 3), dtype=np.uint8) for key in features}
+        dataset.add_frame(frame, task="Dummy task")
+    dataset.save_episode()
+
+    assert len(list(dataset.root.rglob("*.mp4"))) == 2
+
+
 def test_image_array_to_pil_image_wrong_range_float_0_255():
     image = np.random.rand(*DUMMY_HWC) * 255
     with pytest.raises(ValueError):
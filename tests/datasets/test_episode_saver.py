@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import pytest
+
+from lerobot.datasets.episode_saver import JOURNAL_DIR, load_journal
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.datasets.video_utils import get_partial_video_path
+from tests.fixtures.constants import DUMMY_REPO_ID
+
+FEATURES = {
+    "state": {"dtype": "float32", "shape": (2,), "names": None},
+    "cam": {"dtype": "video", "shape": (32, 48, 3), "names": ["height", "width", "channels"]},
+}
+
+
+def add_episode(dataset, num_frames=4):
+    for i in range(num_frames):
+        frame = {
+            "state": np.full(2, i, dtype=np.float32),
+            "cam": np.full((32, 48, 3), 8 * i, dtype=np.uint8),
+        }
+        dataset.add_frame(frame, task="Dummy task")
+
+
+@pytest.mark.parametrize("streaming_encoding", [False, True])
+def test_async_saving(tmp_path, empty_lerobot_dataset_factory, streaming_encoding):
+    dataset = empty_lerobot_dataset_factory(
+        root=tmp_path / "test", features=FEATURES, streaming_encoding=streaming_encoding
+    )
+    dataset.start_async_saving(max_queue_size=1)
+    for _ in range(3):
+        add_episode(dataset)
+        dataset.save_episode()
+    # a discarded episode keeps the index of the next episode to save
+    add_episode(dataset, num_frames=2)
+    dataset.clear_episode_buffer()
+    assert dataset.episode_buffer["episode_index"] == 3
+
+    dataset.stop_async_saving()
+    dataset.stop_video_encoders()
+    assert dataset.num_episodes == 3
+    assert dataset.num_frames == 12
+    assert dataset.hf_dataset["index"][-1].item() == 11
+    assert [ep["episode_index"] for ep in dataset.meta.episodes.values()] == [0, 1, 2]
+    assert all((dataset.root / dataset.meta.get_video_file_path(ep, "cam")).is_file() for ep in range(3))
+    assert load_journal(dataset.root) == []
+
+
+def test_journaled_episodes_are_saved_on_resume(tmp_path, empty_lerobot_dataset_factory, monkeypatch):
+    dataset = empty_lerobot_dataset_factory(root=tmp_path / "test", features=FEATURES)
+    add_episode(dataset)
+    dataset.save_episode()
+
+    def crash(*args, **kwargs):
+        raise RuntimeError("Crash while saving")
+
+    dataset.start_async_saving()
+    monkeypatch.setattr(dataset, "_save_episode", crash)
+    for _ in range(2):
+        add_episode(dataset)
+        dataset.save_episode()
+    with pytest.raises(RuntimeError, match="kept in"):
+        dataset.stop_async_saving()
+
+    assert [episode_index for episode_index, _ in load_journal(dataset.root)] == [1, 2]
+    assert dataset.num_episodes == 1
+
+    resumed = LeRobotDataset(DUMMY_REPO_ID, root=dataset.root)
+    resumed.save_journaled_episodes()
+    assert resumed.num_episodes == 3
+    assert resumed.num_frames == 12
+    assert not any((resumed.root / JOURNAL_DIR).iterdir())
+
+
+def test_journaled_episodes_with_unfinalized_videos_are_dropped(
+    tmp_path, empty_lerobot_dataset_factory, monkeypatch
+):
+    dataset = empty_lerobot_dataset_factory(
+        root=tmp_path / "test", features=FEATURES, streaming_encoding=True
+    )
+    add_episode(dataset)
+    dataset.save_episode()
+
+    def crash(*args, **kwargs):
+        raise RuntimeError("Crash while saving")
+
+    dataset.start_async_saving()
+    monkeypatch.setattr(dataset, "_save_episode", crash)
+    for _ in range(2):
+        add_episode(dataset)
+        dataset.save_episode()
+    with pytest.raises(RuntimeError, match="kept in"):
+        dataset.stop_async_saving()
+    dataset.stop_video_encoders()
+
+    # The recording was interrupted before the video of episode 1 was finalized
+    video_path = dataset.root / dataset.meta.get_video_file_path(1, "cam")
+    part_path = get_partial_video_path(video_path)
+    video_path.rename(part_path)
+
+    resumed = LeRobotDataset(DUMMY_REPO_ID, root=dataset.root)
+    resumed.save_journaled_episodes()
+    assert resumed.num_episodes == 1
+    assert load_journal(resumed.root) == []
+    assert not part_path.exists()
+    # Episode 2 is dropped as well, and its video removed
+    assert not (resumed.root / resumed.meta.get_video_file_path(2, "cam")).exists()
+
+    # The recording can go on
+    resumed.start_video_encoders()
+    add_episode(resumed)
+    resumed.save_episode()
+    resumed.stop_video_encoders()
+    assert resumed.num_episodes == 2
+    assert resumed.num_frames == 8
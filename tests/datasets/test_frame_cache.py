@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import pickle
+
+import av
+import numpy as np
+import pytest
+import torch
+
+from lerobot.datasets.frame_cache import FRAME_CACHE_DIR, FrameCache
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.datasets.utils import INFO_PATH
+from tests.fixtures.constants import DEFAULT_FPS, DUMMY_REPO_ID
+
+
+def write_dummy_video(video_path, num_frames, fps=DEFAULT_FPS, height=32, width=48):
+    """Writes a video in which frame i is uniformly filled with the value 8 * i."""
+    video_path.parent.mkdir(parents=True, exist_ok=True)
+    with av.open(str(video_path), "w") as output:
+        stream = output.add_stream("libx264", fps, options={"crf": "0"})
+        stream.pix_fmt = "yuv420p"
+        stream.width = width
+        stream.height = height
+        for i in range(num_frames):
+            img = np.full((height, width, 3), 8 * i % 256, dtype=np.uint8)
+            output.mux(stream.encode(av.VideoFrame.from_ndarray(img, format="rgb24")))
+        output.mux(stream.encode())
+
+
+@pytest.fixture
+def video_dataset(tmp_path, lerobot_dataset_factory):
+    root = tmp_path / "test"
+    dataset = lerobot_dataset_factory(root=root, total_episodes=2, total_frames=20)
+    for ep_idx, episode in dataset.meta.episodes.items():
+        for key in dataset.meta.video_keys:
+            write_dummy_video(root / dataset.meta.get_video_file_path(ep_idx, key), episode["length"])
+    return dataset
+
+
+def load_dataset(dataset, **kwargs):
+    return LeRobotDataset(DUMMY_REPO_ID, root=dataset.root, **kwargs)
+
+
+def test_frame_cache_missing(video_dataset):
+    with pytest.raises(FileNotFoundError):
+        load_dataset(video_dataset, use_frame_cache=True)
+
+
+def test_frame_cache_serves_frames(video_dataset):
+    video_dataset.build_frame_cache()
+    dataset = load_dataset(
+        video_dataset, use_frame_cache=True, delta_timestamps={"laptop": [-1 / DEFAULT_FPS, 0]}
+    )
+    assert (dataset.root / FRAME_CACHE_DIR / "index.json").is_file()
+
+    for idx in range(len(dataset)):
+        item = dataset[idx]
+        frame_index = item["frame_index"].item()
+        assert item["laptop"].shape == (2, 3, 32, 48)
+        assert item["phone"].shape == (3, 32, 48)
+        expected = torch.tensor([max(frame_index - 1, 0), frame_index]) * 8 / 255
+        assert torch.allclose(item["laptop"].mean(dim=(1, 2, 3)), expected, atol=2 / 255)
+        assert torch.allclose(item["phone"].mean(), expected[1], atol=2 / 255)
+
+    batch = dataset.__getitems__(list(range(len(dataset))))
+    for idx, item in enumerate(batch):
+        assert torch.equal(item["laptop"], dataset[idx]["laptop"])
+
+
+def test_frame_cache_resize(video_dataset):
+    video_dataset.build_frame_cache(resize=(16, 24))
+    dataset = load_dataset(video_dataset, use_frame_cache=True)
+    assert dataset[0]["laptop"].shape == (3, 16, 24)
+
+
+def test_frame_cache_tolerance(video_dataset):
+    video_dataset.build_frame_cache()
+    cache = FrameCache.load(video_dataset.root)
+    video_path = video_dataset.meta.get_video_file_path(0, "laptop")
+    frames = cache.get_frames(video_path, [0.0, 1 / DEFAULT_FPS], tolerance_s=1e-4)
+    assert frames.shape == (2, 3, 32, 48)
+    assert frames.dtype == torch.float32
+    with pytest.raises(AssertionError):
+        cache.get_frames(video_path, [0.5 / DEFAULT_FPS], tolerance_s=1e-4)
+
+
+def test_frame_cache_invalidation(video_dataset):
+    video_dataset.build_frame_cache()
+    load_dataset(video_dataset, use_frame_cache=True)
+
+    info_path = video_dataset.root / INFO_PATH
+    info_path.write_text(info_path.read_text() + "\n")
+    with pytest.raises(ValueError):
+        load_dataset(video_dataset, use_frame_cache=True)
+
+    video_dataset.build_frame_cache()
+    video_path = video_dataset.root / video_dataset.meta.get_video_file_path(1, "phone")
+    stat = video_path.stat()
+    os.utime(video_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    with pytest.raises(ValueError):
+        load_dataset(video_dataset, use_frame_cache=True)
+
+
+def test_frame_cache_pickle(video_dataset):
+    video_dataset.build_frame_cache()
+    cache = FrameCache.load(video_dataset.root)
+    video_path = video_dataset.meta.get_video_file_path(0, "laptop")
+    frames = cache.get_frames(video_path, [0.0], tolerance_s=1e-4)
+
+    restored = pickle.loads(pickle.dumps(cache))
+    assert restored._arrays == {}
+    assert torch.equal(restored.get_frames(video_path, [0.0], tolerance_s=1e-4), frames)
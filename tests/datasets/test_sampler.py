@@ -13,10 +13,12 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from itertools import chain
+
 from datasets import Dataset
 
 from lerobot.datasets.push_dataset_to_hub.utils import calculate_episode_data_index
-from lerobot.datasets.sampler import EpisodeAwareSampler
+from lerobot.datasets.sampler import EpisodeAwareSampler, EpisodeWindowBatchSampler
 from lerobot.datasets.utils import (
     hf_transform_to_torch,
 )
@@ -88,3 +90,67 @@ def test_shuffle():
     assert sampler.indices == [0, 1, 2, 3, 4, 5]
     assert len(sampler) == 6
     assert set(sampler) == {0, 1, 2, 3, 4, 5}
+
+
+def test_episode_window_batch_sampler():
+    dataset = Dataset.from_dict(
+        {
+            "timestamp": [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8],
+            "index": [0, 1, 2, 3, 4, 5, 6, 7],
+            "episode_index": [0, 0, 0, 1, 1, 2, 2, 2],
+        },
+    )
+    dataset.set_transform(hf_transform_to_torch)
+    episode_data_index = calculate_episode_data_index(dataset)
+    sampler = EpisodeWindowBatchSampler(
+        episode_data_index, episodes_per_batch=2, frames_per_episode=2, shuffle=False
+    )
+    assert sampler.batch_size == 4
+    assert len(sampler) == 2
+    assert list(sampler) == [[0, 1, 2, 3], [4, 5, 6, 7]]
+
+    sampler = EpisodeWindowBatchSampler(
+        episode_data_index, episodes_per_batch=2, frames_per_episode=2, shuffle=False, drop_last=True
+    )
+    assert len(sampler) == 2
+    assert list(sampler) == [[0, 1, 2, 3], [4, 5, 6, 7]]
+
+
+def test_episode_window_batch_sampler_drop_frames():
+    dataset = Dataset.from_dict(
+        {
+            "timestamp": [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8],
+            "index": [0, 1, 2, 3, 4, 5, 6, 7],
+            "episode_index": [0, 0, 0, 1, 1, 2, 2, 2],
+        },
+    )
+    dataset.set_transform(hf_transform_to_torch)
+    episode_data_index = calculate_episode_data_index(dataset)
+    sampler = EpisodeWindowBatchSampler(
+        episode_data_index,
+        episodes_per_batch=1,
+        frames_per_episode=2,
+        episode_indices_to_use=[0, 2],
+        drop_n_last_frames=1,
+        shuffle=False,
+        drop_last=True,
+    )
+    assert len(sampler) == 2
+    assert list(sampler) == [[0, 1], [5, 6]]
+
+
+def test_episode_window_batch_sampler_shuffle():
+    dataset = Dataset.from_dict(
+        {
+            "timestamp": [0.1 * i for i in range(30)],
+            "index": list(range(30)),
+            "episode_index": [0] * 10 + [1] * 12 + [2] * 8,
+        },
+    )
+    dataset.set_transform(hf_transform_to_torch)
+    episode_data_index = calculate_episode_data_index(dataset)
+    sampler = EpisodeWindowBatchSampler(episode_data_index, episodes_per_batch=2, frames_per_episode=3)
+    batches = list(sampler)
+    assert len(batches) == len(sampler) == 5
+    assert all(len(batch) == 6 for batch in batches)
+    assert sorted(chain.from_iterable(batches)) == list(range(30))
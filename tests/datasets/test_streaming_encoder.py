@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import pytest
+
+from lerobot.datasets.streaming_encoder import StreamingVideoEncoder
+from lerobot.datasets.video_utils import decode_all_video_frames
+from tests.fixtures.constants import DEFAULT_FPS
+
+HEIGHT, WIDTH = 32, 48
+
+
+def make_frame(i: int) -> np.ndarray:
+    return np.full((HEIGHT, WIDTH, 3), 8 * i % 256, dtype=np.uint8)
+
+
+@pytest.fixture
+def encoder():
+    encoder = StreamingVideoEncoder(DEFAULT_FPS, HEIGHT, WIDTH, num_slots=4)
+    yield encoder
+    encoder.stop()
+
+
+@pytest.fixture
+def video_dataset(tmp_path, empty_lerobot_dataset_factory):
+    features = {
+        "state": {"dtype": "float32", "shape": (2,), "names": None},
+        "cam": {"dtype": "video", "shape": (HEIGHT, WIDTH, 3), "names": ["height", "width", "channels"]},
+    }
+    dataset = empty_lerobot_dataset_factory(
+        root=tmp_path / "test", features=features, streaming_encoding=True
+    )
+    yield dataset
+    dataset.stop_video_encoders()
+
+
+def test_streaming_encoder(tmp_path, encoder):
+    video_path = tmp_path / "videos" / "episode_000000.mp4"
+    encoder.start_episode(video_path)
+    # more frames than slots, so that the ring buffer wraps around
+    for i in range(10):
+        encoder.add_frame(make_frame(i))
+    ep_stats = encoder.finish_episode()
+
+    assert video_path.is_file()
+    assert not video_path.with_name(video_path.name + ".part").exists()
+    frames, timestamps = decode_all_video_frames(video_path)
+    assert frames.shape == (10, 3, HEIGHT, WIDTH)
+    np.testing.assert_allclose(timestamps, np.arange(10) / DEFAULT_FPS, atol=1e-4)
+    np.testing.assert_allclose(frames.mean(axis=(1, 2, 3)), 8 * np.arange(10), atol=2)
+
+    assert ep_stats["count"] == np.array([10])
+    assert ep_stats["mean"].shape == (3, 1, 1)
+    np.testing.assert_allclose(ep_stats["max"], 72 / 255, atol=1e-6)
+
+
+def test_streaming_encoder_cancel(tmp_path, encoder):
+    video_path = tmp_path / "episode_000000.mp4"
+    encoder.start_episode(video_path)
+    encoder.add_frame(make_frame(0))
+    encoder.cancel_episode()
+    assert list(tmp_path.iterdir()) == []
+
+    # the encoder can be reused afterwards
+    encoder.start_episode(video_path)
+    encoder.add_frame(make_frame(0))
+    encoder.finish_episode()
+    assert video_path.is_file()
+
+
+def test_streaming_encoder_wrong_shape(tmp_path, encoder):
+    with pytest.raises(RuntimeError):
+        encoder.add_frame(make_frame(0))
+    encoder.start_episode(tmp_path / "episode_000000.mp4")
+    with pytest.raises(ValueError):
+        encoder.add_frame(np.zeros((HEIGHT, WIDTH + 2, 3), dtype=np.uint8))
+
+
+def test_dataset_streaming_encoding(video_dataset):
+    for _ in range(2):
+        for i in range(5):
+            video_dataset.add_frame(
+                {"state": np.zeros(2, dtype=np.float32), "cam": make_frame(i)}, task="Dummy"
+            )
+        video_dataset.save_episode()
+
+    # an episode which is discarded doesn't leave a video behind
+    video_dataset.add_frame({"state": np.zeros(2, dtype=np.float32), "cam": make_frame(0)}, task="Dummy")
+    video_dataset.clear_episode_buffer()
+
+    assert not (video_dataset.root / "images").exists()
+    assert len(list(video_dataset.root.rglob("*.mp4"))) == 2
+    assert not list(video_dataset.root.rglob("*.part"))
+    assert video_dataset.meta.info["features"]["cam"]["info"]["video.height"] == HEIGHT
+    assert video_dataset.meta.episodes_stats[1]["cam"]["count"] == np.array([5])
+
+    frames, _ = decode_all_video_frames(video_dataset.root / video_dataset.meta.get_video_file_path(1, "cam"))
+    assert frames.shape == (5, 3, HEIGHT, WIDTH)
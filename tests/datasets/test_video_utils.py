@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pickle
+
+import numpy as np
+import PIL.Image
+import pytest
+
+from lerobot.datasets import video_utils
+from lerobot.datasets.video_utils import VideoDecoderCache
+
+
+@pytest.fixture
+def fake_decoders(monkeypatch):
+    opened, closed = [], []
+
+    def open_decoder(video_path, backend, device="cpu"):
+        decoder = object()
+        opened.append(str(video_path))
+        return decoder
+
+    def close_decoder(decoder, backend):
+        closed.append(decoder)
+
+    monkeypatch.setattr(video_utils, "_open_video_decoder", open_decoder)
+    monkeypatch.setattr(video_utils, "_close_video_decoder", close_decoder)
+    return opened, closed
+
+
+def test_decoder_cache_invalid_size():
+    with pytest.raises(ValueError):
+        VideoDecoderCache(max_size=0)
+
+
+def test_decoder_cache_hits_and_misses(fake_decoders):
+    opened, _ = fake_decoders
+    cache = VideoDecoderCache(max_size=2)
+
+    first = cache.get("a.mp4", "torchcodec")
+    assert cache.get("a.mp4", "torchcodec") is first
+    assert opened == ["a.mp4"]
+    assert cache.stats == {"size": 1, "hits": 1, "misses": 1, "evictions": 0}
+    assert "a.mp4" in cache
+
+
+def test_decoder_cache_lru_eviction(fake_decoders):
+    opened, closed = fake_decoders
+    cache = VideoDecoderCache(max_size=2)
+
+    decoder_a = cache.get("a.mp4", "torchcodec")
+    cache.get("b.mp4", "torchcodec")
+    cache.get("a.mp4", "torchcodec")  # "b.mp4" is now the least recently used
+    cache.get("c.mp4", "torchcodec")
+
+    assert len(cache) == 2
+    assert "a.mp4" in cache
+    assert "b.mp4" not in cache
+    assert cache.evictions == 1
+    assert len(closed) == 1 and closed[0] is not decoder_a
+
+    cache.clear()
+    assert len(cache) == 0
+    assert len(closed) == 3
+    assert opened == ["a.mp4", "b.mp4", "c.mp4"]
+
+
+def test_decoder_cache_is_emptied_when_pickled(fake_decoders):
+    cache = VideoDecoderCache(max_size=2)
+    cache.get("a.mp4", "pyav")
+
+    restored = pickle.loads(pickle.dumps(cache))
+    assert len(restored) == 0
+    assert restored.max_size == 2
+    assert len(cache) == 1
+
+
+def write_frames(imgs_dir, num_frames=3):
+    imgs_dir.mkdir(parents=True)
+    for i in range(num_frames):
+        PIL.Image.fromarray(np.full((32, 48, 3), 40 * i, dtype=np.uint8)).save(
+            imgs_dir / f"frame_{i:06d}.png"
+        )
+
+
+def test_encode_video_frames_is_atomic(tmp_path, monkeypatch):
+    imgs_dir, video_path = tmp_path / "images", tmp_path / "videos" / "episode_000000.mp4"
+    write_frames(imgs_dir)
+
+    def crash(*args, **kwargs):
+        raise RuntimeError("Crash while encoding")
+
+    with monkeypatch.context() as m:
+        m.setattr(video_utils.av.VideoFrame, "from_image", crash)
+        with pytest.raises(RuntimeError):
+            video_utils.encode_video_frames(imgs_dir, video_path, fps=30)
+    # No truncated video is left behind
+    assert not video_path.exists()
+    assert not video_utils.get_partial_video_path(video_path).exists()
+
+    video_utils.encode_video_frames(imgs_dir, video_path, fps=30, overwrite=True)
+    assert video_path.is_file()
+    assert not video_utils.get_partial_video_path(video_path).exists()
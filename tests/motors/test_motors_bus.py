@@ -21,6 +21,7 @@ import pytest
 
 from lerobot.motors.motors_bus import (
     Motor,
+    MotorCalibration,
     MotorNormMode,
     assert_same_address,
     get_address,
@@ -109,6 +110,38 @@ def test__serialize_data_large_number():
         bus._serialize_data(2**32, 4)  # 4-byte max is 0xFFFFFFFF
 
 
+def test_normalize_unnormalize(dummy_motors):
+    motors = {**dummy_motors, "dummy_4": Motor(4, "model_3", MotorNormMode.DEGREES)}
+    calibration = {
+        motor: MotorCalibration(
+            id=m.id, drive_mode=int(m.id == 2), homing_offset=0, range_min=0, range_max=1000
+        )
+        for motor, m in motors.items()
+    }
+    calibration["dummy_4"] = MotorCalibration(
+        id=4, drive_mode=0, homing_offset=0, range_min=1000, range_max=3000
+    )
+    bus = MockMotorsBus("/dev/dummy-port", motors)
+    bus.apply_drive_mode = True
+    bus.calibration = calibration
+
+    normalized = bus._normalize({1: 250, 2: 250, 3: 1200, 4: 3000})
+    assert normalized == pytest.approx({1: -50.0, 2: 50.0, 3: 100.0, 4: 1000 * 360 / 4095})
+    assert bus._unnormalize({1: -50.0, 2: 50.0, 3: 150.0, 4: 90.0}) == {1: 250, 2: 250, 3: 1000, 4: 3023}
+
+    # The calibration table is compiled again when the calibration changes
+    bus.calibration = {**calibration, "dummy_1": MotorCalibration(1, 0, 0, 0, 500)}
+    assert bus._normalize({1: 250})[1] == pytest.approx(0.0)
+
+    bus.calibration = {**calibration, "dummy_1": MotorCalibration(1, 0, 0, 500, 500)}
+    with pytest.raises(ValueError, match="min and max are equal"):
+        bus._normalize({1: 250, 3: 100})
+
+    bus.calibration = {}
+    with pytest.raises(RuntimeError):
+        bus._unnormalize({1: 0.0})
+
+
 @pytest.mark.parametrize(
     "data_name, id_, value",
     [
@@ -356,3 +389,111 @@ def test_sync_write_by_value_dict(data_name, ids_values, dummy_motors):
     mock__encode_sign.assert_called_once_with(data_name, ids_values)
     if data_name in bus.normalized_data:
         mock__unnormalize.assert_called_once_with(ids_values)
+
+
+class DummySyncReader:
+    """Replies to sync reads with the bytes of a control table memory per motor."""
+
+    memory = {id_: list(range(10 * id_, 10 * id_ + 32)) for id_ in (1, 2, 3)}
+    transactions = []
+
+    def __init__(self, port, ph, start_address, data_length):
+        self.start_address = start_address
+        self.data_length = data_length
+        self.ids = []
+
+    def clearParam(self):  # noqa: N802
+        self.ids = []
+
+    def addParam(self, id_):  # noqa: N802
+        self.ids.append(id_)
+
+    def txRxPacket(self):  # noqa: N802
+        self.transactions.append((self, tuple(self.ids), self.start_address, self.data_length))
+        return 0
+
+    def getData(self, id_, address, data_length):  # noqa: N802
+        assert self.start_address <= address
+        assert address + data_length <= self.start_address + self.data_length
+        data = self.memory[id_][address : address + data_length]
+        return int.from_bytes(bytes(data), "little")
+
+
+def test_sync_read_multiple(dummy_motors):
+    bus = MockMotorsBus("/dev/dummy-port", dummy_motors)
+    bus.connect(handshake=False)
+    bus.packet_handler, bus._comm_success = None, 0
+    bus.sync_reader = DummySyncReader(None, None, 0, 0)
+    DummySyncReader.transactions.clear()
+
+    with (
+        patch.object(MockMotorsBus, "_decode_sign", side_effect=lambda data_name, ids_values: ids_values),
+        patch.object(MockMotorsBus, "_normalize", side_effect=lambda ids_values: ids_values),
+    ):
+        values = bus.sync_read_multiple(["Present_Position", "Goal_Position"], ["dummy_1", "dummy_3"])
+        assert bus.sync_read("Present_Position", ["dummy_1", "dummy_3"]) == values["Present_Position"]
+
+    def expected(id_, data_name):
+        addr, length = DUMMY_CTRL_TABLE_2[data_name]
+        return int.from_bytes(bytes(DummySyncReader.memory[id_][addr : addr + length]), "little")
+
+    assert values == {
+        data_name: {f"dummy_{id_}": expected(id_, data_name) for id_ in (1, 3)}
+        for data_name in ["Present_Position", "Goal_Position"]
+    }
+    # Both registers are read in one transaction, from the start of the first to the end of the second
+    first_reader, ids, addr, length = DummySyncReader.transactions[0]
+    assert (ids, addr, length) == ((1, 3), 3, 12)
+
+    # Readers are reused for the same motors and address range
+    with patch.object(MockMotorsBus, "_decode_sign", side_effect=lambda data_name, ids_values: ids_values):
+        bus.sync_read_multiple(["Goal_Position", "Present_Position"], ["dummy_1", "dummy_3"], normalize=False)
+    assert len(DummySyncReader.transactions) == 3
+    assert DummySyncReader.transactions[2][0] is first_reader
+    assert DummySyncReader.transactions[1][0] is not first_reader
+
+
+class DummySyncWriter:
+    def __init__(self, port, ph, start_address, data_length):
+        self.start_address = start_address
+        self.data_length = data_length
+        self.data_dict = {}
+        self.num_setups = 0
+        self.sent = []
+
+    def addParam(self, id_, data):  # noqa: N802
+        self.data_dict[id_] = data
+
+    def changeParam(self, id_, data):  # noqa: N802
+        assert id_ in self.data_dict
+        self.data_dict[id_] = data
+
+    def clearParam(self):  # noqa: N802
+        self.data_dict = {}
+        self.num_setups += 1
+
+    def txPacket(self):  # noqa: N802
+        self.sent.append((self.start_address, self.data_length, dict(self.data_dict)))
+        return 0
+
+
+def test_sync_write_cached_writers(dummy_motors):
+    bus = MockMotorsBus("/dev/dummy-port", dummy_motors)
+    bus.connect(handshake=False)
+    bus.packet_handler, bus._comm_success = None, 0
+    bus.sync_writer = first_writer = DummySyncWriter(None, None, 0, 0)
+
+    with patch.object(MockMotorsBus, "_serialize_data", side_effect=lambda value, length: [value] * length):
+        bus._sync_write(11, 4, {1: 10, 2: 20})
+        bus._sync_write(15, 4, {1: 30})
+        bus._sync_write(11, 4, {1: 11, 2: 21})
+
+    # The writer of the first write is reused, only its data is changed
+    assert bus.sync_writer is first_writer
+    assert first_writer.num_setups == 1
+    assert first_writer.sent[-1] == (11, 4, {1: [11] * 4, 2: [21] * 4})
+    assert len(bus._sync_writers) == 2
+
+    stats = bus.transaction_stats["sync_write"]
+    assert stats.count == 3
+    assert 0 <= stats.avg <= stats.max
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+import pytest
+import torch
+
+from lerobot.configs.types import FeatureType, PolicyFeature
+from lerobot.constants import ACTION, OBS_ENV_STATE, OBS_STATE
+from lerobot.policies.act.configuration_act import ACTConfig
+from lerobot.policies.act.modeling_act import ACTAsyncChunker, ACTPolicy
+
+CHUNK_SIZE = 10
+
+
+def predict_chunk(batch):
+    """The i-th action of the chunk predicted from the observation of step t is 1000 * t + i."""
+    time.sleep(0.01)
+    return 1000 * batch["step"][:, None, None] + torch.arange(CHUNK_SIZE)[None, :, None].float()
+
+
+def test_async_chunker():
+    chunker = ACTAsyncChunker(predict_chunk, n_action_steps=4, lookahead=2)
+    actions = [chunker.select_action({"step": torch.tensor([float(t)])}).item() for t in range(10)]
+    # The chunk requested at step 2 is used from step 4, from its action for step 4
+    assert actions == [0, 1, 2, 3, 2002, 2003, 2004, 2005, 6002, 6003]
+
+    chunker.reset()
+    assert chunker.select_action({"step": torch.tensor([3.0])}).item() == 3000
+
+
+def test_async_chunker_blending():
+    chunker = ACTAsyncChunker(predict_chunk, n_action_steps=4, lookahead=2, blend_steps=2)
+    actions = [chunker.select_action({"step": torch.tensor([float(t)])}).item() for t in range(6)]
+    assert actions[:4] == [0, 1, 2, 3]
+    assert actions[4] == pytest.approx(2 / 3 * 4 + 1 / 3 * 2002)
+    assert actions[5] == pytest.approx(1 / 3 * 5 + 2 / 3 * 2003)
+
+
+def test_act_policy_async_chunking():
+    config = ACTConfig(
+        input_features={
+            OBS_STATE: PolicyFeature(type=FeatureType.STATE, shape=(2,)),
+            OBS_ENV_STATE: PolicyFeature(type=FeatureType.ENV, shape=(4,)),
+        },
+        output_features={ACTION: PolicyFeature(type=FeatureType.ACTION, shape=(2,))},
+        chunk_size=CHUNK_SIZE,
+        n_action_steps=4,
+        async_lookahead=2,
+        async_blend_steps=2,
+        dim_model=32,
+        dim_feedforward=64,
+        n_encoder_layers=1,
+        n_vae_encoder_layers=1,
+    )
+    stats = {
+        key: {"mean": torch.zeros(ft.shape), "std": torch.ones(ft.shape)}
+        for key, ft in {**config.input_features, **config.output_features}.items()
+    }
+    policy = ACTPolicy(config, dataset_stats=stats)
+    observation = {OBS_STATE: torch.randn(1, 2), OBS_ENV_STATE: torch.randn(1, 4)}
+    chunk = policy.predict_action_chunk(observation)
+
+    # The observation doesn't change, so the second chunk, predicted at step 2, is the same as the first one
+    actions = torch.stack([policy.select_action(observation) for _ in range(8)], dim=1)
+    weights = torch.tensor([1 / 3, 2 / 3, 1, 1])[None, :, None]
+    second_chunk = weights * chunk[:, 2:6] + (1 - weights) * chunk[:, 4:8]
+    expected = torch.cat([chunk[:, :4], second_chunk], dim=1)
+    torch.testing.assert_close(actions, expected)
+
+    with pytest.raises(ValueError):
+        ACTConfig(chunk_size=CHUNK_SIZE, n_action_steps=8, async_lookahead=4)
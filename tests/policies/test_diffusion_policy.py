@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import torch
+from diffusers.schedulers.scheduling_ddim import DDIMScheduler
+
+from lerobot.configs.types import FeatureType, PolicyFeature
+from lerobot.constants import ACTION, OBS_ENV_STATE, OBS_STATE
+from lerobot.policies.diffusion.configuration_diffusion import DiffusionConfig
+from lerobot.policies.diffusion.modeling_diffusion import DDIMSampler, DiffusionModel
+from lerobot.utils.random_utils import seeded_context
+
+
+def make_config(**kwargs) -> DiffusionConfig:
+    return DiffusionConfig(
+        input_features={
+            OBS_STATE: PolicyFeature(type=FeatureType.STATE, shape=(4,)),
+            OBS_ENV_STATE: PolicyFeature(type=FeatureType.ENV, shape=(2,)),
+        },
+        output_features={ACTION: PolicyFeature(type=FeatureType.ACTION, shape=(3,))},
+        down_dims=(16, 32),
+        horizon=8,
+        n_action_steps=4,
+        diffusion_step_embed_dim=16,
+        noise_scheduler_type="DDIM",
+        num_inference_steps=10,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("prediction_type", ["epsilon", "sample"])
+def test_ddim_sampler_matches_ddim_scheduler(prediction_type):
+    scheduler = DDIMScheduler(
+        num_train_timesteps=100, beta_schedule="squaredcos_cap_v2", prediction_type=prediction_type
+    )
+    scheduler.set_timesteps(7)
+    sampler = DDIMSampler(scheduler, 7, prediction_type=prediction_type)
+    assert torch.equal(sampler.timesteps, scheduler.timesteps)
+
+    sample = expected = torch.randn(2, 8, 3)
+    for step_idx, t in enumerate(scheduler.timesteps):
+        model_output = torch.randn(2, 8, 3)
+        expected = scheduler.step(model_output, t, expected).prev_sample
+        sample = sampler.step(step_idx, model_output, sample)
+        torch.testing.assert_close(sample, expected)
+
+
+def test_ddim_sampler_generates_same_actions():
+    config = make_config()
+    model = DiffusionModel(config).eval()
+    sampling_model = DiffusionModel(make_config(use_ddim_sampler=True)).eval()
+    sampling_model.load_state_dict(model.state_dict())
+
+    batch = {
+        OBS_STATE: torch.randn(2, config.n_obs_steps, 4),
+        OBS_ENV_STATE: torch.randn(2, config.n_obs_steps, 2),
+    }
+    with torch.no_grad(), seeded_context(0):
+        expected = model.generate_actions(batch)
+    with torch.no_grad(), seeded_context(0):
+        actions = sampling_model.generate_actions(batch)
+
+    assert actions.shape == (2, config.n_action_steps, 3)
+    torch.testing.assert_close(actions, expected)
+
+
+def test_compile_sampler_requires_ddim_sampler():
+    with pytest.raises(ValueError):
+        make_config(compile_sampler=True)
@@ -15,6 +15,7 @@
 # limitations under the License.
 
 import math
+from dataclasses import asdict
 
 import pytest
 import torch
@@ -22,7 +23,7 @@ from torch import Tensor, nn
 
 from lerobot.configs.types import FeatureType, PolicyFeature
 from lerobot.policies.sac.configuration_sac import SACConfig
-from lerobot.policies.sac.modeling_sac import MLP, SACPolicy
+from lerobot.policies.sac.modeling_sac import MLP, CriticHead, SACPolicy
 from lerobot.utils.random_utils import seeded_context, set_seed
 
 try:
@@ -477,7 +478,7 @@ def test_sac_policy_with_critics_number_of_heads(num_critics: int):
     policy = SACPolicy(config=config)
     policy.train()
 
-    assert len(policy.critic_ensemble.critics) == num_critics
+    assert policy.critic_ensemble.num_critics == num_critics
 
     batch = create_train_batch_with_visual_input(
         batch_size=batch_size, state_dim=state_dim, action_dim=action_dim
@@ -494,6 +495,55 @@ def test_sac_policy_with_critics_number_of_heads(num_critics: int):
     optimizers["critic"].step()
 
 
+def test_fused_critic_ensemble_matches_heads():
+    config = create_default_config(state_dim=10, continuous_action_dim=6)
+    config.num_critics = 4
+    policy = SACPolicy(config=config)
+    policy.eval()
+    critic_ensemble = policy.critic_ensemble
+
+    heads = []
+    for head_state_dict in critic_ensemble.head_state_dicts():
+        head = CriticHead(
+            input_dim=critic_ensemble.encoder.output_dim + 6, **asdict(config.critic_network_kwargs)
+        )
+        head.load_state_dict(head_state_dict)
+        heads.append(head.eval())
+
+    observations = create_observation_batch(batch_size=5)
+    actions = create_dummy_action(batch_size=5, action_dim=6)
+    with torch.no_grad():
+        q_values = critic_ensemble(observations, actions)
+        inputs = torch.cat(
+            [
+                critic_ensemble.encoder(observations),
+                critic_ensemble.output_normalization({"action": actions})["action"],
+            ],
+            dim=-1,
+        )
+        expected = torch.stack([head(inputs).squeeze(-1) for head in heads])
+
+    assert q_values.shape == (4, 5)
+    torch.testing.assert_close(q_values, expected)
+
+
+def test_critic_ensemble_loads_per_head_state_dict():
+    config = create_default_config(state_dim=10, continuous_action_dim=6)
+    config.num_critics = 3
+    config.use_torch_compile = False
+    policy = SACPolicy(config=config)
+    critic_ensemble = policy.critic_ensemble
+
+    # State dict layout of the ensembles with one module per head
+    state_dict = {k: v for k, v in critic_ensemble.state_dict().items() if not k.startswith("heads.")}
+    for i, head_state_dict in enumerate(critic_ensemble.head_state_dicts()):
+        state_dict.update({f"critics.{i}.{k}": v + 1 for k, v in head_state_dict.items()})
+
+    policy.critic_target.load_state_dict(state_dict)
+    for key, tensor in critic_ensemble.heads.state_dict().items():
+        torch.testing.assert_close(policy.critic_target.heads.state_dict()[key], tensor + 1)
+
+
 def test_sac_policy_save_and_load(tmp_path):
     root = tmp_path / "test_sac_save_and_load"
 
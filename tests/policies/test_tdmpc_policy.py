@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+import torch
+
+from lerobot.configs.types import FeatureType, PolicyFeature
+from lerobot.constants import ACTION, OBS_STATE
+from lerobot.policies.tdmpc.configuration_tdmpc import TDMPCConfig
+from lerobot.policies.tdmpc.modeling_tdmpc import TDMPCPolicy
+
+
+def make_policy(**kwargs) -> TDMPCPolicy:
+    config = TDMPCConfig(
+        input_features={OBS_STATE: PolicyFeature(type=FeatureType.STATE, shape=(4,))},
+        output_features={ACTION: PolicyFeature(type=FeatureType.ACTION, shape=(2,))},
+        latent_dim=8,
+        mlp_dim=16,
+        state_encoder_hidden_dim=16,
+        n_gaussian_samples=32,
+        n_pi_samples=8,
+        n_elites=4,
+        **kwargs,
+    )
+    torch.manual_seed(0)
+    policy = TDMPCPolicy(config)
+    # The last layers of the reward and Q networks are zero initialized
+    for module in [policy.model._reward, *policy.model._Qs]:
+        torch.nn.init.normal_(module[-1].weight)
+    return policy.eval()
+
+
+def reference_estimate_value(policy: TDMPCPolicy, z: torch.Tensor, actions: torch.Tensor) -> torch.Tensor:
+    """Step by step estimation of eqn 4 of the FOWM paper."""
+    config = policy.config
+    value, running_discount = 0, 1
+    for t in range(actions.shape[0]):
+        regularization = -config.uncertainty_regularizer_coeff * policy.model.Qs(z, actions[t]).std(0)
+        z, reward = policy.model.latent_dynamics_and_reward(z, actions[t])
+        value += running_discount * (reward + regularization)
+        running_discount *= config.discount
+    terminal_values = policy.model.Qs(z, policy.model.pi(z, config.min_std))
+    value += (
+        running_discount
+        * torch.min(terminal_values[torch.randint(0, config.q_ensemble_size, (2,))], dim=0)[0]
+    )
+    value -= running_discount * config.uncertainty_regularizer_coeff * terminal_values.std(0)
+    return value
+
+
+@torch.no_grad()
+def test_estimate_value():
+    policy = make_policy()
+    z = torch.rand(10, 3, policy.config.latent_dim)
+    actions = torch.rand(policy.config.horizon, 10, 3, 2) * 2 - 1
+
+    torch.manual_seed(1)
+    expected = reference_estimate_value(policy, z, actions)
+    torch.manual_seed(1)
+    torch.testing.assert_close(policy.estimate_value(z, actions), expected)
+
+
+@pytest.mark.parametrize("planning_time_budget", [None, 1e-6])
+def test_plan(monkeypatch, planning_time_budget):
+    policy = make_policy(cem_iterations=4, planning_time_budget=planning_time_budget)
+    rollouts = []
+    estimate_rollout_return = policy._estimate_rollout_return
+
+    def count_rollouts(z, actions):
+        rollouts.append(z.shape[0])
+        return estimate_rollout_return(z, actions)
+
+    monkeypatch.setattr(policy, "_estimate_rollout_return", count_rollouts)
+    actions = policy.plan(torch.rand(3, policy.config.latent_dim))
+
+    assert actions.shape == (policy.config.horizon, 3, 2)
+    assert actions.abs().max() <= 1
+    # The policy trajectories are rolled out once, the gaussian ones every CEM iteration until the budget is
+    # exhausted (after at least one iteration)
+    num_iterations = 1 if planning_time_budget else 4
+    assert rollouts == [8] + [32] * num_iterations
+    assert policy._prev_mean.shape == (policy.config.horizon, 3, 2)
+
+
+def test_planning_time_budget_validation():
+    with pytest.raises(ValueError):
+        make_policy(planning_time_budget=0)
@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests of the caches kept between inferences by PI0 and SmolVLA, with tiny randomly initialized backbones
+(the pretrained configs and tokenizers of the hub are replaced, so that no download is needed)."""
+
+from types import SimpleNamespace
+
+import pytest
+import torch
+
+from lerobot.configs.types import FeatureType, PolicyFeature
+from lerobot.constants import ACTION, OBS_STATE
+from tests.utils import require_package
+
+IMAGE_KEY = "observation.images.top"
+VOCABULARY = ["<pad>", "<unk>", "<fake_image>", "<global_image>", "pick", "place", "the", "cube", "ball"]
+
+
+def make_tokenizer():
+    from tokenizers import Tokenizer, models, pre_tokenizers
+    from transformers import PreTrainedTokenizerFast
+
+    tokenizer = Tokenizer(models.WordLevel({word: i for i, word in enumerate(VOCABULARY)}, unk_token="<unk>"))
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    tokenizer = PreTrainedTokenizerFast(tokenizer_object=tokenizer, pad_token="<pad>", unk_token="<unk>")
+    tokenizer.fake_image_token_id, tokenizer.global_image_token_id = 2, 3
+    return tokenizer
+
+
+def make_pi0(monkeypatch, **kwargs):
+    from transformers.models.auto import CONFIG_MAPPING
+
+    from lerobot.policies.pi0 import modeling_pi0
+    from lerobot.policies.pi0.configuration_pi0 import PI0Config
+    from lerobot.policies.pi0.paligemma_with_expert import PaliGemmaWithExpertConfig
+
+    def tiny_config(**config_kwargs):
+        config = PaliGemmaWithExpertConfig(**config_kwargs)
+        text_config = {
+            "hidden_size": 32,
+            "intermediate_size": 32,
+            "num_attention_heads": 2,
+            "num_key_value_heads": 1,
+            "head_dim": 16,
+            "num_hidden_layers": 2,
+            "vocab_size": 16,
+        }
+        config.paligemma_config = CONFIG_MAPPING["paligemma"](
+            hidden_size=32,
+            projection_dim=32,
+            image_token_index=15,
+            vocab_size=16,
+            text_config={"model_type": "gemma", **text_config},
+            vision_config={
+                "model_type": "siglip_vision_model",
+                "hidden_size": 32,
+                "intermediate_size": 32,
+                "num_attention_heads": 2,
+                "num_hidden_layers": 1,
+                "patch_size": 14,
+                "image_size": 28,
+                "projection_dim": 32,
+                "num_image_tokens": 4,
+                "vision_use_head": False,
+            },
+        )
+        config.gemma_expert_config = CONFIG_MAPPING["gemma"](**text_config)
+        return config
+
+    monkeypatch.setattr(modeling_pi0, "PaliGemmaWithExpertConfig", tiny_config)
+    monkeypatch.setattr(
+        modeling_pi0.AutoTokenizer, "from_pretrained", lambda *args, **kwargs: make_tokenizer()
+    )
+    config = PI0Config(proj_width=32, **kwargs)
+    return modeling_pi0.PI0Policy(config)
+
+
+def make_smolvla(monkeypatch, **kwargs):
+    from transformers import SmolVLMConfig
+
+    from lerobot.policies.smolvla import modeling_smolvla, smolvlm_with_expert
+    from lerobot.policies.smolvla.configuration_smolvla import SmolVLAConfig
+
+    def tiny_config(*args, **config_kwargs):
+        return SmolVLMConfig(
+            text_config={
+                "model_type": "llama",
+                "hidden_size": 64,
+                "intermediate_size": 64,
+                "num_hidden_layers": 2,
+                "num_attention_heads": 4,
+                "num_key_value_heads": 2,
+                "head_dim": 16,
+                "vocab_size": 16,
+            },
+            vision_config={
+                "hidden_size": 32,
+                "intermediate_size": 32,
+                "num_hidden_layers": 1,
+                "num_attention_heads": 2,
+                "patch_size": 14,
+                "image_size": 28,
+            },
+            scale_factor=2,
+            vocab_size=16,
+        )
+
+    def tiny_processor(*args, **kwargs):
+        return SimpleNamespace(tokenizer=make_tokenizer())
+
+    monkeypatch.setattr(smolvlm_with_expert.AutoConfig, "from_pretrained", tiny_config)
+    monkeypatch.setattr(smolvlm_with_expert.AutoProcessor, "from_pretrained", tiny_processor)
+    monkeypatch.setattr(modeling_smolvla.AutoProcessor, "from_pretrained", tiny_processor)
+    config = SmolVLAConfig(num_vlm_layers=2, **kwargs)
+    return modeling_smolvla.SmolVLAPolicy(config)
+
+
+def make_policy(policy_name, monkeypatch, **kwargs):
+    kwargs = {
+        "input_features": {
+            OBS_STATE: PolicyFeature(type=FeatureType.STATE, shape=(4,)),
+            IMAGE_KEY: PolicyFeature(type=FeatureType.VISUAL, shape=(3, 28, 28)),
+        },
+        "output_features": {ACTION: PolicyFeature(type=FeatureType.ACTION, shape=(2,))},
+        "resize_imgs_with_padding": (28, 28),
+        "chunk_size": 4,
+        "n_action_steps": 4,
+        "num_steps": 3,
+        "max_state_dim": 8,
+        "max_action_dim": 8,
+        "tokenizer_max_length": 8,
+        **kwargs,
+    }
+    torch.manual_seed(0)
+    make_fn = make_pi0 if policy_name == "pi0" else make_smolvla
+    return make_fn(monkeypatch, **kwargs).eval()
+
+
+def make_batch(tasks=("pick the cube", "place the ball")):
+    return {
+        OBS_STATE: torch.rand(len(tasks), 4),
+        IMAGE_KEY: torch.rand(len(tasks), 3, 28, 28),
+        "task": list(tasks),
+    }
+
+
+@require_package("transformers")
+@pytest.mark.parametrize("policy_name", ["pi0", "smolvla"])
+def test_language_tokens_cache(monkeypatch, policy_name):
+    policy = make_policy(policy_name, monkeypatch)
+    batch = make_batch()
+
+    lang_tokens, lang_masks = policy.prepare_language(batch)
+    assert policy.prepare_language(make_batch())[0] is lang_tokens
+
+    # The tokens are computed again when the tasks change, or after a reset
+    other_tokens, _ = policy.prepare_language(make_batch(("place the cube", "place the ball")))
+    assert other_tokens is not lang_tokens
+    assert not torch.equal(other_tokens, lang_tokens)
+    assert policy.prepare_language(batch)[0] is not lang_tokens
+    policy.reset()
+    reset_tokens, reset_masks = policy.prepare_language(batch)
+    assert reset_tokens is not lang_tokens
+    torch.testing.assert_close(reset_tokens, lang_tokens)
+    torch.testing.assert_close(reset_masks, lang_masks)
+
+    # The cache isn't used for training
+    policy.train()
+    assert policy.prepare_language(batch)[0] is not policy.prepare_language(batch)[0]
+
+
+@require_package("transformers")
+@pytest.mark.parametrize("policy_name", ["pi0", "smolvla"])
+def test_language_embedding_cache(monkeypatch, policy_name):
+    policy = make_policy(policy_name, monkeypatch)
+    lang_tokens, _ = policy.prepare_language(make_batch())
+
+    with torch.no_grad():
+        lang_emb = policy.model.embed_language(lang_tokens)
+        assert policy.model.embed_language(lang_tokens) is lang_emb
+        # Same embeddings as without the cache
+        policy.config.cache_language = False
+        torch.testing.assert_close(policy.model.embed_language(lang_tokens), lang_emb, rtol=0, atol=0)
+        assert policy.model.language_embedding_cache is None
+        policy.config.cache_language = True
+
+    # The cache is bypassed when gradients are enabled or in train mode
+    policy.model.embed_language(lang_tokens)
+    with torch.enable_grad():
+        assert policy.model.embed_language(lang_tokens) is not lang_emb
+    policy.train()
+    with torch.no_grad():
+        assert policy.model.embed_language(lang_tokens) is not lang_emb
+    assert policy.model.language_embedding_cache is None
+
+    # The cache is cleared by a reset and when weights are loaded
+    policy.eval()
+    with torch.no_grad():
+        policy.model.embed_language(lang_tokens)
+    policy.reset()
+    assert policy.model.language_embedding_cache is None
+    with torch.no_grad():
+        policy.model.embed_language(lang_tokens)
+    policy.load_state_dict(policy.state_dict())
+    assert policy.model.language_embedding_cache is None
+
+
+def sample_actions(policy, batch, noise):
+    images, img_masks = policy.prepare_images(batch)
+    lang_tokens, lang_masks = policy.prepare_language(batch)
+    state = policy.prepare_state(batch)
+    with torch.no_grad():
+        # The noise is denoised in place
+        return policy.model.sample_actions(
+            images, img_masks, lang_tokens, lang_masks, state, noise=noise.clone()
+        )
+
+
+@require_package("transformers")
+@pytest.mark.parametrize("policy_name", ["pi0", "smolvla"])
+def test_prefix_cache(monkeypatch, policy_name):
+    policy = make_policy(policy_name, monkeypatch)
+    assert not policy.config.reuse_prefix_cache
+    batch = make_batch()
+    noise = torch.randn(2, policy.config.chunk_size, policy.config.max_action_dim)
+
+    num_prefix_embeddings = 0
+    embed_prefix = policy.model.embed_prefix
+
+    def counting_embed_prefix(*args, **kwargs):
+        nonlocal num_prefix_embeddings
+        num_prefix_embeddings += 1
+        return embed_prefix(*args, **kwargs)
+
+    monkeypatch.setattr(policy.model, "embed_prefix", counting_embed_prefix)
+
+    actions = sample_actions(policy, batch, noise)
+    sample_actions(policy, batch, noise)
+    assert num_prefix_embeddings == 2
+    assert policy.model.prefix_cache is None
+
+    # The cache is reused by a second call with the same observation, with the same actions
+    policy.config.reuse_prefix_cache = True
+    torch.testing.assert_close(sample_actions(policy, batch, noise), actions, rtol=0, atol=0)
+    torch.testing.assert_close(sample_actions(policy, batch, noise), actions, rtol=0, atol=0)
+    assert num_prefix_embeddings == 3
+
+    # The cache is invalidated when the images change, and for SmolVLA when the state changes
+    changed_batch = {**batch, IMAGE_KEY: torch.rand_like(batch[IMAGE_KEY])}
+    sample_actions(policy, changed_batch, noise)
+    assert num_prefix_embeddings == 4
+    changed_batch = {**changed_batch, OBS_STATE: torch.rand_like(batch[OBS_STATE])}
+    sample_actions(policy, changed_batch, noise)
+    assert num_prefix_embeddings == (5 if policy_name == "smolvla" else 4)
+
+    # The cache is dropped when disabled, and the actions of the changed observation are the same as without it
+    policy.config.reuse_prefix_cache = False
+    uncached_actions = sample_actions(policy, changed_batch, noise)
+    assert policy.model.prefix_cache is None
+    policy.config.reuse_prefix_cache = True
+    torch.testing.assert_close(sample_actions(policy, changed_batch, noise), uncached_actions, rtol=0, atol=0)
+    torch.testing.assert_close(sample_actions(policy, changed_batch, noise), uncached_actions, rtol=0, atol=0)
+    assert num_prefix_embeddings == (7 if policy_name == "smolvla" else 6)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+import torch
+from torch import nn
+
+from tests.utils import require_package
+
+
+class DummyActor(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.encoder = nn.Linear(8, 8)
+        self.head = nn.Linear(8, 2)
+        self.encoder.requires_grad_(False)
+
+
+def make_modules(seed: int) -> dict[str, nn.Module]:
+    torch.manual_seed(seed)
+    return {"policy": DummyActor()}
+
+
+def get_state_dicts(modules: dict[str, nn.Module]) -> dict[str, dict[str, torch.Tensor]]:
+    return {name: {k: v.clone() for k, v in module.state_dict().items()} for name, module in modules.items()}
+
+
+def train_step(modules: dict[str, nn.Module], scale: float = 0.01):
+    with torch.no_grad():
+        for param in modules["policy"].head.parameters():
+            param.add_(torch.randn_like(param) * scale)
+
+
+def sync(encoder, decoder, learner, actor) -> tuple[dict, bool]:
+    from lerobot.transport.utils import tensors_to_bytes
+
+    tensors, meta = encoder.encode(get_state_dicts(learner))
+    return tensors, decoder.apply(tensors_to_bytes(tensors, meta), actor)
+
+
+def assert_modules_equal(learner, actor):
+    for key, tensor in learner["policy"].state_dict().items():
+        assert torch.equal(actor["policy"].state_dict()[key], tensor), key
+
+
+@require_package("grpc")
+def test_changed_parameters_sync():
+    from lerobot.transport.parameter_sync import ParameterSyncDecoder, ParameterSyncEncoder
+
+    learner, actor = make_modules(0), make_modules(1)
+    encoder, decoder = ParameterSyncEncoder("changed", full_sync_frequency=3), ParameterSyncDecoder()
+
+    tensors, applied = sync(encoder, decoder, learner, actor)
+    assert applied and decoder.version == 1
+    assert len(tensors) == 4
+    assert_modules_equal(learner, actor)
+
+    # Only the trained head is sent, the frozen encoder isn't
+    train_step(learner)
+    tensors, applied = sync(encoder, decoder, learner, actor)
+    assert applied and decoder.version == 2
+    assert set(tensors) == {"policy/head.weight", "policy/head.bias"}
+    assert_modules_equal(learner, actor)
+
+    # Nothing changed
+    tensors, _ = sync(encoder, decoder, learner, actor)
+    assert tensors == {}
+
+    # Periodic full snapshot
+    tensors, _ = sync(encoder, decoder, learner, actor)
+    assert len(tensors) == 4 and decoder.version == 4
+
+
+@require_package("grpc")
+def test_int8_delta_sync():
+    from lerobot.transport.parameter_sync import ParameterSyncDecoder, ParameterSyncEncoder
+
+    learner, actor = make_modules(0), make_modules(1)
+    encoder, decoder = ParameterSyncEncoder("int8_delta", full_sync_frequency=0), ParameterSyncDecoder()
+    sync(encoder, decoder, learner, actor)
+
+    for _ in range(5):
+        train_step(learner)
+        tensors, applied = sync(encoder, decoder, learner, actor)
+        assert applied
+        assert all(tensor.dtype == torch.int8 for tensor in tensors.values())
+        # The actor holds exactly the parameters tracked by the encoder, close to the learner's
+        for key, tensor in actor["policy"].state_dict().items():
+            assert torch.equal(tensor, encoder.reference[f"policy/{key}"])
+            torch.testing.assert_close(tensor, learner["policy"].state_dict()[key], atol=1e-3, rtol=0)
+
+
+@require_package("grpc")
+def test_int8_delta_sync_zero_delta():
+    from lerobot.transport.parameter_sync import ParameterSyncDecoder, ParameterSyncEncoder
+
+    learner, actor = make_modules(0), make_modules(1)
+    encoder, decoder = ParameterSyncEncoder("int8_delta", full_sync_frequency=0), ParameterSyncDecoder()
+    sync(encoder, decoder, learner, actor)
+    train_step(learner)
+    sync(encoder, decoder, learner, actor)
+
+    # The bias changed since the last update, but to the values held by the actor
+    train_step(learner)
+    with torch.no_grad():
+        learner["policy"].head.bias.copy_(encoder.reference["policy/head.bias"])
+    tensors, applied = sync(encoder, decoder, learner, actor)
+    assert applied
+    assert set(tensors) == {"policy/head.weight"}
+    for key, tensor in actor["policy"].state_dict().items():
+        assert not tensor.isnan().any()
+        assert torch.equal(tensor, encoder.reference[f"policy/{key}"])
+    assert torch.equal(actor["policy"].head.bias, learner["policy"].head.bias)
+
+
+@require_package("grpc")
+@pytest.mark.parametrize("dtype", ["float16", "bfloat16"])
+def test_low_precision_sync(dtype):
+    from lerobot.transport.parameter_sync import ParameterSyncDecoder, ParameterSyncEncoder
+
+    learner, actor = make_modules(0), make_modules(1)
+    encoder, decoder = ParameterSyncEncoder("changed", dtype=dtype), ParameterSyncDecoder()
+
+    tensors, _ = sync(encoder, decoder, learner, actor)
+    assert all(str(tensor.dtype) == f"torch.{dtype}" for tensor in tensors.values())
+    for key, tensor in actor["policy"].state_dict().items():
+        assert tensor.dtype == torch.float32
+        torch.testing.assert_close(tensor, learner["policy"].state_dict()[key], atol=1e-2, rtol=1e-2)
+
+    # The change detection doesn't depend on the precision of the values sent
+    train_step(learner)
+    tensors, _ = sync(encoder, decoder, learner, actor)
+    assert set(tensors) == {"policy/head.weight", "policy/head.bias"}
+
+
+@require_package("grpc")
+def test_missed_update_waits_for_full_snapshot():
+    from lerobot.transport.parameter_sync import (
+        ParameterSyncDecoder,
+        ParameterSyncEncoder,
+        is_full_parameters_update,
+    )
+    from lerobot.transport.utils import tensors_to_bytes
+
+    learner, actor = make_modules(0), make_modules(1)
+    encoder, decoder = ParameterSyncEncoder("changed", full_sync_frequency=4), ParameterSyncDecoder()
+    sync(encoder, decoder, learner, actor)
+
+    # The update of version 2 is lost
+    train_step(learner)
+    encoder.encode(get_state_dicts(learner))
+    train_step(learner)
+    tensors, meta = encoder.encode(get_state_dicts(learner))
+    buffer = tensors_to_bytes(tensors, meta)
+    assert not is_full_parameters_update(buffer)
+    assert not decoder.apply(buffer, actor)
+    assert decoder.version == 1
+
+    _, applied = sync(encoder, decoder, learner, actor)
+    assert not applied
+    _, applied = sync(encoder, decoder, learner, actor)
+    assert applied and decoder.version == 5
+    assert_modules_equal(learner, actor)
+
+
+@require_package("grpc")
+def test_legacy_state_dict_sync():
+    from lerobot.transport.parameter_sync import ParameterSyncDecoder, is_full_parameters_update
+    from lerobot.transport.utils import state_to_bytes
+
+    learner, actor = make_modules(0), make_modules(1)
+    buffer = state_to_bytes(get_state_dicts(learner))
+    assert is_full_parameters_update(buffer)
+
+    decoder = ParameterSyncDecoder()
+    assert decoder.apply(buffer, actor)
+    assert decoder.version is None
+    assert_modules_equal(learner, actor)
+
+
+@require_package("grpc")
+def test_parameter_sync_errors():
+    from lerobot.transport.parameter_sync import ParameterSyncDecoder, ParameterSyncEncoder
+    from lerobot.transport.utils import tensors_to_bytes
+
+    with pytest.raises(ValueError):
+        ParameterSyncEncoder("unknown")
+    with pytest.raises(ValueError):
+        ParameterSyncEncoder("changed", dtype="int8")
+
+    tensors, meta = ParameterSyncEncoder().encode({"critic": {"weight": torch.zeros(2)}})
+    with pytest.raises(ValueError):
+        ParameterSyncDecoder().apply(tensors_to_bytes(tensors, meta), make_modules(0))
@@ -569,3 +569,117 @@ def test_receive_bytes_in_chunks_unknown_state():
 
     with pytest.raises(ValueError, match="Received unknown transfer state"):
         receive_bytes_in_chunks(bad_iterator, output_queue, shutdown_event)
+
+
+@require_package("grpc")
+def test_tensors_to_bytes_roundtrip():
+    import numpy as np
+
+    from lerobot.transport.utils import TENSOR_FRAME_ALIGNMENT, bytes_to_tensors, tensors_to_bytes
+
+    tensors = {
+        "state": torch.randn(6),
+        "image": np.random.randint(0, 256, (24, 32, 3), dtype=np.uint8),
+        "mask": np.array([True, False]),
+        "scalar": np.array(3, dtype=np.int64),
+        "empty": np.zeros((0, 4), dtype=np.float16),
+    }
+    data = tensors_to_bytes(tensors, meta={"timestep": 7})
+    decoded, meta = bytes_to_tensors(data)
+
+    assert meta == {"timestep": 7}
+    assert list(decoded) == list(tensors)
+    for key, value in tensors.items():
+        expected = value.numpy() if isinstance(value, torch.Tensor) else value
+        assert decoded[key].dtype == expected.dtype
+        np.testing.assert_array_equal(decoded[key], expected)
+
+    # Raw arrays are aligned views on the received buffer
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    assert np.shares_memory(decoded["image"], buffer)
+    assert (
+        decoded["state"].ctypes.data % TENSOR_FRAME_ALIGNMENT == buffer.ctypes.data % TENSOR_FRAME_ALIGNMENT
+    )
+
+
+@require_package("grpc")
+def test_tensors_to_bytes_image_encoding():
+    import numpy as np
+
+    from lerobot.transport.utils import bytes_to_tensors, tensors_to_bytes
+
+    image = np.zeros((48, 64, 3), dtype=np.uint8)
+    image[:, :32, 0] = 255
+    state = np.arange(4, dtype=np.float32)
+    raw = tensors_to_bytes({"image": image, "state": state})
+
+    decoded, _ = bytes_to_tensors(tensors_to_bytes({"image": image, "state": state}, image_encoding="png"))
+    np.testing.assert_array_equal(decoded["image"], image)
+    np.testing.assert_array_equal(decoded["state"], state)
+
+    jpeg = tensors_to_bytes({"image": image, "state": state}, image_encoding="jpeg")
+    decoded, _ = bytes_to_tensors(jpeg)
+    assert len(jpeg) < len(raw)
+    assert decoded["image"].shape == image.shape
+    assert np.abs(decoded["image"].astype(int) - image).mean() < 5
+
+    with pytest.raises(ValueError, match="Unsupported image encoding"):
+        tensors_to_bytes({"image": image}, image_encoding="webp")
+    with pytest.raises(ValueError, match="not a tensor frame"):
+        bytes_to_tensors(b"not a frame")
+
+
+@require_package("grpc")
+def test_send_nested_tensors_in_chunks():
+    from lerobot.transport import services_pb2
+    from lerobot.transport.utils import (
+        CHUNK_SIZE,
+        bytes_to_state_dict,
+        receive_bytes_in_chunks,
+        send_nested_tensors_in_chunks,
+        state_to_bytes,
+    )
+
+    """Test streaming a state dict straight from its tensors, and assembling it in a preallocated frame."""
+    state_dicts = {
+        "policy": {
+            # 4MB, so that the tensor is split over several messages
+            "large_layer.weight": torch.randn(1024, 1024),
+            "layer.bias": torch.randn(3).bfloat16(),
+            "num_batches_tracked": torch.tensor(7),
+        },
+        "discrete_critic": {},
+    }
+
+    messages = list(send_nested_tensors_in_chunks(state_dicts, services_pb2.Parameters))
+    assert len(messages) > 2
+    assert all(len(message.data) <= CHUNK_SIZE for message in messages)
+    assert messages[0].transfer_state == services_pb2.TransferState.TRANSFER_BEGIN
+    assert messages[-1].transfer_state == services_pb2.TransferState.TRANSFER_END
+    # The streamed frame is the same as the serialized one
+    assert b"".join(message.data for message in messages) == state_to_bytes(state_dicts)
+
+    queue = Queue()
+    receive_bytes_in_chunks(iter(messages), queue, Event())
+    frame = queue.get(timeout=0.01)
+    assert isinstance(frame, bytearray)
+
+    reconstructed = bytes_to_state_dict(frame)
+    assert reconstructed.keys() == state_dicts.keys()
+    assert reconstructed["discrete_critic"] == {}
+    for key, tensor in state_dicts["policy"].items():
+        assert reconstructed["policy"][key].dtype == tensor.dtype
+        assert torch.equal(reconstructed["policy"][key], tensor)
+
+
+@require_package("grpc")
+def test_bytes_to_state_dict_legacy_format():
+    from lerobot.transport.utils import bytes_to_state_dict
+
+    """State dicts saved with torch.save by older learners can still be loaded."""
+    state_dict = {"layer.weight": torch.randn(4, 2)}
+    buffer = io.BytesIO()
+    torch.save(state_dict, buffer)
+
+    reconstructed = bytes_to_state_dict(buffer.getvalue())
+    assert torch.equal(reconstructed["layer.weight"], state_dict["layer.weight"])
@@ -20,7 +20,7 @@ from queue import Queue
 
 from torch.multiprocessing import Queue as TorchMPQueue
 
-from lerobot.utils.queue import get_last_item_from_queue
+from lerobot.utils.queue import get_all_items_from_queue, get_last_item_from_queue
 
 
 def test_get_last_item_single_item():
@@ -164,3 +164,18 @@ def test_get_last_item_blocking_waits_for_item():
 
     assert result == ["item2"]
     assert queue.empty()
+
+
+def test_get_all_items_from_queue():
+    """Test draining all the items of a queue, in order."""
+    queue = TorchMPQueue()
+    assert get_all_items_from_queue(queue) == []
+
+    items = ["first", "second", None, "last"]
+    for item in items:
+        queue.put(item)
+    # Wait for the feeder thread of the queue
+    time.sleep(0.1)
+
+    assert get_all_items_from_queue(queue) == items
+    assert queue.empty()
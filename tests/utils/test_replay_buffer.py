@@ -21,8 +21,9 @@ import pytest
 import torch
 
 from lerobot.datasets.lerobot_dataset import LeRobotDataset
-from lerobot.utils.buffer import BatchTransition, ReplayBuffer, random_crop_vectorized
+from lerobot.utils.buffer import BatchTransition, ReplayBuffer, SumTree, random_crop_vectorized
 from tests.fixtures.constants import DUMMY_REPO_ID
+from tests.utils import require_cuda
 
 
 def state_dims() -> list[str]:
@@ -552,6 +553,248 @@ def test_memory_optimization():
     )
 
 
+def test_memory_optimization_episode_boundaries():
+    # Episodes of 3 transitions, whose final observation isn't the state of any transition
+    buffer = ReplayBuffer(capacity=7, device="cpu", state_keys=["state_value"], optimize_memory=True)
+    next_values = {}
+    for episode in range(5):
+        for step in range(3):
+            value = 10.0 * episode + step
+            done = step == 2
+            next_value = 1000.0 + episode if done else value + 1
+            next_values[value] = next_value
+            buffer.add(
+                {"state_value": torch.tensor([[value]])},
+                torch.zeros(1, 1),
+                0.0,
+                {"state_value": torch.tensor([[next_value]])},
+                done,
+                False,
+            )
+
+    # One slot out of 4 holds the final observation of an episode, and the oldest ones were evicted
+    assert len(buffer) == int(buffer.valid.sum()) < buffer.capacity
+    batch = buffer.sample(100)
+    for value, next_value in zip(
+        batch["state"]["state_value"].flatten().tolist(),
+        batch["next_state"]["state_value"].flatten().tolist(),
+        strict=True,
+    ):
+        assert next_values[value] == next_value
+    assert {value // 10 for value in batch["state"]["state_value"].flatten().tolist()} <= {3, 4}
+
+
+def test_store_images_as_uint8(dummy_state, dummy_action):
+    float_replay_buffer = create_empty_replay_buffer()
+    float_replay_buffer.add(dummy_state, dummy_action, 1.0, dummy_state, False, False)
+    replay_buffer = ReplayBuffer(10, "cpu", state_dims(), use_drq=False, store_images_as_uint8=True)
+    replay_buffer.add(dummy_state, dummy_action, 1.0, dummy_state, False, False)
+
+    assert replay_buffer.states["observation.image"].dtype == torch.uint8
+    assert replay_buffer.states["observation.state"].dtype == torch.float32
+    assert get_object_memory(replay_buffer) < get_object_memory(float_replay_buffer) / 3
+
+    batch = replay_buffer.sample(1)
+    for key in dict_properties():
+        image = batch[key]["observation.image"][0]
+        assert image.dtype == torch.float32
+        torch.testing.assert_close(image, dummy_state["observation.image"], atol=0.5 / 255, rtol=0)
+        assert torch.equal(batch[key]["observation.state"][0], dummy_state["observation.state"])
+
+
+def add_value_transitions(buffer: ReplayBuffer, values: list[float]):
+    for value in values:
+        buffer.add(
+            {"state_value": torch.tensor([[value]])},
+            torch.full((1, 2), value),
+            value,
+            {"state_value": torch.tensor([[value + 1]])},
+            False,
+            False,
+            complementary_info={"discrete_penalty": value},
+        )
+
+
+@pytest.mark.parametrize("optimize_memory", [False, True])
+def test_disk_backed_buffer_reattach(tmp_path, optimize_memory):
+    def make_buffer():
+        return ReplayBuffer(
+            capacity=8,
+            device="cpu",
+            state_keys=["state_value"],
+            optimize_memory=optimize_memory,
+            storage_dir=tmp_path / "buffer",
+        )
+
+    buffer = make_buffer()
+    add_value_transitions(buffer, [float(i) for i in range(5)])
+    buffer.flush()
+    expected_size, expected_indices = len(buffer), buffer._ordered_indices()
+
+    reattached = make_buffer()
+    assert reattached.initialized
+    assert len(reattached) == expected_size
+    assert reattached._ordered_indices() == expected_indices
+    batch = reattached.sample(4)
+    torch.testing.assert_close(batch["next_state"]["state_value"], batch["state"]["state_value"] + 1)
+    torch.testing.assert_close(batch["reward"], batch["state"]["state_value"].flatten())
+    torch.testing.assert_close(batch["complementary_info"]["discrete_penalty"], batch["reward"])
+
+    # The buffer keeps growing from where it was
+    add_value_transitions(reattached, [5.0, 6.0])
+    assert reattached.rewards[reattached._ordered_indices()].tolist() == [float(i) for i in range(7)]
+
+    with pytest.raises(ValueError):
+        ReplayBuffer(capacity=16, device="cpu", state_keys=["state_value"], storage_dir=tmp_path / "buffer")
+
+
+def test_disk_backed_buffer_crash_recovery(tmp_path):
+    buffer = ReplayBuffer(capacity=4, device="cpu", state_keys=["state_value"], storage_dir=tmp_path)
+    add_value_transitions(buffer, [0.0, 1.0, 2.0, 3.0])
+    buffer.flush()
+
+    # The learner crashes while writing the third transition after the flush
+    add_value_transitions(buffer, [4.0, 5.0, 6.0])
+    buffer.write_indices[buffer.position - 1] = -1
+
+    reattached = ReplayBuffer(capacity=4, device="cpu", state_keys=["state_value"], storage_dir=tmp_path)
+    assert len(reattached) == 3
+    assert reattached.rewards[reattached._ordered_indices()].tolist() == [3.0, 4.0, 5.0]
+
+
+def test_sum_tree():
+    tree = SumTree(5)
+    tree.update(torch.arange(5), torch.tensor([1.0, 0.0, 2.0, 3.0, 4.0]))
+    assert tree.total == 10.0
+    indices = tree.find(torch.tensor([0.0, 0.99, 1.0, 2.5, 3.0, 5.99, 6.0, 9.99]))
+    assert indices.tolist() == [0, 0, 2, 2, 3, 3, 4, 4]
+
+    # Batched updates of several leaves sharing parents
+    tree.update(torch.tensor([0, 1, 4]), torch.tensor([0.0, 5.0, 0.0]))
+    assert tree.total == 10.0
+    assert tree[torch.arange(5)].tolist() == [0.0, 5.0, 2.0, 3.0, 0.0]
+    assert tree.find(torch.tensor([0.0, 4.99, 9.99])).tolist() == [1, 1, 3]
+
+
+@pytest.mark.parametrize("optimize_memory", [False, True])
+def test_prioritized_sampling(optimize_memory):
+    buffer = ReplayBuffer(
+        capacity=16,
+        device="cpu",
+        state_keys=["state_value"],
+        optimize_memory=optimize_memory,
+        prioritized=True,
+        priority_alpha=1.0,
+        priority_beta=1.0,
+    )
+    add_value_transitions(buffer, [float(i) for i in range(8)])
+
+    # New transitions are sampled uniformly, with the same weight
+    batch = buffer.sample(8)
+    assert torch.all(batch["complementary_info"]["importance_weights"] == 1.0)
+    indices = batch["complementary_info"]["replay_indices"]
+    torch.testing.assert_close(buffer.rewards[indices], batch["reward"])
+
+    td_errors = torch.zeros(len(indices))
+    td_errors[batch["reward"] == 3.0] = 1.0
+    buffer.update_priorities(indices, td_errors)
+    batch = buffer.sample(8)
+    assert torch.all(batch["reward"] == 3.0)
+    # Slots only holding a next state are never sampled
+    torch.testing.assert_close(batch["next_state"]["state_value"].flatten(), batch["reward"] + 1)
+
+    # The weights compensate the sampling probabilities
+    buffer.update_priorities(indices, torch.ones(len(indices)))
+    buffer.update_priorities(indices[:1], torch.full((1,), 3.0))
+    batch = buffer.sample(8)
+    weights = batch["complementary_info"]["importance_weights"]
+    assert weights.min() == pytest.approx(1 / 3, rel=1e-3) and weights.max() == 1.0
+
+
+def make_episode_transitions(num_episodes: int, episode_length: int) -> list[dict]:
+    """Transitions of episodes ending either with a final observation or with a next state equal to the state."""
+    transitions = []
+    for episode in range(num_episodes):
+        next_state = {"state_value": torch.tensor([[10.0 * episode]])}
+        for step in range(episode_length):
+            state = next_state
+            done = step == episode_length - 1
+            if not done:
+                next_state = {"state_value": state["state_value"] + 1}
+            elif episode % 2 == 0:
+                next_state = {"state_value": torch.tensor([[1000.0 + episode]])}
+            else:
+                next_state = state
+            value = float(state["state_value"])
+            transitions.append(
+                {
+                    "state": state,
+                    "action": torch.full((1, 2), value),
+                    "reward": value,
+                    "next_state": next_state,
+                    "done": done,
+                    "truncated": False,
+                    "complementary_info": {"discrete_penalty": torch.tensor([value])},
+                }
+            )
+    return transitions
+
+
+@pytest.mark.parametrize("optimize_memory", [False, True])
+def test_add_batch_matches_add(optimize_memory):
+    def make_buffer():
+        return ReplayBuffer(
+            capacity=7,
+            device="cpu",
+            state_keys=["state_value"],
+            optimize_memory=optimize_memory,
+            prioritized=True,
+        )
+
+    transitions = make_episode_transitions(num_episodes=4, episode_length=3)
+    buffer, batch_buffer = make_buffer(), make_buffer()
+    for transition in transitions:
+        buffer.add(**transition)
+    # The first batch ends in the middle of an episode, the second one wraps around the buffer several times
+    batch_buffer.add_batch(transitions[:5])
+    batch_buffer.add_batch(transitions[5:])
+
+    assert len(batch_buffer) == len(buffer)
+    assert batch_buffer.position == buffer.position
+    assert batch_buffer.num_adds == buffer.num_adds == len(transitions)
+    indices = buffer._ordered_indices()
+    assert batch_buffer._ordered_indices() == indices
+    for name in ["actions", "rewards", "dones", "truncateds"]:
+        assert torch.equal(getattr(batch_buffer, name)[indices], getattr(buffer, name)[indices])
+    assert torch.equal(
+        batch_buffer.complementary_info["discrete_penalty"][indices],
+        buffer.complementary_info["discrete_penalty"][indices],
+    )
+    assert torch.equal(batch_buffer.sum_tree[torch.arange(7)], buffer.sum_tree[torch.arange(7)])
+    torch.testing.assert_close(
+        batch_buffer._gather(torch.tensor(indices)), buffer._gather(torch.tensor(indices)), rtol=0, atol=0
+    )
+
+
+def test_add_batch_of_stacked_transitions():
+    buffer = ReplayBuffer(capacity=4, device="cpu", state_keys=["state_value"], optimize_memory=True)
+    buffer.add_batch(
+        {
+            "state": {"state_value": torch.arange(6.0).unsqueeze(1)},
+            "action": torch.zeros(6, 2),
+            "reward": torch.arange(6.0),
+            "next_state": {"state_value": torch.arange(1.0, 7.0).unsqueeze(1)},
+            "done": torch.zeros(6, dtype=torch.bool),
+            "truncated": torch.zeros(6, dtype=torch.bool),
+        }
+    )
+    # The slot after the last transition holds its next state
+    assert len(buffer) == 3
+    assert sorted(buffer.rewards[buffer._ordered_indices()].tolist()) == [3.0, 4.0, 5.0]
+    batch = buffer.sample(16)
+    torch.testing.assert_close(batch["next_state"]["state_value"].flatten(), batch["reward"] + 1)
+
+
 def test_check_image_augmentations_with_drq_and_dummy_image_augmentation_function(dummy_state, dummy_action):
     def dummy_image_augmentation_function(x):
         return torch.ones_like(x) * 10
@@ -615,13 +858,16 @@ def test_random_crop_vectorized_invalid_size():
         random_crop_vectorized(images, (10, 10))
 
 
-def _populate_buffer_for_async_test(capacity: int = 10) -> ReplayBuffer:
+def _populate_buffer_for_async_test(
+    capacity: int = 10, device: str = "cpu", use_drq: bool = True
+) -> ReplayBuffer:
     """Create a small buffer with deterministic 3×128×128 images and 11-D state."""
     buffer = ReplayBuffer(
         capacity=capacity,
-        device="cpu",
+        device=device,
         state_keys=["observation.image", "observation.state"],
         storage_device="cpu",
+        use_drq=use_drq,
     )
 
     for i in range(capacity):
@@ -680,3 +926,31 @@ def test_async_iterator_multiple_iterations():
 
     # Ensure iterator can be disposed without blocking
     del iterator
+
+
+def test_gather_into_buffers():
+    buffer = _populate_buffer_for_async_test(use_drq=False)
+    idx = torch.tensor([3, 1, 3])
+    out = {name: torch.empty_like(value) for name, value in buffer._gather(idx).items()}
+    gathered = buffer._gather(idx, out=out)
+
+    assert all(gathered[name] is out[name] for name in out)
+    assert gathered["state.observation.state"][:, 0].tolist() == [3.0, 1.0, 3.0]
+    batch = buffer._assemble_batch(gathered, idx)
+    assert torch.equal(batch["next_state"]["observation.image"], batch["state"]["observation.image"])
+    assert batch["done"].dtype == torch.float32
+
+
+@require_cuda
+def test_async_iterator_cuda_stream():
+    buffer = _populate_buffer_for_async_test(device="cuda", use_drq=False)
+    iterator = buffer.get_iterator(batch_size=4, async_prefetch=True, queue_size=2)
+
+    for _ in range(5):
+        batch = next(iterator)
+        images = batch["state"]["observation.image"]
+        states = batch["state"]["observation.state"]
+        assert images.is_cuda and images.shape == (4, 3, 128, 128)
+        # The images and states of a transition come from the same slot
+        assert torch.equal(images[:, 0, 0, 0], states[:, 0])
+    del iterator